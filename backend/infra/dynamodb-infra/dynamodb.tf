@@ -122,3 +122,62 @@ resource "aws_dynamodb_table" "actions" {
     }
   )
 }
+
+# Checkpoints table - per-node outputs of pipeline runs, so failed runs can resume
+resource "aws_dynamodb_table" "checkpoints" {
+  name           = local.dynamodb_table_checkpoints
+  billing_mode   = "PAY_PER_REQUEST"  # On-demand capacity
+  hash_key       = "run_id"
+  range_key      = "node"
+
+  attribute {
+    name = "run_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "node"
+    type = "S"
+  }
+
+  # Checkpoints of failed runs are deleted once expired
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  # Tags
+  tags = merge(
+    local.common_tags,
+    {
+      Name = "${local.name_prefix} Checkpoints Table"
+    }
+  )
+}
+
+# Leases table - which worker is generating a transcript, so concurrent requests
+# across API containers do not process it twice
+resource "aws_dynamodb_table" "leases" {
+  name           = local.dynamodb_table_leases
+  billing_mode   = "PAY_PER_REQUEST"  # On-demand capacity
+  hash_key       = "lease_key"
+
+  attribute {
+    name = "lease_key"
+    type = "S"
+  }
+
+  # Leases of crashed workers are deleted once expired (the app already ignores them)
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  # Tags
+  tags = merge(
+    local.common_tags,
+    {
+      Name = "${local.name_prefix} Leases Table"
+    }
+  )
+}
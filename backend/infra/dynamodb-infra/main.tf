@@ -21,6 +21,8 @@ locals {
   # DynamoDB table names
   dynamodb_table_meetings = "${local.name_prefix}-${var.dynamodb_table_meetings}"
   dynamodb_table_actions = "${local.name_prefix}-${var.dynamodb_table_actions}"
+  dynamodb_table_checkpoints = "${local.name_prefix}-${var.dynamodb_table_checkpoints}"
+  dynamodb_table_leases = "${local.name_prefix}-${var.dynamodb_table_leases}"
   
   # Common tags
   common_tags = {
@@ -20,6 +20,16 @@ output "actions_table_arn" {
   value       = aws_dynamodb_table.actions.arn
 }
 
+output "checkpoints_table_name" {
+  description = "Name of the DynamoDB checkpoints table"
+  value       = aws_dynamodb_table.checkpoints.name
+}
+
+output "leases_table_name" {
+  description = "Name of the DynamoDB leases table"
+  value       = aws_dynamodb_table.leases.name
+}
+
 output "region" {
   description = "AWS region where resources were created"
   value       = var.aws_region
@@ -48,6 +48,18 @@ variable "dynamodb_table_actions" {
   default     = "actions"
 }
 
+variable "dynamodb_table_checkpoints" {
+  description = "Base name of the DynamoDB table for pipeline checkpoints (environment will be prefixed)"
+  type        = string
+  default     = "checkpoints"
+}
+
+variable "dynamodb_table_leases" {
+  description = "Base name of the DynamoDB table for single-flight generation leases (environment will be prefixed)"
+  type        = string
+  default     = "leases"
+}
+
 variable "project" {
   description = "Project name"
   type        = string
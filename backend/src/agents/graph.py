@@ -7,50 +7,265 @@ Specifically, it:
 1. Creates a directed graph of processing steps
 2. Defines the exact sequence of operations
 3. Connects the nodes in the correct order
-4. Sets up checkpointing for reliability
+4. Sets up per-node checkpointing for reliability
 5. Compiles the graph into an executable application
 
+Three topologies are available:
+- parallel: every extraction node only reads the transcript, so they fan out
+  from chunk_transcript and run concurrently, then fan back in before
+  draft_minutes. Wall-clock time is roughly the slowest single node.
+- serial: the original chain where each extraction runs after the previous one.
+- combined: a single extract_combined node asks for every field in one LLM
+  request and only falls back to the per-field nodes for invalid fields.
+
+In every topology, chunk_transcript runs right after ingest_local_text and splits
+long transcripts into token-budgeted chunks that each extraction node maps over.
+When compaction is enabled, compact_text runs between the two so every
+prompt carries the shorter, aliased transcript.
+
+Every LLM-backed node is registered with both its sync and async implementation,
+so the compiled graph supports invoke() for the CLI and ainvoke() for the API.
+Every node is instrumented, so its wall time, tokens and cost end up in the
+node_metrics field of the final state, and reports its start and end to the
+progress stream when the run is streamed to a client.
+
+Every LLM-backed node also runs under the run's deadline (see deadline_service):
+a node that runs out of time marks its fields in degraded_fields instead of
+stalling the run, and draft_minutes writes the minutes from the rest. A degraded
+run keeps its checkpoints, so retrying it only re-runs the degraded nodes.
+
+Every LLM-backed node is checkpointed under the run ID (see checkpoint_service):
+the registry derives the ID from the source, transcript and variant, so retrying a
+failed or interrupted run restores the nodes that already finished instead of
+calling the LLM again, and deletes the checkpoints once the run completes.
+The registry also keeps the LLM outputs of the last run over each source (see
+incremental_service), so re-processing an edited transcript only re-extracts the
+chunks that changed.
+
+Compiling is not free, so the API and CLI go through graph_registry instead: it
+compiles each named variant (mode, plus "+compact" when compaction is on) once per
+process, and records the compile time and invocation count of every variant.
+
 The create_graph() function returns a compiled workflow that can process
 meeting transcripts through the complete analysis pipeline in the right order.
 """
 
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from backend.src.config.settings import settings, logger
 from backend.src.models.schemas import MeetingState
+from backend.src.services import incremental_service
+from backend.src.services.checkpoint_service import checkpoint_node, checkpoint_store, make_run_id, shielded_node
+from backend.src.services.deadline_service import deadline_node, run_deadline
+from backend.src.services.metrics_service import instrument_node
+from backend.src.services.progress_service import track_node
 from backend.src.agents.nodes import (
-    ingest_local_text, extract_title, extract_agenda, extract_decisions, 
-    extract_participants, assign_tasks, draft_minutes
+    ingest_local_text, compact_text, chunk_transcript, extract_title, extract_agenda, extract_decisions,
+    extract_executive_summary, extract_participants, assign_tasks, draft_minutes,
+    extract_combined, aextract_title, aextract_agenda, aextract_decisions,
+    aextract_executive_summary, aextract_participants, aassign_tasks, aextract_combined
 )
 
-def create_graph():
+GRAPH_MODES = ("serial", "parallel", "combined")
+
+# Extraction nodes in the order used by the serial topology
+EXTRACTION_NODES = [
+    ("extract_title", extract_title, aextract_title),
+    ("extract_agenda", extract_agenda, aextract_agenda),
+    ("extract_decisions", extract_decisions, aextract_decisions),
+    ("extract_executive_summary", extract_executive_summary, aextract_executive_summary),
+    ("extract_participants", extract_participants, aextract_participants),
+    ("assign_tasks", assign_tasks, aassign_tasks),
+]
+
+# State fields each LLM-backed node fills, marked degraded when it runs out of time
+NODE_FIELDS = {
+    "extract_title": ["title"],
+    "extract_agenda": ["agenda"],
+    "extract_decisions": ["decisions"],
+    "extract_executive_summary": ["executive_summary"],
+    "extract_participants": ["participants"],
+    "assign_tasks": ["tasks"],
+    "extract_combined": ["title", "agenda", "decisions", "executive_summary", "participants", "tasks"],
+}
+
+def _wrap(name: str, func):
+    """Record metrics, then report progress (so node_end events carry the metrics)."""
+    return track_node(name, instrument_node(name, func))
+
+def _node(name: str, func, afunc=None):
+    """Instrument a node and, when afunc is given, checkpoint it and bound it by the
+    deadline (it calls the LLM) and wrap it so LangGraph uses func under invoke()
+    and afunc under ainvoke(). A degraded update is never checkpointed, and the
+    checkpoint shield sits outside the deadline so the deadline still cancels afunc."""
+    if afunc is None:
+        return _wrap(name, func)
+    fields = NODE_FIELDS[name]
+    return RunnableLambda(_wrap(name, deadline_node(name, fields, checkpoint_node(name, func))),
+                          afunc=_wrap(name, shielded_node(deadline_node(name, fields, checkpoint_node(name, afunc)))),
+                          name=name)
+
+def create_graph(mode: Optional[str] = None, compact: Optional[bool] = None):
     """
     Create the LangGraph workflow for meeting processing.
     This creates a directed graph of nodes that process the meeting transcript.
+
+    Args:
+        mode: "parallel", "serial" or "combined". Defaults to settings.graph_mode.
+        compact: insert the compact_text node. Defaults to settings.compact_transcript.
     """
+    mode = (mode or settings.graph_mode).lower()
+    if mode not in GRAPH_MODES:
+        raise ValueError(f"Unknown graph mode '{mode}'. Expected one of: {', '.join(GRAPH_MODES)}")
+
     # Create state graph with MeetingState
     graph = StateGraph(MeetingState)
 
     # Add processing nodes
-    graph.add_node("ingest_local_text", ingest_local_text)
-    graph.add_node("extract_title", extract_title)
-    graph.add_node("extract_agenda", extract_agenda)
-    graph.add_node("extract_decisions", extract_decisions)
-    from backend.src.agents.nodes import extract_executive_summary
-    graph.add_node("extract_executive_summary", extract_executive_summary)
-    graph.add_node("extract_participants", extract_participants)
-    graph.add_node("assign_tasks", assign_tasks)
-    graph.add_node("draft_minutes", draft_minutes)
-
-    # Connect nodes in sequence
+    graph.add_node("ingest_local_text", _node("ingest_local_text", ingest_local_text))
+    graph.add_node("chunk_transcript", _node("chunk_transcript", chunk_transcript))
+    graph.add_node("draft_minutes", _node("draft_minutes", draft_minutes))
     graph.set_entry_point("ingest_local_text")
-    graph.add_edge("ingest_local_text", "extract_title")
-    graph.add_edge("extract_title", "extract_agenda")
-    graph.add_edge("extract_agenda", "extract_decisions")
-    graph.add_edge("extract_decisions", "extract_executive_summary")
-    graph.add_edge("extract_executive_summary", "extract_participants")
-    graph.add_edge("extract_participants", "assign_tasks")
-    graph.add_edge("assign_tasks", "draft_minutes")
+    if settings.compact_transcript if compact is None else compact:
+        graph.add_node("compact_text", _node("compact_text", compact_text))
+        graph.add_edge("ingest_local_text", "compact_text")
+        graph.add_edge("compact_text", "chunk_transcript")
+    else:
+        graph.add_edge("ingest_local_text", "chunk_transcript")
+
+    if mode == "combined":
+        graph.add_node("extract_combined", _node("extract_combined", extract_combined, aextract_combined))
+        graph.add_edge("chunk_transcript", "extract_combined")
+        graph.add_edge("extract_combined", "draft_minutes")
+        graph.add_edge("draft_minutes", END)
+        return graph.compile()
+
+    for name, func, afunc in EXTRACTION_NODES:
+        graph.add_node(name, _node(name, func, afunc))
+    node_names = [name for name, _, _ in EXTRACTION_NODES]
+
+    if mode == "parallel":
+        # Fan out: all extraction nodes start in the same step
+        for name in node_names:
+            graph.add_edge("chunk_transcript", name)
+        # Fan in: draft_minutes waits until every extraction node has finished
+        graph.add_edge(node_names, "draft_minutes")
+    else:
+        # Connect nodes in sequence
+        previous = "chunk_transcript"
+        for name in node_names:
+            graph.add_edge(previous, name)
+            previous = name
+        graph.add_edge(previous, "draft_minutes")
+
     graph.add_edge("draft_minutes", END)
 
     # Compile graph without any extra parameters
     app = graph.compile()
     return app
+
+class GraphRegistry:
+    """Process-wide cache of compiled graph variants."""
+
+    def __init__(self):
+        self._graphs: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def variant(mode: Optional[str] = None, compact: Optional[bool] = None) -> Tuple[str, str, bool]:
+        """Resolve defaults and return (variant name, mode, compact)."""
+        mode = (mode or settings.graph_mode).lower()
+        compact = settings.compact_transcript if compact is None else compact
+        return (f"{mode}+compact" if compact else mode), mode, compact
+
+    def get(self, mode: Optional[str] = None, compact: Optional[bool] = None):
+        """Return the compiled graph for a variant, compiling it on first use.
+        Raises ValueError for an unknown mode."""
+        name, mode, compact = self.variant(mode, compact)
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        with self._lock:
+            if name not in self._graphs:
+                started = time.perf_counter()
+                self._graphs[name] = create_graph(mode, compact=compact)
+                compile_time_s = time.perf_counter() - started
+                self._stats[name] = {"compile_time_s": round(compile_time_s, 4), "invocations": 0}
+                logger.info(f"Compiled graph variant '{name}' in {compile_time_s * 1000:.1f} ms")
+            return self._graphs[name]
+
+    def warm(self, modes=GRAPH_MODES, compact: Optional[bool] = None) -> None:
+        """Compile the given variants up front (e.g. at API startup)."""
+        for mode in modes:
+            self.get(mode, compact)
+
+    def _count(self, mode: Optional[str], compact: Optional[bool]) -> None:
+        name, _, _ = self.variant(mode, compact)
+        with self._lock:
+            self._stats[name]["invocations"] += 1
+
+    def _with_run_id(self, state, mode: Optional[str], compact: Optional[bool]):
+        """Give the state its checkpoint run ID, unless the caller chose one."""
+        # Not isinstance: a caller may hold MeetingState through another import path
+        if not hasattr(state, "run_id") or state.run_id:
+            return state
+        name, _, _ = self.variant(mode, compact)
+        return state.model_copy(update={"run_id": make_run_id(state.source, state.transcript, name)})
+
+    @staticmethod
+    def _finished(final_state, memo) -> bool:
+        """Log how the run went; True if it completed, False if some node was degraded."""
+        resumed = final_state.get("resumed_nodes") or []
+        if resumed:
+            logger.info(f"Run {final_state.get('run_id')} resumed from checkpoints of: {', '.join(resumed)}")
+        if memo is not None and final_state.get("reprocessing") is not None:
+            final_state["reprocessing"] = {**final_state["reprocessing"], **memo.stats()}
+            logger.info(f"Incremental re-processing: {final_state['reprocessing']}")
+        degraded = final_state.get("degraded_fields") or []
+        if degraded:
+            logger.warning(f"Run {final_state.get('run_id')} finished with degraded fields: {', '.join(degraded)}")
+        return not degraded
+
+    def invoke(self, state, mode: Optional[str] = None, compact: Optional[bool] = None,
+               deadline_s: Optional[float] = None):
+        """Run a variant synchronously, within deadline_s seconds (defaults to PIPELINE_DEADLINE_SECONDS)."""
+        graph = self.get(mode, compact)
+        self._count(mode, compact)
+        memo = incremental_service.open_memo(getattr(state, "source", None))
+        with incremental_service.incremental_run(memo), \
+                run_deadline(settings.pipeline_deadline_seconds if deadline_s is None else deadline_s):
+            final_state = graph.invoke(self._with_run_id(state, mode, compact))
+        # A degraded run keeps its checkpoints and the previous memo for the retry
+        if self._finished(final_state, memo):
+            incremental_service.save(memo)
+            if final_state.get("run_id"):
+                checkpoint_store.clear(final_state["run_id"])
+        return final_state
+
+    async def ainvoke(self, state, mode: Optional[str] = None, compact: Optional[bool] = None,
+                      deadline_s: Optional[float] = None):
+        """Run a variant asynchronously, within deadline_s seconds (defaults to PIPELINE_DEADLINE_SECONDS)."""
+        graph = self.get(mode, compact)
+        self._count(mode, compact)
+        memo = await asyncio.to_thread(incremental_service.open_memo, getattr(state, "source", None))
+        with incremental_service.incremental_run(memo), \
+                run_deadline(settings.pipeline_deadline_seconds if deadline_s is None else deadline_s):
+            final_state = await graph.ainvoke(self._with_run_id(state, mode, compact))
+        if self._finished(final_state, memo):
+            await asyncio.to_thread(incremental_service.save, memo)
+            if final_state.get("run_id"):
+                await asyncio.to_thread(checkpoint_store.clear, final_state["run_id"])
+        return final_state
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Compile time and invocation count per compiled variant."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+graph_registry = GraphRegistry()
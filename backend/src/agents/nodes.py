@@ -5,44 +5,313 @@ This file implements the individual AI processing functions that extract informa
 from meeting transcripts. Each function has a specific purpose:
 
 - ingest_local_text: Validates and prepares the transcript for processing
+- compact_text: Optionally removes filler and pleasantries and replaces speaker
+  names with short aliases; the extraction nodes expand the aliases in their output
+- chunk_transcript: Parses the speaker turns and splits long transcripts into
+  token-budgeted chunks on turn boundaries
+- extract_participants: Takes the participants from the parsed speaker turns and
+  only asks the LLM when the parse confidence is low
 - extract_agenda: Identifies and lists key agenda items from the transcript
 - extract_decisions: Finds formal decisions that were made during the meeting
 - assign_tasks: Recognizes action items and who they were assigned to
 - draft_minutes: Creates a formatted summary of the meeting in Markdown
+- extract_combined: Extracts all of the above fields with a single request,
+  falling back to the per-field functions only for fields that come back invalid
 
 Each function uses AI prompts to intelligently extract specific information types
 from natural language text, then returns structured data for the next step.
+
+The prompt logic of every LLM-backed node is written once as a "flow": a generator
+that yields LLMCall requests and receives the model output back. The flows are
+driven either synchronously (extract_agenda, ...) or asynchronously (aextract_agenda,
+...), so the same node can run under graph.invoke() and graph.ainvoke().
+
+A flow may also yield a list of LLMCall objects, which the driver runs concurrently.
+The extraction nodes use this to map over the transcript chunks (one call per chunk)
+and then reduce the partial results with the MeetingState reducers, so latency grows
+with the number of chunks in flight rather than with the transcript length.
+
+Every prompt starts with the shared system message and the transcript (or chunk),
+and ends with the node's instructions, so all the calls over one chunk share a
+leading prefix that the provider can serve from its prompt cache (see
+_with_transcript).
+
+Every extraction call names the Pydantic model of its output (TitleOutput, ...).
+The response is constrained to the model's JSON schema and validated against it
+once; when fields are missing or invalid, a single repair request asks again for
+those fields only, and the outcome is recorded in the parse-failure and repair
+metrics.
 """
 
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date
-from typing import Dict, Any, List
-from backend.src.models.schemas import MeetingState, Task
-from backend.src.services.openai_service import chat_5_8_sentences
+from functools import lru_cache
+from typing import Dict, Any, Generator, List, Optional, Tuple, Type, Union
+from pydantic import BaseModel, ValidationError, create_model
+from backend.src.models.schemas import (
+    MeetingState, Task, CombinedExtraction, merge_unique, merge_tasks,
+    TitleOutput, ExecutiveSummaryOutput, AgendaOutput, DecisionsOutput, ParticipantsOutput, TasksOutput
+)
+from backend.src.services import incremental_service
+from backend.src.services.metrics_service import record_validation
+from backend.src.services.openai_service import chat_5_8_sentences, achat_5_8_sentences, resolve_route
+from backend.src.utils import chunking, compaction
 from backend.src.utils.json_utils import robust_json_parse
-from backend.src.config.settings import logger
+from backend.src.utils.transcript_parser import parse_transcript
+from backend.src.config.settings import settings, logger
 
 SYSTEM = "You convert meeting transcripts into structured outputs."
 
-def extract_executive_summary(state: MeetingState) -> Dict[str, Any]:
-    """Generate an executive summary for the meeting transcript using the LLM."""
-    user = f'''Write a concise executive summary (3-6 sentences) for this meeting. Focus on the main topics, key decisions, and overall outcome. Avoid listing agenda items or action items. Use clear, professional language for an executive audience.\n\nReturn ONLY the JSON: {{"executive_summary": "..."}}\n\nTranscript:\n{state.transcript[:5000]}\n'''
-    out = chat_5_8_sentences(SYSTEM, user, temperature=0.5)
+def _with_transcript(transcript: str, instructions: str, label: str = "Transcript") -> str:
+    """User message with the transcript first and the node-specific instructions last.
+    Calls over the same transcript then share a cacheable prefix (system + transcript)."""
+    return f"{label}:\n{transcript}\n[End of {label.lower()}]\n\n{instructions}"
+
+@dataclass(frozen=True)
+class LLMCall:
+    """A single chat request yielded by a node flow."""
+    system: str
+    user: str
+    temperature: float = 0.2
+    # None follows the cache policy, False bypasses the cache, True opts in
+    use_cache: Optional[bool] = None
+    # Model route (LLM_ROUTES key). Each flow names its own node, so the per-field
+    # fallbacks of extract_combined still use the per-field routes
+    node: Optional[str] = None
+    # Output model: constrains the response to its JSON schema
+    schema: Optional[Type[BaseModel]] = None
+
+# A flow yields LLMCall objects (or lists of them to run concurrently), receives the
+# model output(s), and returns the state update
+Flow = Generator[Union[LLMCall, List[LLMCall]], Union[str, List[str]], Dict[str, Any]]
+
+def _memo_key(call: LLMCall) -> Optional[str]:
+    """Key of the call in the incremental re-processing memo (None if no memo is active)."""
+    if not incremental_service.active():
+        return None
+    return incremental_service.memo_key(call.node, resolve_route(call.node).model, call.system, call.user,
+                                        call.temperature, call.schema.__name__ if call.schema else None)
+
+def _call(call: LLMCall) -> str:
+    key = _memo_key(call)
+    reused = incremental_service.lookup(key) if key else None
+    if reused is not None:
+        return reused
+    output = chat_5_8_sentences(call.system, call.user, temperature=call.temperature,
+                                use_cache=call.use_cache, node=call.node, schema=call.schema)
+    if key:
+        incremental_service.remember(key, output)
+    return output
+
+async def _acall(call: LLMCall) -> str:
+    key = _memo_key(call)
+    reused = incremental_service.lookup(key) if key else None
+    if reused is not None:
+        return reused
+    output = await achat_5_8_sentences(call.system, call.user, temperature=call.temperature,
+                                       use_cache=call.use_cache, node=call.node, schema=call.schema)
+    if key:
+        incremental_service.remember(key, output)
+    return output
+
+def _call_many(calls: List[LLMCall]) -> List[str]:
+    """Run several calls on a thread pool, keeping the caller's context (e.g. cache bypass)."""
+    if len(calls) <= 1:
+        return [_call(call) for call in calls]
+    with ThreadPoolExecutor(max_workers=min(len(calls), settings.chunk_max_concurrency)) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _call, call) for call in calls]
+        return [future.result() for future in futures]
+
+async def _acall_many(calls: List[LLMCall]) -> List[str]:
+    """Run several calls concurrently, at most chunk_max_concurrency at a time."""
+    semaphore = asyncio.Semaphore(settings.chunk_max_concurrency)
+
+    async def limited(call: LLMCall) -> str:
+        async with semaphore:
+            return await _acall(call)
+
+    return list(await asyncio.gather(*(limited(call) for call in calls)))
+
+def _run_flow(flow: Flow) -> Dict[str, Any]:
+    """Drive a node flow with the synchronous OpenAI client."""
+    try:
+        request = next(flow)
+        while True:
+            result = _call_many(request) if isinstance(request, list) else _call(request)
+            request = flow.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+async def _arun_flow(flow: Flow) -> Dict[str, Any]:
+    """Drive a node flow with the asynchronous OpenAI client."""
+    try:
+        request = next(flow)
+        while True:
+            result = await (_acall_many(request) if isinstance(request, list) else _acall(request))
+            request = flow.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+def _validate(out: str, schema: Type[BaseModel]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Validate a response against its output model.
+    Returns the valid fields and an error message for each missing or invalid field."""
     data = robust_json_parse(out)
-    summary = data.get("executive_summary", "")
+    if not isinstance(data, dict):
+        data = {}
+    try:
+        return schema.model_validate(data).model_dump(), {}
+    except ValidationError as e:
+        errors: Dict[str, str] = {}
+        for error in e.errors():
+            field = str(error["loc"][0]) if error["loc"] else ""
+            if field in schema.model_fields:
+                errors.setdefault(field, error["msg"])
+            else:
+                # Not an object at all: every field has to be asked for again
+                errors.update({name: error["msg"] for name in schema.model_fields})
+        valid = {}
+        for field in schema.model_fields:
+            if field not in errors and field in data:
+                valid[field] = _repair_schema(schema, (field,)).model_validate({field: data[field]}).model_dump()[field]
+        return valid, errors
+
+@lru_cache(maxsize=None)
+def _repair_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """The output model reduced to the given fields."""
+    return create_model(f"{schema.__name__}Repair", **{name: (schema.model_fields[name].annotation, schema.model_fields[name])
+                                                       for name in fields})
+
+def _repair_prompt(call: LLMCall, out: str, errors: Dict[str, str]) -> str:
+    # The original request stays in front, so the repair reuses its cached prefix
+    problems = "\n".join(f'- "{field}": {message}' for field, message in errors.items())
+    return f"""{call.user}
+
+Your previous answer to this request was missing or had invalid fields:
+{problems}
+
+Previous answer:
+{out}
+
+Return ONLY the JSON with the field(s) {", ".join(f'"{field}"' for field in errors)}."""
+
+def _validated(calls: List[LLMCall]) -> Flow:
+    """Run calls that each name an output model, validate every response once and
+    make one repair request per response for its invalid fields only.
+    Returns the valid fields of each response (fields still invalid are left out)."""
+    outs = yield calls
+    results = [_validate(out, call.schema) for call, out in zip(calls, outs)]
+    repairs = [
+        (i, LLMCall(call.system, _repair_prompt(call, out, errors), temperature=call.temperature,
+                    use_cache=call.use_cache, node=call.node, schema=_repair_schema(call.schema, tuple(errors))))
+        for i, (call, out, (_, errors)) in enumerate(zip(calls, outs, results)) if errors
+    ]
+    repaired_outs = (yield [repair for _, repair in repairs]) if repairs else []
+    for (i, repair), out in zip(repairs, repaired_outs):
+        fixed, still_invalid = _validate(out, repair.schema)
+        results[i][0].update(fixed)
+        record_validation(False, repaired=not still_invalid)
+        if still_invalid:
+            logger.warning(f"{repair.node}: fields still invalid after repair: {still_invalid}")
+    for _, errors in results:
+        if not errors:
+            record_validation(True)
+    return [valid for valid, _ in results]
+
+def _chunks(state: MeetingState) -> List[str]:
+    """Transcript chunks to map over (the whole, possibly compacted, transcript if it was not chunked)."""
+    if state.chunks:
+        return state.chunks
+    text = state.compact_transcript or state.transcript
+    return [text] if text else []
+
+def _expand_aliases(state: MeetingState, update: Dict[str, Any]) -> Dict[str, Any]:
+    """Put the real speaker names back into a node's output when the transcript was compacted."""
+    if not state.speaker_aliases:
+        return update
+    return compaction.expand_aliases(update, state.speaker_aliases)
+
+def _summary_prompt(transcript: str) -> str:
+    return _with_transcript(transcript, '''Write a concise executive summary (3-6 sentences) for this meeting. Focus on the main topics, key decisions, and overall outcome. Avoid listing agenda items or action items. Use clear, professional language for an executive audience.\n\nReturn ONLY the JSON: {"executive_summary": "..."}''')
+
+def _executive_summary_flow(state: MeetingState, known: Optional[Dict[int, str]] = None) -> Flow:
+    """Map: summarize each chunk (skipping those in `known`). Reduce: merge the partial summaries."""
+    chunks = _chunks(state)
+    summaries = dict(known or {})
+    missing = [i for i in range(len(chunks)) if i not in summaries]
+    outs = yield from _validated([LLMCall(SYSTEM, _summary_prompt(chunks[i]), temperature=0.5,
+                                          node="extract_executive_summary", schema=ExecutiveSummaryOutput)
+                                  for i in missing])
+    for i, data in zip(missing, outs):
+        summaries[i] = data.get("executive_summary", "")
+    parts = [summaries[i] for i in sorted(summaries) if summaries[i]]
+
+    if len(parts) > 1:
+        joined = "\n\n".join(f"Part {n}: {part}" for n, part in enumerate(parts, 1))
+        user = _with_transcript(joined, '''These are summaries of consecutive parts of one meeting. Combine them into a single concise executive summary (3-6 sentences) covering the main topics, key decisions, and overall outcome.\n\nReturn ONLY the JSON: {"executive_summary": "..."}''', label="Partial summaries")
+        merged = yield from _validated([LLMCall(SYSTEM, user, temperature=0.5, node="extract_executive_summary",
+                                                schema=ExecutiveSummaryOutput)])
+        summary = merged[0].get("executive_summary", "") or " ".join(parts)
+    else:
+        summary = parts[0] if parts else ""
     logger.info(f"Executive summary extracted: {summary}")
     return {"executive_summary": summary}
 
+def extract_executive_summary(state: MeetingState) -> Dict[str, Any]:
+    """Generate an executive summary for the meeting transcript using the LLM."""
+    return _expand_aliases(state, _run_flow(_executive_summary_flow(state)))
+
+async def aextract_executive_summary(state: MeetingState) -> Dict[str, Any]:
+    """Async version of extract_executive_summary."""
+    return _expand_aliases(state, await _arun_flow(_executive_summary_flow(state)))
+
 def ingest_local_text(state: MeetingState) -> Dict[str, Any]:
     if not state.transcript:
         raise ValueError("Transcript missing. Provide it before invoking graph.")
     # Return the transcript to update the state
     return {"transcript": state.transcript}
 
-def extract_title(state: MeetingState) -> Dict[str, Any]:
-    # System prompt specialized for title extraction
-    title_system = "You are an expert at creating concise, descriptive meeting titles that capture the essence of a discussion."
-    
-    user = f"""Create a clear, concise title for this meeting transcript.
+def compact_text(state: MeetingState) -> Dict[str, Any]:
+    """Strip filler and pleasantries and alias the speaker names to shrink every downstream prompt."""
+    compact = compaction.compact_transcript(state.transcript)
+    logger.info(f"Transcript compacted from ~{compact.original_tokens} to ~{compact.compact_tokens} tokens "
+                f"(ratio {compact.compression_ratio}, {len(compact.aliases)} speaker aliases)")
+    return {
+        "compact_transcript": compact.text,
+        "speaker_aliases": compact.aliases,
+        "compression_ratio": compact.compression_ratio,
+    }
+
+def chunk_transcript(state: MeetingState) -> Dict[str, Any]:
+    """Parse the speaker turns and split the transcript into token-budgeted chunks that end on them.
+    The stats always describe the original transcript; the chunks use the compacted one if present.
+    When incremental re-processing is on, the cut points are content-defined so an edited
+    transcript keeps its unchanged chunks, and the chunks are compared with the previous run's."""
+    parsed = parse_transcript(state.transcript)
+    text = state.compact_transcript or state.transcript
+    turns = parse_transcript(text).turns if state.compact_transcript else parsed.turns
+    if incremental_service.active():
+        target = min(settings.incremental_chunk_tokens, settings.chunk_max_tokens)
+        chunks = chunking.content_defined_chunks(text, target, settings.chunk_max_tokens, turns=turns)
+    else:
+        chunks = chunking.chunk_transcript(text, settings.chunk_max_tokens, turns=turns)
+    logger.info(f"Transcript split into {len(chunks)} chunk(s) "
+                f"(~{chunking.estimate_tokens(text)} tokens, budget {settings.chunk_max_tokens}); "
+                f"{len(parsed.speakers)} speaker(s), parse confidence {parsed.confidence}")
+    update: Dict[str, Any] = {"chunks": chunks, "transcript_stats": parsed.stats()}
+    reprocessing = incremental_service.compare_chunks(chunks)
+    if reprocessing is not None:
+        update["reprocessing"] = reprocessing
+    return update
+
+def _title_flow(state: MeetingState) -> Flow:
+    # The title role goes in the instructions: a system prompt of its own would
+    # break the prefix shared with the other nodes
+    user = _with_transcript(chunking.sample_transcript(_chunks(state), settings.chunk_max_tokens), """\
+You are an expert at creating concise, descriptive meeting titles that capture the essence of a discussion.
+Create a clear, concise title for this meeting transcript.
 
 Guidelines for the title:
 1. Make it 3-6 words maximum
@@ -52,33 +321,16 @@ Guidelines for the title:
 5. Ensure it's professional and descriptive
 6. DO NOT use "Meeting" or "Discussion" in the title unless absolutely necessary
 
-Return ONLY the JSON: {{"title": "Your Concise Title Here"}}
-
-Transcript:
-{state.transcript[:5000]}
-"""
-    # Use a higher temperature for creative title generation
-    out = chat_5_8_sentences(title_system, user, temperature=0.7)
-    data = robust_json_parse(out)
-    title = data.get("title")
-    
-    # Apply validation and fallbacks
-    if not title or len(title.strip()) < 3:
-        # First fallback - try a different prompt
-        backup_user = f"""The previous title generation failed. Please create a short, descriptive title 
-for this meeting based on its key topics or purpose (maximum 5 words).
-Return JSON: {{"title": "..."}}
-
-Transcript:
-{state.transcript[:3000]}
-"""
-        backup_out = chat_5_8_sentences(title_system, backup_user, temperature=0.5)
-        backup_data = robust_json_parse(backup_out)
-        title = backup_data.get("title")
+Return ONLY the JSON: {"title": "Your Concise Title Here"}""")
+    # Use a higher temperature for creative title generation. The response is
+    # validated (at least 3 characters) and repaired once if it is not
+    outs = yield from _validated([LLMCall(SYSTEM, user, temperature=0.7, node="extract_title", schema=TitleOutput)])
+    title = outs[0].get("title")
     
     # Apply final fallbacks and validation
     if not title or len(title.strip()) < 3:
         # Try to generate a title from agenda or decisions if available
+        # (only populated when the graph runs in serial mode)
         if hasattr(state, 'agenda') and state.agenda:
             # Use the first agenda item as the title
             title = state.agenda[0]
@@ -101,52 +353,93 @@ Transcript:
     logger.info(f"Title extracted: {title}")
     return {"title": title}
 
-def extract_agenda(state: MeetingState) -> Dict[str, Any]:
-    user = f"""From this transcript, list concise agenda bullets (max 8).
-Return JSON: {{"agenda": ["..."]}}.
-Transcript:
-{state.transcript}
-"""
-    out = chat_5_8_sentences(SYSTEM, user)
-    data = robust_json_parse(out)
-    agenda = data.get("agenda", [])
+def extract_title(state: MeetingState) -> Dict[str, Any]:
+    """Generate a concise meeting title, with a validated response and non-LLM fallbacks."""
+    return _expand_aliases(state, _run_flow(_title_flow(state)))
+
+async def aextract_title(state: MeetingState) -> Dict[str, Any]:
+    """Async version of extract_title."""
+    return _expand_aliases(state, await _arun_flow(_title_flow(state)))
+
+def _agenda_prompt(transcript: str) -> str:
+    return _with_transcript(transcript, """From this transcript, list concise agenda bullets (max 8).
+Return JSON: {"agenda": ["..."]}.""")
+
+def _agenda_flow(state: MeetingState, chunks: Optional[List[str]] = None) -> Flow:
+    chunks = _chunks(state) if chunks is None else chunks
+    outs = yield from _validated([LLMCall(SYSTEM, _agenda_prompt(chunk), node="extract_agenda", schema=AgendaOutput)
+                                  for chunk in chunks])
+    agenda: List[str] = []
+    for out in outs:
+        agenda = merge_unique(agenda, out.get("agenda", []))
     logger.info(f"Agenda extracted: {agenda}")
     return {"agenda": agenda}
 
-def extract_decisions(state: MeetingState) -> Dict[str, Any]:
-    user = f"""From the transcript, list explicit decisions. 
-Return JSON: {{"decisions":["..."]}}.
-Transcript:
-{state.transcript}
-"""
-    out = chat_5_8_sentences(SYSTEM, user)
-    data = robust_json_parse(out)
-    decisions = data.get("decisions", [])
+def extract_agenda(state: MeetingState) -> Dict[str, Any]:
+    """List the agenda items discussed in the meeting."""
+    return _expand_aliases(state, _run_flow(_agenda_flow(state)))
+
+async def aextract_agenda(state: MeetingState) -> Dict[str, Any]:
+    """Async version of extract_agenda."""
+    return _expand_aliases(state, await _arun_flow(_agenda_flow(state)))
+
+def _decisions_prompt(transcript: str) -> str:
+    return _with_transcript(transcript, """From the transcript, list explicit decisions.
+Return JSON: {"decisions":["..."]}.""")
+
+def _decisions_flow(state: MeetingState, chunks: Optional[List[str]] = None) -> Flow:
+    chunks = _chunks(state) if chunks is None else chunks
+    outs = yield from _validated([LLMCall(SYSTEM, _decisions_prompt(chunk), node="extract_decisions", schema=DecisionsOutput)
+                                  for chunk in chunks])
+    decisions: List[str] = []
+    for out in outs:
+        decisions = merge_unique(decisions, out.get("decisions", []))
     logger.info(f"Decisions extracted: {decisions}")
     return {"decisions": decisions}
 
-def extract_participants(state: MeetingState) -> Dict[str, Any]:
-    user = f"""From the transcript, identify all participants in the meeting.
-Return JSON: {{"participants":["..."]}}.
-Transcript:
-{state.transcript}
-"""
-    out = chat_5_8_sentences(SYSTEM, user)
-    data = robust_json_parse(out)
-    participants = data.get("participants", [])
+def extract_decisions(state: MeetingState) -> Dict[str, Any]:
+    """List the explicit decisions made in the meeting."""
+    return _expand_aliases(state, _run_flow(_decisions_flow(state)))
+
+async def aextract_decisions(state: MeetingState) -> Dict[str, Any]:
+    """Async version of extract_decisions."""
+    return _expand_aliases(state, await _arun_flow(_decisions_flow(state)))
+
+def _participants_prompt(transcript: str) -> str:
+    return _with_transcript(transcript, """From the transcript, identify all participants in the meeting.
+Return JSON: {"participants":["..."]}.""")
+
+def _parsed_participants(state: MeetingState) -> Optional[List[str]]:
+    """Participants from the parsed speaker turns, or None if the parse is not confident enough."""
+    stats = state.transcript_stats or parse_transcript(state.transcript or "").stats()
+    if stats["participants"] and stats["confidence"] >= settings.participants_min_confidence:
+        return stats["participants"]
+    return None
+
+def _participants_flow(state: MeetingState, chunks: Optional[List[str]] = None) -> Flow:
+    parsed = _parsed_participants(state)
+    if parsed is not None:
+        logger.info(f"Participants taken from speaker turns: {parsed}")
+        return {"participants": parsed}
+    chunks = _chunks(state) if chunks is None else chunks
+    outs = yield from _validated([LLMCall(SYSTEM, _participants_prompt(chunk), node="extract_participants", schema=ParticipantsOutput)
+                                  for chunk in chunks])
+    participants: List[str] = []
+    for out in outs:
+        participants = merge_unique(participants, out.get("participants", []))
     logger.info(f"Participants extracted: {participants}")
     return {"participants": participants}
 
-def assign_tasks(state: MeetingState) -> Dict[str, Any]:
-    user = f"""Extract action items with owner, task, due (YYYY-MM-DD if mentioned; else empty), 
-and priority (High/Med/Low).
-Return JSON: {{"tasks":[{{"owner":"","task":"","due":"","priority":""}}]}} 
-Transcript:
-{state.transcript}
-"""
-    out = chat_5_8_sentences(SYSTEM, user)
-    data = robust_json_parse(out)
-    raw_tasks = data.get("tasks", [])
+def extract_participants(state: MeetingState) -> Dict[str, Any]:
+    """Identify the meeting participants (from the speaker turns when the parse is confident)."""
+    return _expand_aliases(state, _run_flow(_participants_flow(state)))
+
+async def aextract_participants(state: MeetingState) -> Dict[str, Any]:
+    """Async version of extract_participants."""
+    return _expand_aliases(state, await _arun_flow(_participants_flow(state)))
+
+def _normalize_tasks(raw_tasks: List[Dict[str, Any]]) -> List[Task]:
+    """Convert raw task dicts from the LLM into Task models."""
     tasks: List[Task] = []
     for t in raw_tasks:
         # Normalize priority to match our enum
@@ -166,19 +459,155 @@ Transcript:
             due=(t.get("due") or "").strip(),
             priority=priority
         ))
-    logger.info(f"Tasks extracted: {[t.model_dump() for t in tasks]}")
-    return {"tasks": [t.model_dump() for t in tasks]}
+    return tasks
+
+def _tasks_prompt(transcript: str) -> str:
+    return _with_transcript(transcript, """Extract action items with owner, task, due (YYYY-MM-DD if mentioned; else empty),
+and priority (High/Med/Low).
+Return JSON: {"tasks":[{"owner":"","task":"","due":"","priority":""}]}""")
+
+def _tasks_flow(state: MeetingState, chunks: Optional[List[str]] = None) -> Flow:
+    chunks = _chunks(state) if chunks is None else chunks
+    outs = yield from _validated([LLMCall(SYSTEM, _tasks_prompt(chunk), node="assign_tasks", schema=TasksOutput)
+                                  for chunk in chunks])
+    tasks: List[Dict[str, Any]] = []
+    for out in outs:
+        chunk_tasks = _normalize_tasks(out.get("tasks", []))
+        tasks = merge_tasks(tasks, [t.model_dump() for t in chunk_tasks])
+    logger.info(f"Tasks extracted: {tasks}")
+    return {"tasks": tasks}
+
+def assign_tasks(state: MeetingState) -> Dict[str, Any]:
+    """Extract action items with owner, due date and priority."""
+    return _expand_aliases(state, _run_flow(_tasks_flow(state)))
+
+async def aassign_tasks(state: MeetingState) -> Dict[str, Any]:
+    """Async version of assign_tasks."""
+    return _expand_aliases(state, await _arun_flow(_tasks_flow(state)))
+
+# Per-field flows used when the combined extraction misses or garbles a field
+COMBINED_FALLBACKS = {
+    "title": _title_flow,
+    "executive_summary": _executive_summary_flow,
+    "agenda": _agenda_flow,
+    "decisions": _decisions_flow,
+    "participants": _participants_flow,
+    "tasks": _tasks_flow,
+}
+
+def _combined_prompt(transcript: str) -> str:
+    return _with_transcript(transcript, """Analyze this meeting transcript and return ALL of the following in one JSON object:
+- "title": a clear, concise title (3-6 words, avoid "Meeting" or "Discussion")
+- "executive_summary": 3-6 sentences on the main topics, key decisions and overall outcome
+- "agenda": concise agenda bullets (max 8)
+- "decisions": explicit decisions that were made
+- "participants": everyone who took part in the meeting
+- "tasks": action items with owner, task, due (YYYY-MM-DD if mentioned; else empty) and priority (High/Med/Low)
+
+Return ONLY the JSON:
+{"title": "", "executive_summary": "", "agenda": ["..."], "decisions": ["..."], "participants": ["..."],
+"tasks": [{"owner": "", "task": "", "due": "", "priority": ""}]}""")
+
+def _validate_combined_field(data: Dict[str, Any], field: str) -> Any:
+    """Return the validated value of one combined field, or None if it is missing or invalid."""
+    try:
+        value = getattr(CombinedExtraction.model_validate({field: data.get(field)}), field)
+        if field == "tasks" and value is not None:
+            value = [t.model_dump() for t in _normalize_tasks([task.model_dump() for task in value]) if t.task]
+    except (ValidationError, AttributeError):
+        return None
+    if isinstance(value, str) and len(value.strip()) < 3:
+        return None
+    return value
+
+def _combined_flow(state: MeetingState) -> Flow:
+    chunks = _chunks(state)
+    outs = yield [LLMCall(SYSTEM, _combined_prompt(chunk), node="extract_combined", schema=CombinedExtraction)
+                  for chunk in chunks]
+    partials = [robust_json_parse(out) for out in outs]
+    # Invalid fields are repaired by the per-field flows below, which record their own validations
+    for data in partials:
+        record_validation(all(_validate_combined_field(data, field) is not None for field in COMBINED_FALLBACKS))
+
+    update: Dict[str, Any] = {}
+    fallbacks: List[str] = []
+
+    # Title: the first chunk that produced a valid one
+    titles = [t for t in (_validate_combined_field(d, "title") for d in partials) if t]
+    if titles:
+        update["title"] = titles[0]
+    else:
+        fallbacks.append("title")
+        update.update((yield from _title_flow(state)))
+
+    # Executive summary: reuse the valid per-chunk summaries, then reduce
+    known = {i: v for i, v in enumerate(_validate_combined_field(d, "executive_summary") for d in partials) if v}
+    if len(known) < len(chunks):
+        fallbacks.append("executive_summary")
+    if len(chunks) > 1 or len(known) < len(chunks):
+        update.update((yield from _executive_summary_flow(state, known)))
+    else:
+        update["executive_summary"] = known[0]
+
+    # List fields: merge valid chunks, re-extract only the chunks where the field was invalid
+    # A confident speaker-turn parse wins over the model's participant list
+    parsed_participants = _parsed_participants(state)
+    for field in ("agenda", "decisions", "participants", "tasks"):
+        if field == "participants" and parsed_participants is not None:
+            update[field] = parsed_participants
+            continue
+        merge = merge_tasks if field == "tasks" else merge_unique
+        merged: List[Any] = []
+        invalid_chunks: List[str] = []
+        for chunk, data in zip(chunks, partials):
+            value = _validate_combined_field(data, field)
+            if value is None:
+                invalid_chunks.append(chunk)
+            else:
+                merged = merge(merged, value)
+        if invalid_chunks:
+            fallbacks.append(field)
+            retried = yield from COMBINED_FALLBACKS[field](state, invalid_chunks)
+            merged = merge(merged, retried[field])
+        update[field] = merged
+
+    if fallbacks:
+        logger.warning(f"Combined extraction missing or invalid fields, fell back: {fallbacks}")
+    logger.info(f"Combined extraction complete ({len(COMBINED_FALLBACKS) - len(fallbacks)}/{len(COMBINED_FALLBACKS)} "
+                f"fields from {len(chunks)} combined call(s))")
+    return update
+
+def extract_combined(state: MeetingState) -> Dict[str, Any]:
+    """Extract every field with a single LLM request.
+
+    Each field is validated on its own against CombinedExtraction/Task, and the
+    per-field flow is only run for fields that are missing or invalid.
+    """
+    return _expand_aliases(state, _run_flow(_combined_flow(state)))
+
+async def aextract_combined(state: MeetingState) -> Dict[str, Any]:
+    """Async version of extract_combined."""
+    return _expand_aliases(state, await _arun_flow(_combined_flow(state)))
+
+# Placeholder for a section whose node ran out of time, unlike a genuinely empty one
+DEGRADED_SECTION = "(not available: timed out)"
 
 def draft_minutes(state: MeetingState) -> Dict[str, Any]:
     today = date.today().isoformat()
-    agenda = state.agenda or ["(none)"]
-    decisions = state.decisions or ["(none)"]
+    degraded = set(state.degraded_fields)
+    empty = lambda field: DEGRADED_SECTION if field in degraded else "(none)"
+    agenda = state.agenda or [empty("agenda")]
+    decisions = state.decisions or [empty("decisions")]
     tasks = state.tasks or []
     title = state.title or f"Meeting Minutes — {today}"
 
     lines = [
         f"# {title}",
         f"Date: {today}",
+    ]
+    if degraded:
+        lines.append(f"_Partial minutes: {', '.join(sorted(degraded))} ran out of time._")
+    lines += [
         "## Agenda",
         *[f"- {a}" for a in agenda],
         "\n## Decisions",
@@ -193,7 +622,7 @@ def draft_minutes(state: MeetingState) -> Dict[str, Any]:
                 f" (Due: {t.due or 'TBD'}, Priority: {t.priority})"
             )
     else:
-        lines.append("- (none)")
+        lines.append(f"- {empty('tasks')}")
 
     md = "\n".join(lines)
     logger.info("Minutes drafted.")
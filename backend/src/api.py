@@ -5,22 +5,39 @@ This module provides a FastAPI server to expose the Transinia functionality
 as a REST API for the frontend to consume.
 """
 
+import asyncio
+import hashlib
 import uuid
 import json
 import os
 import tempfile
-from typing import List, Optional
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from fastapi import FastAPI, UploadFile, File, HTTPException, Body
+from fastapi import FastAPI, UploadFile, File, HTTPException, Body, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import sentry_sdk
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
-from backend.src.agents.graph import create_graph
+from backend.src.agents.graph import EXTRACTION_NODES, graph_registry
 from backend.src.config.settings import settings, logger
 from backend.src.models.schemas import MeetingState
 from backend.src.repositories.storage_repo import StorageRepository
+from backend.src.services.checkpoint_service import checkpoint_store
+from backend.src.services.llm_cache import bypass_cache
+from backend.src.services.metrics_service import metrics, summarize_run
+from backend.src.services.hedging import hedge_budget
+from backend.src.services.job_service import job_queue
+from backend.src.services.meeting_index import create_meeting_index
+from backend.src.services.single_flight import single_flight
+from backend.src.services.openai_service import llm_cache, llm_scheduler, resolve_route
+from backend.src.services.progress_service import ProgressStream, attach
+from backend.src.utils.pagination import decode_cursor, encode_cursor, paginate
 
 # Scrub sensitive data before sending to Sentry
 def scrub_sensitive_data(event, hint):
@@ -71,10 +88,22 @@ if sentry_dsn:
 else:
     logger.warning("SENTRY_DSN not set - Sentry error tracking disabled")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile every graph variant once at startup so requests only pay for invocation,
+    and run the job queue's workers for the lifetime of the app."""
+    graph_registry.warm()
+    job_queue.start(_generate_job, settings.job_workers)
+    try:
+        yield
+    finally:
+        await job_queue.stop()
+
 # Create FastAPI app
 app = FastAPI(title="Transinia API", 
               description="API for processing meeting transcripts and generating insights",
-              version="1.0.0")
+              version="1.0.0",
+              lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -87,6 +116,8 @@ app.add_middleware(
 
 # Create storage repository
 storage_repo = StorageRepository()
+# Which transcript each meeting was generated from, kept up to date on every write
+meeting_index = create_meeting_index(storage_repo)
 
 # Health check endpoint
 @app.get("/health")
@@ -94,6 +125,25 @@ def health_check():
     """Health check endpoint for ECS container health checks"""
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
 
+# Pipeline metrics endpoint
+@app.get("/api/metrics")
+def get_metrics():
+    """Process-wide latency, token and cost aggregates per node and per model,
+    with the model route each LLM-backed node is currently using"""
+    node_names = [name for name, _, _ in EXTRACTION_NODES] + ["extract_combined"]
+    return {
+        **metrics.snapshot(),
+        "routes": {name: asdict(resolve_route(name)) for name in node_names},
+        "llmCache": llm_cache.stats(),
+        "scheduler": llm_scheduler.stats(),
+        "hedging": hedge_budget.stats(),
+        "graphs": graph_registry.stats(),
+        "checkpoints": checkpoint_store.stats(),
+        "jobQueue": job_queue.stats(),
+        "meetingIndex": meeting_index.stats(),
+        "singleFlight": single_flight.stats(),
+    }
+
 # Define API models
 class TranscriptResponse(BaseModel):
     id: str
@@ -106,6 +156,22 @@ class TranscriptResponse(BaseModel):
 
 class MeetingDataRequest(BaseModel):
     transcriptId: str
+    # Pipeline topology for this request: "parallel", "serial" or "combined"
+    # (defaults to the GRAPH_MODE setting)
+    mode: Optional[str] = None
+    # Set to false to skip the LLM response cache for this request
+    useCache: bool = True
+    # Compact the transcript before the LLM calls (defaults to the COMPACT_TRANSCRIPT setting)
+    compact: Optional[bool] = None
+    # Process the transcript again even if it has not changed since it was processed
+    reprocess: bool = False
+    # Seconds the pipeline may take before the unfinished fields are returned
+    # as partial (defaults to the PIPELINE_DEADLINE_SECONDS setting; 0: no deadline)
+    deadlineSeconds: Optional[float] = None
+
+class TranscriptUpdateRequest(BaseModel):
+    transcriptId: str
+    content: str
 
 class ActionItem(BaseModel):
     id: str
@@ -135,77 +201,82 @@ async def root():
         "description": "API for processing meeting transcripts and generating insights"
     }
 
+# Full transcript listing behind the sorts S3 cannot list in (by date, or by name descending)
+_transcript_listing: Dict[str, Any] = {"objects": None, "at": 0.0}
+
+def _all_transcript_objects() -> List[dict]:
+    """Every transcript object, from a listing at most LIST_CACHE_SECONDS old."""
+    if (_transcript_listing["objects"] is None
+            or time.monotonic() - _transcript_listing["at"] > settings.list_cache_seconds):
+        _transcript_listing.update(objects=storage_repo.list_s3_transcript_objects(), at=time.monotonic())
+    return _transcript_listing["objects"]
+
+def _transcript_page(sort: str, order: str, limit: int, cursor: Optional[str]):
+    """One page of transcript objects and the cursor of the next one."""
+    if sort == "name" and order == "asc":
+        # S3 lists keys in this order, so a page is one listing call after the cursor's key
+        start_after = decode_cursor(cursor, sort, order)["id"] if cursor else None
+        objects, has_more = storage_repo.list_s3_transcript_page(limit, start_after)
+        last = objects[-1]["Key"] if objects else None
+        return objects, encode_cursor(sort, order, last, last) if has_more and last else None
+    sort_value = (lambda o: o["Key"]) if sort == "name" else (lambda o: o["LastModified"].isoformat())
+    return paginate(_all_transcript_objects(), sort, order, limit, cursor, sort_value, lambda o: o["Key"])
+
 @app.get("/api/transcripts/list")
-async def list_transcripts():
-    """List all available transcripts"""
+async def list_transcripts(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None,
+                           sort: str = Query("name", pattern="^(name|date)$"),
+                           order: str = Query("asc", pattern="^(asc|desc)$")):
+    """List the available transcripts, one page at a time: pass the returned
+    nextCursor back as cursor for the next page (null on the last one)"""
+    limit = min(limit or settings.list_page_size, settings.list_max_page_size)
     try:
         # Debug: print AWS credentials (redacted)
         logger.info(f"AWS Access Key ID available: {'Yes' if settings.aws_access_key_id else 'No'}")
         logger.info(f"AWS Secret Key available: {'Yes' if settings.aws_secret_access_key else 'No'}")
         logger.info(f"S3 Bucket Raw: {settings.s3_bucket_raw}")
         
-        # Get transcripts from S3
-        s3_transcripts = storage_repo.list_s3_transcripts()
-        logger.info(f"S3 transcripts found: {len(s3_transcripts)}")
+        # Get a page of transcripts from S3, with their size and date from the listing itself
+        try:
+            s3_transcripts, next_cursor = await run_in_threadpool(_transcript_page, sort, order, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Get all meeting data files to check which transcripts have been processed
-        s3_meeting_data = storage_repo.list_processed_files("meeting_data/")
-        meeting_data_entries = []
-        
-        # Load all meeting data entries to match with transcripts
-        for key in s3_meeting_data:
-            if key.endswith(".json"):
-                meeting_data_json = storage_repo.get_file_from_s3(key)
-                if meeting_data_json:
-                    try:
-                        meeting_data = json.loads(meeting_data_json)
-                        if "source" in meeting_data and "id" in meeting_data:
-                            meeting_data_entries.append({
-                                "source": meeting_data["source"],
-                                "id": meeting_data["id"]
-                            })
-                    except json.JSONDecodeError:
-                        logger.warning(f"Could not parse meeting data JSON: {key}")
+        # Which transcripts have been processed, from the source -> meeting index
+        index_entries = await run_in_threadpool(meeting_index.entries)
         
         # Format the response
         transcripts = []
         
-        for key in s3_transcripts:
-            # Get file metadata from S3
-            metadata = storage_repo.get_s3_object_metadata(key)
+        for obj in s3_transcripts:
+            key = obj['Key']
             
             # Extract filename from the S3 key
             filename = os.path.basename(key)
             
-            # Format the date (use last modified from metadata if available)
+            # Format the date (use last modified from the listing if available)
             date_str = datetime.now().strftime("%B %d, %Y")
-            if metadata and 'LastModified' in metadata:
-                date_str = metadata['LastModified'].strftime("%B %d, %Y")
+            if 'LastModified' in obj:
+                date_str = obj['LastModified'].strftime("%B %d, %Y")
             
             # Check if this transcript has been processed
-            processed = False
-            meeting_data_id = None
-            
-            for entry in meeting_data_entries:
-                if entry["source"] == key:
-                    processed = True
-                    meeting_data_id = entry["id"]
-                    break
+            entry = index_entries.get(key)
             
             transcript = TranscriptResponse(
                 id=key,
                 name=filename,
                 date=date_str,
-                size=metadata.get('ContentLength') if metadata else None,
+                size=obj.get('Size'),
                 source="s3",
-                processed=processed,
-                meetingDataId=meeting_data_id
+                processed=entry is not None,
+                meetingDataId=entry["id"] if entry else None
             )
             
             transcripts.append(transcript.model_dump())
         
-        return {"transcripts": transcripts}
+        return {"transcripts": transcripts, "nextCursor": next_cursor, "sort": sort, "order": order, "limit": limit}
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing transcripts: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to list transcripts: {str(e)}")
@@ -294,6 +365,8 @@ async def upload_transcript(file: UploadFile = File(...)):
         
         # Save to S3 - we'll force this to go to the raw bucket
         if storage_repo.save_file_to_s3(s3_key, content):
+            # The next sorted listing picks up the new transcript
+            _transcript_listing["objects"] = None
             return {
                 "success": True,
                 "message": "File uploaded successfully",
@@ -309,70 +382,61 @@ async def upload_transcript(file: UploadFile = File(...)):
         logger.error(f"Error uploading transcript: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to upload transcript: {str(e)}")
 
-@app.post("/api/meeting-data/generate")
-async def generate_meeting_data(request: MeetingDataRequest):
-    """Generate meeting data from a transcript"""
+@app.put("/api/transcripts/content")
+async def update_transcript(request: TranscriptUpdateRequest):
+    """Replace the text of an uploaded transcript (e.g. to correct a few lines).
+    Generating its meeting data again re-processes only the parts that changed."""
     try:
-        # Get transcript from S3
-        transcript_id = request.transcriptId
-        
-        # First, check if this transcript has already been processed
-        # Get all meeting data files to check
-        s3_meeting_data = storage_repo.list_processed_files("meeting_data/")
-        
-        # Check if any meeting data entries have this transcript as source
-        for key in s3_meeting_data:
-            if not key.endswith(".json"):
-                continue
-                
-            meeting_data_json = storage_repo.get_file_from_s3(key)
-            if meeting_data_json:
-                try:
-                    meeting_data = json.loads(meeting_data_json)
-                    if meeting_data.get("source") == transcript_id:
-                        logger.info(f"Transcript {transcript_id} already processed as meeting {meeting_data.get('id')}")
-                        return {
-                            "success": True,
-                            "message": "Meeting data already exists for this transcript",
-                            "meetingDataId": meeting_data.get("id"),
-                            "alreadyProcessed": True
-                        }
-                except json.JSONDecodeError:
-                    logger.warning(f"Could not parse meeting data JSON: {key}")
-        
-        # If not already processed, continue with processing
-        transcript_content = storage_repo.get_transcript_from_s3(transcript_id)
-        
-        if not transcript_content:
-            raise HTTPException(status_code=404, detail=f"Transcript not found: {transcript_id}")
-        
-        # Extract filename from the S3 key (used as meeting title)
-        filename = os.path.basename(transcript_id)
-        
-        # Create initial state
-        state = MeetingState(transcript=transcript_content, source=transcript_id)
-        
-        # Create and run the processing graph
-        graph = create_graph()
-        logger.info(f"Processing transcript: {transcript_id}")
-        final_state = graph.invoke(state)
-        
-        # Extract values from final_state
-        if hasattr(final_state, 'get'):
-            minutes_md = final_state.get("minutes_md", "")
-            agenda = final_state.get("agenda", [])
-            decisions = final_state.get("decisions", [])
-            tasks = final_state.get("tasks", [])
-            participants = final_state.get("participants", [])
-        else:
-            # Handle AddableValuesDict from LangGraph
-            minutes_md = getattr(final_state, "minutes_md", "")
-            agenda = getattr(final_state, "agenda", [])
-            decisions = getattr(final_state, "decisions", [])
-            tasks = getattr(final_state, "tasks", [])
-            participants = getattr(final_state, "participants", [])
-        
-        # Generate meeting data ID
+        existing = await run_in_threadpool(storage_repo.get_transcript_from_s3, request.transcriptId)
+        if not existing:
+            raise HTTPException(status_code=404, detail=f"Transcript not found: {request.transcriptId}")
+        if not await run_in_threadpool(storage_repo.save_file_to_s3, request.transcriptId, request.content.encode("utf-8")):
+            raise HTTPException(status_code=500, detail="Failed to save transcript to S3")
+        return {
+            "success": True,
+            "message": "Transcript updated successfully",
+            "fileId": request.transcriptId
+        }
+    except HTTPException as e:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        logger.error(f"Error updating transcript: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to update transcript: {str(e)}")
+
+def _find_processed_meeting(transcript_id: str, fresh: bool = False) -> Optional[dict]:
+    """Return the index entry (id, source, transcriptHash, partialFields) of the
+    meeting generated from this transcript, if any."""
+    return meeting_index.lookup(transcript_id, fresh)
+
+def _transcript_hash(transcript_content: str) -> str:
+    return hashlib.sha256(transcript_content.encode("utf-8")).hexdigest()
+
+def _store_meeting_outputs(final_state, transcript_id: str, pipeline_mode: str,
+                           run_metrics: Optional[Dict[str, Any]] = None,
+                           meeting_data_id: Optional[str] = None) -> str:
+    """Persist the pipeline results to DynamoDB/S3 and return the meeting data ID.
+    Pass meeting_data_id to overwrite the S3 outputs of a meeting that is re-processed."""
+    # Extract filename from the S3 key (used as meeting title)
+    filename = os.path.basename(transcript_id)
+    
+    # Extract values from final_state
+    if hasattr(final_state, 'get'):
+        minutes_md = final_state.get("minutes_md", "")
+        agenda = final_state.get("agenda", [])
+        decisions = final_state.get("decisions", [])
+        tasks = final_state.get("tasks", [])
+        participants = final_state.get("participants", [])
+    else:
+        # Handle AddableValuesDict from LangGraph
+        minutes_md = getattr(final_state, "minutes_md", "")
+        agenda = getattr(final_state, "agenda", [])
+        decisions = getattr(final_state, "decisions", [])
+        tasks = getattr(final_state, "tasks", [])
+        participants = getattr(final_state, "participants", [])
+    
+    # Generate meeting data ID
+    if meeting_data_id is None:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         meeting_data_id = f"meeting_{timestamp}"
         
@@ -382,72 +446,299 @@ async def generate_meeting_data(request: MeetingDataRequest):
             if meeting_id:
                 meeting_data_id = meeting_id
                 logger.info(f"Meeting saved to DynamoDB with ID: {meeting_id}")
-        
-        # Always save minutes and actions to S3
-        # Just pass the meeting_data_id without prefixes or extensions
-        # The S3 service will handle adding the proper prefix and extension
-        
-        # Save minutes to S3
-        if storage_repo.save_minutes_s3(meeting_data_id, minutes_md):
-            logger.info(f"Minutes saved to S3: minutes/{meeting_data_id}.md")
+    
+    # Always save minutes and actions to S3
+    # Just pass the meeting_data_id without prefixes or extensions
+    # The S3 service will handle adding the proper prefix and extension
+    
+    # Save minutes to S3
+    if storage_repo.save_minutes_s3(meeting_data_id, minutes_md):
+        logger.info(f"Minutes saved to S3: minutes/{meeting_data_id}.md")
+    else:
+        logger.warning(f"Failed to save minutes to S3: minutes/{meeting_data_id}.md")
+    
+    # Save actions to S3
+    if tasks:
+        if not isinstance(tasks[0], dict):
+            tasks_dict = [task.model_dump() for task in tasks]
         else:
-            logger.warning(f"Failed to save minutes to S3: minutes/{meeting_data_id}.md")
-        
-        # Save actions to S3
-        if tasks:
-            if not isinstance(tasks[0], dict):
-                tasks_dict = [task.model_dump() for task in tasks]
-            else:
-                tasks_dict = tasks
-                
-            if storage_repo.save_actions_s3(meeting_data_id, tasks_dict):
-                logger.info(f"Actions saved to S3: actions/{meeting_data_id}.json")
-            else:
-                logger.warning(f"Failed to save actions to S3: actions/{meeting_data_id}.json")
-        
-        # Save a JSON representation of the full meeting data for easy retrieval
-        meeting_data = {
-            "id": meeting_data_id,
-            "title": final_state.get("title") if hasattr(final_state, "get") and final_state.get("title") else f"Meeting Notes: {os.path.splitext(filename)[0]}",
-            "date": datetime.now().strftime("%B %d, %Y"),
-            "summary": minutes_md[:500] if len(minutes_md) > 500 else minutes_md,
-            "executiveSummary": final_state.get("executive_summary", "") if hasattr(final_state, "get") else "",
-            "actionItems": [
-                {
-                    "id": str(idx),
-                    "text": task.get("task") if isinstance(task, dict) else task.task,
-                    "assignee": task.get("owner") if isinstance(task, dict) else getattr(task, "owner", None),
-                    "completed": False
-                } for idx, task in enumerate(tasks) if tasks
-            ],
-            "keyPoints": agenda + [f"Decision: {d}" for d in decisions],
-            "participants": participants,
-            "duration": "Unknown",
-            "source": transcript_id
-        }
-        
-        # Save the complete meeting data to S3 - use clean key without double extensions
-        s3_meeting_data_key = f"meeting_data/{meeting_data_id}.json"
-        storage_repo.save_file_to_s3(
-            s3_meeting_data_key, 
-            json.dumps(meeting_data, indent=2).encode('utf-8')
-        )
-        logger.info(f"Complete meeting data saved to S3: {s3_meeting_data_key}")
-        
-        # Return success response with the meeting data ID
-        return {
-            "success": True,
-            "message": "Meeting data generated successfully",
-            "meetingDataId": meeting_data_id
-        }
+            tasks_dict = tasks
+            
+        if storage_repo.save_actions_s3(meeting_data_id, tasks_dict):
+            logger.info(f"Actions saved to S3: actions/{meeting_data_id}.json")
+        else:
+            logger.warning(f"Failed to save actions to S3: actions/{meeting_data_id}.json")
+    
+    # Save a JSON representation of the full meeting data for easy retrieval
+    meeting_data = {
+        "id": meeting_data_id,
+        "title": final_state.get("title") if hasattr(final_state, "get") and final_state.get("title") else f"Meeting Notes: {os.path.splitext(filename)[0]}",
+        "date": datetime.now().strftime("%B %d, %Y"),
+        # Sortable form of the date, for the meeting list
+        "processedAt": datetime.now().isoformat(timespec="seconds"),
+        "summary": minutes_md[:500] if len(minutes_md) > 500 else minutes_md,
+        "executiveSummary": final_state.get("executive_summary", "") if hasattr(final_state, "get") else "",
+        "actionItems": [
+            {
+                "id": str(idx),
+                "text": task.get("task") if isinstance(task, dict) else task.task,
+                "assignee": task.get("owner") if isinstance(task, dict) else getattr(task, "owner", None),
+                "completed": False
+            } for idx, task in enumerate(tasks) if tasks
+        ],
+        "keyPoints": agenda + [f"Decision: {d}" for d in decisions],
+        "participants": participants,
+        "duration": "Unknown",
+        "source": transcript_id,
+        # Hash of the processed transcript text, to detect later edits
+        "transcriptHash": _transcript_hash(final_state.get("transcript") or "") if hasattr(final_state, "get") else None,
+        "pipelineMode": pipeline_mode,
+        # Fields whose node ran out of time; the meeting is processed again on the next request
+        "partialFields": final_state.get("degraded_fields", []) if hasattr(final_state, "get") else [],
+        "metrics": run_metrics
+    }
+    
+    # Save the complete meeting data to S3 - use clean key without double extensions
+    s3_meeting_data_key = f"meeting_data/{meeting_data_id}.json"
+    if storage_repo.save_file_to_s3(
+        s3_meeting_data_key, 
+        json.dumps(meeting_data, indent=2).encode('utf-8')
+    ):
+        meeting_index.record(meeting_data)
+    logger.info(f"Complete meeting data saved to S3: {s3_meeting_data_key}")
+    return meeting_data_id
+
+async def _load_transcript(request: MeetingDataRequest) -> str:
+    """Validate the request and return the transcript text."""
+    pipeline_mode = request.mode or settings.graph_mode
+    try:
+        graph_registry.get(pipeline_mode, request.compact)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Storage calls use blocking boto3 clients, so they run in the threadpool
+    # to keep the event loop free for other requests while a pipeline runs
+    transcript_content = await run_in_threadpool(storage_repo.get_transcript_from_s3, request.transcriptId)
+    if not transcript_content:
+        raise HTTPException(status_code=404, detail=f"Transcript not found: {request.transcriptId}")
+    return transcript_content
+
+def _is_current(existing: Optional[dict], request: MeetingDataRequest, transcript_content: str) -> bool:
+    """True if the stored meeting data was generated from this version of the transcript.
+    Meeting data stored before transcript hashes were recorded counts as current;
+    partial meeting data (some node ran out of time) never does."""
+    if existing is None or request.reprocess or existing.get("partialFields"):
+        return False
+    stored_hash = existing.get("transcriptHash")
+    return stored_hash is None or stored_hash == _transcript_hash(transcript_content)
+
+async def _run_pipeline(request: MeetingDataRequest, transcript_content: str,
+                        existing: Optional[dict] = None) -> Dict[str, Any]:
+    """Run the graph on a transcript, store the outputs and return the response payload.
+    existing is the index entry of the meeting generated from an earlier version of the
+    transcript; that meeting is overwritten, and the LLM outputs of the chunks that did
+    not change are reused."""
+    transcript_id = request.transcriptId
+    state = MeetingState(transcript=transcript_content, source=transcript_id)
+
+    # Run the processing graph (compiled once per process by the registry)
+    pipeline_mode = request.mode or settings.graph_mode
+    logger.info(f"Processing transcript: {transcript_id} (mode: {pipeline_mode})")
+    started = time.perf_counter()
+    if request.useCache:
+        final_state = await graph_registry.ainvoke(state, pipeline_mode, request.compact, request.deadlineSeconds)
+    else:
+        with bypass_cache():
+            final_state = await graph_registry.ainvoke(state, pipeline_mode, request.compact, request.deadlineSeconds)
+    run_metrics = summarize_run(final_state.get("node_metrics", []), time.perf_counter() - started)
+    logger.info(f"Pipeline ({pipeline_mode}) finished in {run_metrics['wall_time_s']:.2f}s "
+                f"({run_metrics['llm_calls']} LLM calls, ${run_metrics['cost_usd']:.5f}, "
+                f"slowest node: {run_metrics['slowest_node']})")
+
+    meeting_data_id = await run_in_threadpool(_store_meeting_outputs, final_state, transcript_id, pipeline_mode,
+                                              run_metrics, existing.get("id") if existing else None)
+    return {
+        "success": True,
+        "message": "Meeting data regenerated successfully" if existing else "Meeting data generated successfully",
+        "meetingDataId": meeting_data_id,
+        "runId": final_state.get("run_id"),
+        # Nodes restored from the checkpoints of an earlier, failed attempt
+        "resumedNodes": final_state.get("resumed_nodes", []),
+        # Chunks changed since the last run over this transcript and LLM calls reused from it
+        "reuse": final_state.get("reprocessing"),
+        # Fields left empty or partial because their node ran out of time
+        "partialFields": final_state.get("degraded_fields", []),
+        "metrics": run_metrics
+    }
+
+def _already_processed(existing: dict) -> Dict[str, Any]:
+    logger.info(f"Transcript {existing.get('source')} already processed as meeting {existing.get('id')}")
+    return {
+        "success": True,
+        "message": "Meeting data already exists for this transcript",
+        "meetingDataId": existing.get("id"),
+        "alreadyProcessed": True
+    }
+
+async def _generate_exclusive(request: MeetingDataRequest, progress: Optional[ProgressStream] = None,
+                              transcript_content: Optional[str] = None) -> Dict[str, Any]:
+    """Generate meeting data unless this version of the transcript was already processed.
+    Runs while holding the transcript's single-flight lease."""
+    # First, check if this version of the transcript has already been processed;
+    # re-read the index, since another worker may just have finished it
+    existing = await run_in_threadpool(_find_processed_meeting, request.transcriptId, True)
+    if transcript_content is None:
+        transcript_content = await _load_transcript(request)
+    if _is_current(existing, request, transcript_content):
+        return _already_processed(existing)
+
+    # If not (or if it was edited since), continue with processing
+    if progress is None:
+        return await _run_pipeline(request, transcript_content, existing)
+    with attach(progress):
+        return await _run_pipeline(request, transcript_content, existing)
+
+async def _generate(request: MeetingDataRequest, progress: Optional[ProgressStream] = None,
+                    transcript_content: Optional[str] = None) -> Dict[str, Any]:
+    """Generate meeting data, once per transcript at a time: a request for a transcript
+    that is already being processed gets that run's response, marked coalesced."""
+    result, shared = await single_flight.run(request.transcriptId,
+                                             lambda: _generate_exclusive(request, progress, transcript_content))
+    return {**result, "coalesced": True} if shared else result
+
+async def _generate_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job queue handler: generate meeting data for a queued /generate request."""
+    return await _generate(MeetingDataRequest(**payload))
+
+def _job_response(job: Dict[str, Any]) -> Dict[str, Any]:
+    timestamp = lambda t: datetime.fromtimestamp(t).isoformat() if t else None
+    return {
+        "jobId": job["id"],
+        "status": job["status"],
+        "transcriptId": job["payload"].get("transcriptId"),
+        # Queued jobs ahead of this one
+        "position": job["position"],
+        "attempts": job["attempts"],
+        "createdAt": timestamp(job["created_at"]),
+        "startedAt": timestamp(job["started_at"]),
+        "finishedAt": timestamp(job["finished_at"]),
+        # The /generate response once done, the error message once failed
+        "result": job["result"],
+        "error": job["error"],
+    }
+
+@app.post("/api/meeting-data/generate", status_code=202)
+async def generate_meeting_data(request: MeetingDataRequest):
+    """Queue the generation of meeting data from a transcript; poll /api/jobs/{jobId} for the result"""
+    pipeline_mode = request.mode or settings.graph_mode
+    try:
+        graph_registry.get(pipeline_mode, request.compact)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        job_id = await run_in_threadpool(job_queue.submit, request.model_dump())
+    except Exception as e:
+        logger.error(f"Error queueing meeting data generation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue meeting data generation: {str(e)}")
+    logger.info(f"Queued job {job_id} for transcript {request.transcriptId}")
+    return {
+        "success": True,
+        "message": "Meeting data generation queued",
+        "jobId": job_id,
+        "status": "queued",
+        "statusUrl": f"/api/jobs/{job_id}",
+    }
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status of a queued generation job: queued, running, done (with the result) or failed"""
+    job = await run_in_threadpool(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return _job_response(job)
+
+# Streamed runs keep going if the client disconnects, so their results are still stored
+_stream_tasks = set()
+
+@app.post("/api/meeting-data/generate/stream")
+async def stream_meeting_data(request: MeetingDataRequest):
+    """Generate meeting data and stream the progress as Server-Sent Events.
+
+    Events: node_start / node_end (with the fields the node produced), partial
+    (a field of an LLM response, sent as soon as it or one of its list items is
+    complete), node_error, and finally complete (the /generate response plus
+    timeToFirstPartialS) or error. A request joining a run already in flight for
+    the transcript only gets the complete event.
+    """
+    transcript_content = await _load_transcript(request)
+    progress = ProgressStream()
+
+    async def run():
+        try:
+            result = await _generate(request, progress, transcript_content)
+            logger.info(f"Streamed run: first partial result after {progress.first_partial_s}s")
+            progress.emit({"type": "complete", **result, "timeToFirstPartialS": progress.first_partial_s})
+        except Exception as e:
+            logger.error(f"Error generating meeting data: {str(e)}")
+            progress.emit({"type": "error", "message": f"Failed to generate meeting data: {str(e)}"})
+        finally:
+            progress.close()
+
+    task = asyncio.create_task(run())
+    _stream_tasks.add(task)
+    task.add_done_callback(_stream_tasks.discard)
+    return StreamingResponse(progress.sse(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/api/meeting-data/list")
+async def list_meeting_data(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None,
+                            sort: str = Query("date", pattern="^(name|date)$"),
+                            order: str = Query("desc", pattern="^(asc|desc)$")):
+    """List the generated meetings (id, title, date, source, status), one page at a
+    time: pass the returned nextCursor back as cursor for the next page"""
+    limit = min(limit or settings.list_page_size, settings.list_max_page_size)
+    try:
+        # Served from the source -> meeting index, without reading any meeting data
+        meetings = [
+            {
+                "id": entry["id"],
+                "title": entry.get("title") or entry["id"],
+                "date": entry.get("date", ""),
+                "processedAt": entry.get("processedAt", ""),
+                "source": entry["source"],
+                "status": entry.get("status", "processed"),
+                "partialFields": entry.get("partialFields", []),
+            }
+            for entry in (await run_in_threadpool(meeting_index.entries)).values()
+        ]
         
-    except HTTPException as e:
-        # Re-raise HTTP exceptions
+        # If no meeting data found in S3, try DynamoDB
+        if not meetings and settings.use_dynamodb:
+            for meeting in await run_in_threadpool(storage_repo.list_meetings_from_dynamodb):
+                meetings.append({
+                    "id": meeting.get("meeting_id", ""),
+                    "title": "Meeting Summary",
+                    "date": meeting.get("date", ""),
+                    "processedAt": meeting.get("date", ""),
+                    "source": meeting.get("source", "Unknown"),
+                    "status": "processed",
+                    "partialFields": [],
+                })
+        
+        sort_value = (lambda m: m["title"].lower()) if sort == "name" else (lambda m: m["processedAt"] or "")
+        try:
+            page, next_cursor = paginate(meetings, sort, order, limit, cursor, sort_value, lambda m: m["id"])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"meetingData": page, "nextCursor": next_cursor, "sort": sort, "order": order, "limit": limit}
+    
+    except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating meeting data: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate meeting data: {str(e)}")
+        logger.error(f"Error listing meeting data: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to list meeting data: {str(e)}")
 
+# Declared after /list, which would otherwise match as a meeting ID
 @app.get("/api/meeting-data/{meeting_id}")
 async def get_meeting_data(meeting_id: str):
     """Get meeting data by ID"""
@@ -589,49 +880,6 @@ async def get_meeting_data(meeting_id: str):
         logger.error(f"Error getting meeting data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get meeting data: {str(e)}")
 
-@app.get("/api/meeting-data/list")
-async def list_meeting_data():
-    """List all available meeting data"""
-    try:
-        # Get all meeting data files from S3
-        s3_meeting_data = storage_repo.list_s3_objects_with_prefix("meeting_data/")
-        
-        # Format the response
-        meeting_data_list = []
-        
-        for key in s3_meeting_data:
-            if not key.endswith(".json"):
-                continue
-                
-            # Get the meeting data from S3
-            meeting_data_json = storage_repo.get_file_from_s3(key)
-            
-            if meeting_data_json:
-                meeting_data = json.loads(meeting_data_json)
-                meeting_data_list.append(meeting_data)
-        
-        # If no meeting data found in S3, try DynamoDB
-        if not meeting_data_list and settings.use_dynamodb:
-            meetings = storage_repo.list_meetings_from_dynamodb()
-            
-            for meeting in meetings:
-                meeting_data = {
-                    "id": meeting.get("meeting_id", ""),
-                    "title": "Meeting Summary",
-                    "date": meeting.get("date", ""),
-                    "participants": meeting.get("participants", []),
-                    "actionItems": len(meeting.get("tasks", [])),
-                    "keyPoints": len(meeting.get("agenda", [])) + len(meeting.get("decisions", [])),
-                    "duration": meeting.get("duration", "Unknown")
-                }
-                meeting_data_list.append(meeting_data)
-        
-        return {"meetingData": meeting_data_list}
-    
-    except Exception as e:
-        logger.error(f"Error listing meeting data: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to list meeting data: {str(e)}")
-
 @app.get("/api/tasks/high-priority")
 async def get_high_priority_tasks():
     """Get high priority tasks from all meetings"""
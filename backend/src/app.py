@@ -8,25 +8,149 @@ It provides:
 2. Functions to load transcripts from local files or S3 storage
 3. Pipeline execution to analyze transcripts and extract information
 4. Output handling to save results locally or to S3
+5. Batch mode: many transcripts through one compiled graph, with bounded
+   concurrency and a resumable manifest (see batch_service)
 
 Usage:
 1. For local transcripts: python -m src
 2. For S3 stored transcripts: python -m src --source s3 --s3-key your_transcript.txt
 3. To list available S3 transcripts: python -m src --list-s3
+4. To pick the pipeline topology: python -m src --mode combined
+5. To backfill many transcripts: python -m src --batch "transcripts/*.txt" --concurrency 8
+   (a directory or s3://<prefix> works too; re-running the command resumes the batch)
 """
 
 import os
 import argparse
+import asyncio
 import json
 import sys
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Union
 
-from src.agents.graph import create_graph
-from src.config.settings import settings, logger
-from src.models.schemas import MeetingState, Task
-from src.repositories.storage_repo import StorageRepository
-from src.utils.paths import TRANSCRIPT_TXT
+from backend.src.agents.graph import graph_registry
+from backend.src.config.settings import settings, logger
+from backend.src.models.schemas import MeetingState, Task
+from backend.src.repositories.storage_repo import StorageRepository
+from backend.src.services.batch_service import BatchItem, BatchManifest, collect_items, default_manifest_path, run_batch
+from backend.src.services.llm_cache import bypass_cache
+from backend.src.services.metrics_service import summarize_run
+from backend.src.utils.paths import BATCH_DIR, TRANSCRIPT_TXT
+
+
+def _store_results(storage_repo: StorageRepository, final_state, minutes_path=None, actions_path=None,
+                   fallback_id: str = "") -> str:
+    """Save the minutes and actions locally, to DynamoDB and to S3; returns the meeting ID.
+    Without DynamoDB the ID is fallback_id, or one made from the current time."""
+    minutes_md = final_state.get("minutes_md", "")
+    tasks = final_state.get("tasks", [])
+    
+    # Generate meeting ID
+    meeting_id = ""
+    
+    # Save to DynamoDB if enabled
+    if settings.use_dynamodb:
+        # Make sure we're passing the complete state to DynamoDB
+        meeting_id = storage_repo.save_meeting_to_dynamodb(final_state)
+        if meeting_id:
+            logger.info(f"Meeting saved to DynamoDB with ID: {meeting_id}")
+    
+    # If no meeting ID from DynamoDB, generate one
+    if not meeting_id and fallback_id:
+        meeting_id = fallback_id
+    if not meeting_id:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        meeting_id = f"meeting_{timestamp}"
+    
+    # Save minutes locally
+    minutes_path = storage_repo.save_minutes_local(minutes_md, minutes_path)
+    logger.info(f"Minutes saved to: {minutes_path}")
+    
+    # Convert tasks to dict if they are not already
+    if tasks and not isinstance(tasks[0], dict):
+        tasks_dict = [task.model_dump() for task in tasks]
+    else:
+        tasks_dict = tasks
+    
+    # Save actions locally
+    if tasks_dict:
+        actions_path = storage_repo.save_actions_local(tasks_dict, actions_path)
+        logger.info(f"Actions saved to: {actions_path}")
+    
+    # Save to S3 if enabled
+    if settings.aws_access_key_id and settings.aws_secret_access_key:
+        s3_minutes_key = f"minutes/{meeting_id}.md"
+        s3_actions_key = f"actions/{meeting_id}.json"
+        
+        # Save minutes to S3
+        if storage_repo.save_minutes_s3(s3_minutes_key, minutes_md):
+            logger.info(f"Minutes saved to S3: {s3_minutes_key}")
+        
+        # Save actions to S3
+        if tasks_dict and storage_repo.save_actions_s3(s3_actions_key, tasks_dict):
+            logger.info(f"Actions saved to S3: {s3_actions_key}")
+    
+    return meeting_id
+
+
+def _run_batch(args, storage_repo: StorageRepository) -> None:
+    """Process every transcript of a batch spec through one compiled graph."""
+    items = collect_items(args.batch, storage_repo)
+    if not items:
+        logger.error(f"No transcripts found for batch: {args.batch}")
+        return
+    manifest = BatchManifest(args.manifest or default_manifest_path(args.batch))
+    compact = True if args.compact else None
+    concurrency = args.concurrency or settings.batch_concurrency
+    # Compile the graph once; every item runs through the same instance
+    graph_registry.get(args.mode, compact)
+    logger.info(f"Batch of {len(items)} transcript(s) (mode: {args.mode or settings.graph_mode}, "
+                f"concurrency {concurrency}, manifest {manifest.path})")
+    
+    def load(item: BatchItem) -> str:
+        if item.s3:
+            return storage_repo.get_transcript_from_s3(item.source)
+        with open(item.source, "r", encoding="utf-8") as f:
+            return f.read()
+    
+    async def process(item: BatchItem) -> Dict[str, Any]:
+        transcript = await asyncio.to_thread(load, item)
+        if not transcript:
+            raise ValueError("No transcript content found")
+        started = time.perf_counter()
+        final_state = await graph_registry.ainvoke(MeetingState(transcript=transcript, source=item.source),
+                                                   args.mode, compact, args.deadline)
+        run_metrics = summarize_run(final_state.get("node_metrics", []), time.perf_counter() - started)
+        output_dir = BATCH_DIR / item.slug
+        # Items finish within the same second, so their IDs come from the source instead
+        meeting_id = await asyncio.to_thread(_store_results, storage_repo, final_state,
+                                             output_dir / "minutes.md", output_dir / "actions.json",
+                                             f"meeting_{item.key}")
+        return {"meetingId": meeting_id, "run": run_metrics,
+                "partialFields": final_state.get("degraded_fields", [])}
+    
+    async def run():
+        if args.no_cache:
+            with bypass_cache():
+                return await run_batch(items, process, manifest, concurrency, not args.skip_failed)
+        return await run_batch(items, process, manifest, concurrency, not args.skip_failed)
+    
+    summary = asyncio.run(run())
+    
+    print("\n" + "=" * 60)
+    print("BATCH SUMMARY")
+    print("=" * 60)
+    print(f"Transcripts: {summary['items']} ({summary['skipped']} already done or skipped)")
+    print(f"Processed: {summary['done']} done, {summary['partial']} partial, "
+          f"{summary['failed']} failed in {summary['elapsed_s']:.1f}s")
+    print(f"Throughput: {summary['meetings_per_min']:.2f} meetings/min, {summary['tokens_per_min']:.0f} tokens/min")
+    print(f"Meeting latency: p50 {summary['meeting_p50_s']:.2f}s, p95 {summary['meeting_p95_s']:.2f}s")
+    print(f"LLM: {summary['llm_calls']} calls, {summary['tokens']} tokens, ${summary['cost_usd']:.5f}")
+    print(f"Manifest: {summary['manifest']} ({summary['manifest_counts']['done']} done, "
+          f"{summary['manifest_counts']['partial']} partial, "
+          f"{summary['manifest_counts']['failed']} failed in total)")
+    print("=" * 60)
 
 
 def main():
@@ -50,6 +174,21 @@ def main():
     parser.add_argument("--find-meetings", help="Find meetings by participant name")
     parser.add_argument("--find-tasks", help="Find tasks by owner name")
     
+    # Pipeline options
+    parser.add_argument("--mode", choices=["parallel", "serial", "combined"],
+                        help="Pipeline topology (defaults to GRAPH_MODE)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache")
+    parser.add_argument("--compact", action="store_true", help="Compact the transcript before the LLM calls")
+    parser.add_argument("--deadline", type=float,
+                        help="Seconds per transcript before unfinished fields are left partial "
+                             "(defaults to PIPELINE_DEADLINE_SECONDS; 0: no deadline)")
+    
+    # Batch options
+    parser.add_argument("--batch", help="Process many transcripts: a directory, a glob pattern or s3://<prefix>")
+    parser.add_argument("--concurrency", type=int, help="Transcripts in flight at once (defaults to BATCH_CONCURRENCY)")
+    parser.add_argument("--manifest", help="Manifest of done and failed items (defaults to outputs/batch/manifest-<hash>.jsonl)")
+    parser.add_argument("--skip-failed", action="store_true", help="Do not retry items the manifest records as failed")
+    
     args = parser.parse_args()
     
     # Create the storage repository
@@ -132,6 +271,10 @@ def main():
             print("-" * 40)
         return
     
+    if args.batch:
+        _run_batch(args, storage_repo)
+        return
+    
     # Get transcript from file or S3
     transcript = ""
     source = ""
@@ -165,9 +308,16 @@ def main():
     state = MeetingState(transcript=transcript, source=source)
     
     # Create and run the processing graph
-    graph = create_graph()
-    logger.info("Processing transcript...")
-    final_state = graph.invoke(state)
+    compact = True if args.compact else None
+    logger.info(f"Processing transcript (mode: {args.mode or settings.graph_mode})...")
+    started = time.perf_counter()
+    if args.no_cache:
+        with bypass_cache():
+            final_state = graph_registry.invoke(state, args.mode, compact, args.deadline)
+    else:
+        final_state = graph_registry.invoke(state, args.mode, compact, args.deadline)
+    run_metrics = summarize_run(final_state.get("node_metrics", []), time.perf_counter() - started)
+    logger.info(f"Pipeline finished in {run_metrics['wall_time_s']:.2f}s")
     
     # Debug - print the entire state for inspection
     logger.info(f"Final state contains: {dir(final_state)}")
@@ -188,55 +338,7 @@ def main():
     
     # Store results
     logger.info("Storing results...")
-    
-    # Generate meeting ID
-    meeting_id = ""
-    
-    # Save to DynamoDB if enabled
-    if settings.use_dynamodb:
-        # Make sure we're passing the complete state to DynamoDB
-        meeting_id = storage_repo.save_meeting_to_dynamodb(final_state)
-        if meeting_id:
-            logger.info(f"Meeting saved to DynamoDB with ID: {meeting_id}")
-    
-    # If no meeting ID from DynamoDB, generate one
-    if not meeting_id:
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        meeting_id = f"meeting_{timestamp}"
-    
-    # Save minutes locally
-    minutes_path = storage_repo.save_minutes_local(minutes_md)
-    logger.info(f"Minutes saved to: {minutes_path}")
-    
-    # Save actions locally
-    if tasks:
-        # Convert tasks to dict if they are not already
-        if tasks and not isinstance(tasks[0], dict):
-            tasks_dict = [task.model_dump() for task in tasks]
-        else:
-            tasks_dict = tasks
-            
-        actions_path = storage_repo.save_actions_local(tasks_dict)
-        logger.info(f"Actions saved to: {actions_path}")
-    
-    # Save to S3 if enabled
-    if settings.aws_access_key_id and settings.aws_secret_access_key:
-        s3_minutes_key = f"minutes/{meeting_id}.md"
-        s3_actions_key = f"actions/{meeting_id}.json"
-        
-        # Save minutes to S3
-        if storage_repo.save_minutes_s3(s3_minutes_key, minutes_md):
-            logger.info(f"Minutes saved to S3: {s3_minutes_key}")
-        
-        # Save actions to S3
-        if tasks:
-            if not isinstance(tasks[0], dict):
-                tasks_dict = [task.model_dump() for task in tasks]
-            else:
-                tasks_dict = tasks
-                
-            if storage_repo.save_actions_s3(s3_actions_key, tasks_dict):
-                logger.info(f"Actions saved to S3: {s3_actions_key}")
+    meeting_id = _store_results(storage_repo, final_state)
     
     # Output summary
     print("\n" + "=" * 60)
@@ -257,6 +359,25 @@ def main():
     print(f"Decisions: {len(decisions)}")
     print(f"Action Items: {len(tasks) if tasks else 0}")
     print("=" * 60)
+    print(f"Pipeline: {run_metrics['wall_time_s']:.2f}s, {run_metrics['llm_calls']} LLM calls "
+          f"({run_metrics['cache_hits']} cached, {run_metrics['retries']} retries), "
+          f"{run_metrics['prompt_tokens']} prompt ({run_metrics['cached_tokens']} cached) + "
+          f"{run_metrics['completion_tokens']} completion tokens, "
+          f"${run_metrics['cost_usd']:.5f}")
+    if run_metrics["parse_failures"]:
+        print(f"Responses: {run_metrics['parse_failures']}/{run_metrics['validated']} failed validation, "
+              f"{run_metrics['repairs'] - run_metrics['repair_failures']}/{run_metrics['repairs']} repaired")
+    resumed = final_state.get("resumed_nodes") or []
+    if resumed:
+        print(f"Resumed from checkpoints: {', '.join(resumed)}")
+    partial = final_state.get("degraded_fields") or []
+    if partial:
+        print(f"Partial (ran out of time): {', '.join(partial)}")
+    print(f"{'Node':<28}{'Wall (s)':>10}{'Calls':>7}{'Tokens':>9}{'Cost ($)':>11}")
+    for node in run_metrics["nodes"].values():
+        tokens = node["prompt_tokens"] + node["completion_tokens"]
+        print(f"{node['node']:<28}{node['wall_time_s']:>10.2f}{node['llm_calls']:>7}{tokens:>9}{node['cost_usd']:>11.5f}")
+    print("=" * 60)
     print(minutes_md[:500] + "..." if len(minutes_md) > 500 else minutes_md)
     print("=" * 60)
     
@@ -11,15 +11,20 @@ It provides:
    - AWS access credentials for S3 storage
    - S3 bucket names for raw transcripts and processed outputs
    - DynamoDB table names for persistent storage
+   - Pipeline options such as the graph topology, the LLM response cache, retries
+     and the per-node model routing table
    - Other configurable application parameters
 
 This centralized configuration makes the application more maintainable
 and allows for configuration changes without code modifications.
 """
 
+import json
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -30,6 +35,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger("meeting-bot-local")
 
+@lru_cache(maxsize=8)
+def _parse_routes(raw: str) -> Dict[str, Dict[str, Any]]:
+    """Parse the LLM_ROUTES JSON, ignoring it (with a warning) if it is invalid."""
+    if not raw.strip():
+        return {}
+    try:
+        routes = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring invalid LLM_ROUTES JSON: {e}")
+        return {}
+    if not isinstance(routes, dict) or not all(isinstance(v, dict) for v in routes.values()):
+        logger.warning("Ignoring LLM_ROUTES: expected an object of node name -> route object")
+        return {}
+    return routes
+
 @dataclass(frozen=True)
 class Settings:
     # Environment
@@ -49,6 +69,152 @@ class Settings:
     use_dynamodb: bool = os.getenv("USE_DYNAMODB", "false").lower() in ("true", "1", "yes")
     dynamodb_table_meetings: str = os.getenv("DYNAMODB_TABLE_MEETINGS", "transinia-dev-meetings")
     dynamodb_table_actions: str = os.getenv("DYNAMODB_TABLE_ACTIONS", "transinia-dev-actions")
+    dynamodb_table_checkpoints: str = os.getenv("DYNAMODB_TABLE_CHECKPOINTS", "transinia-dev-checkpoints")
+    dynamodb_table_leases: str = os.getenv("DYNAMODB_TABLE_LEASES", "transinia-dev-leases")
+    
+    # Pipeline topology: "parallel" fans the extraction nodes out concurrently,
+    # "serial" runs them one after another
+    graph_mode: str = os.getenv("GRAPH_MODE", "parallel").lower()
+    
+    # Long transcripts are split on speaker turns into chunks of at most this many
+    # (estimated) tokens; each extraction node processes the chunks concurrently
+    chunk_max_tokens: int = int(os.getenv("CHUNK_MAX_TOKENS", "6000"))
+    chunk_max_concurrency: int = int(os.getenv("CHUNK_MAX_CONCURRENCY", "4"))
+    
+    # Compact the transcript (drop filler and pleasantries, alias speaker names)
+    # before any LLM call; off until the benchmark confirms extraction quality holds
+    compact_transcript: bool = os.getenv("COMPACT_TRANSCRIPT", "false").lower() in ("true", "1", "yes")
+    
+    # Participants come from the parsed "Name: utterance" turns when the parse
+    # confidence is at least this high; below it the LLM extracts them
+    participants_min_confidence: float = float(os.getenv("PARTICIPANTS_MIN_CONFIDENCE", "0.8"))
+    
+    # LLM response cache: "memory", "sqlite" or "none"
+    llm_cache_backend: str = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    llm_cache_path: str = os.getenv("LLM_CACHE_PATH", "")
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    llm_cache_ttl_seconds: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    # Calls above this temperature are only cached when they opt in
+    llm_cache_max_temperature: float = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.2"))
+    
+    # Retries for transient OpenAI errors (connection, timeout, 429, 5xx); each
+    # retry is counted in the pipeline metrics
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    
+    # Rate-limit scheduler shared by every LLM call: request and token budgets per
+    # minute (set them to the account limits), the adaptive concurrency range and
+    # the jittered exponential backoff between retries
+    llm_rpm_limit: float = float(os.getenv("LLM_RPM_LIMIT", "500"))
+    llm_tpm_limit: float = float(os.getenv("LLM_TPM_LIMIT", "200000"))
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    llm_min_concurrency: int = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+    llm_backoff_base_seconds: float = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+    llm_backoff_max_seconds: float = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+    
+    # Model routing: the default model and request timeout, plus LLM_ROUTES, a JSON
+    # object mapping a node name to any of "model", "temperature", "max_tokens" and
+    # "timeout", e.g. {"extract_title": {"model": "gpt-4.1-nano", "max_tokens": 32}}
+    llm_model: str = os.getenv("LLM_MODEL", "gpt-4o-mini")
+    llm_timeout_seconds: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    llm_routes_json: str = os.getenv("LLM_ROUTES", "")
+    
+    # Constrain node responses to the JSON schema of their output model (OpenAI
+    # structured outputs); turn off for models without json_schema support.
+    # Responses are validated against the model either way
+    llm_structured_outputs: bool = os.getenv("LLM_STRUCTURED_OUTPUTS", "true").lower() in ("true", "1", "yes")
+    
+    # Hedged requests against tail latency: once a node has LLM_HEDGE_MIN_SAMPLES
+    # latencies, a call running longer than their LLM_HEDGE_PERCENTILE (at least
+    # LLM_HEDGE_MIN_DELAY_SECONDS) gets a duplicate request and the first answer
+    # wins. LLM_HEDGE_BUDGET caps duplicates as a fraction of all calls
+    llm_hedging: bool = os.getenv("LLM_HEDGING", "false").lower() in ("true", "1", "yes")
+    llm_hedge_percentile: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    llm_hedge_budget: float = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+    llm_hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    llm_hedge_min_delay_seconds: float = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1.0"))
+    
+    @property
+    def llm_routes(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node overrides parsed from LLM_ROUTES."""
+        return _parse_routes(self.llm_routes_json)
+    
+    # Per-node checkpoints so a failed run resumes without repeating finished LLM
+    # calls: "sqlite" (local file), "s3", "dynamodb" or "none". Checkpoints of
+    # failed runs expire after the TTL; completed runs delete theirs
+    checkpoint_backend: str = os.getenv("CHECKPOINT_BACKEND", "sqlite").lower()
+    checkpoint_path: str = os.getenv("CHECKPOINT_PATH", "")
+    checkpoint_ttl_seconds: int = int(os.getenv("CHECKPOINT_TTL_SECONDS", "604800"))
+    
+    # Incremental re-processing of edited transcripts: the LLM outputs of the last
+    # run over a source are kept in the checkpoint store, chunks are cut at
+    # content-defined boundaries (about INCREMENTAL_CHUNK_TOKENS each) and only the
+    # chunks that changed are re-extracted, unless more than
+    # INCREMENTAL_MAX_CHANGED_RATIO of them did (then everything runs again)
+    incremental_reprocessing: bool = os.getenv("INCREMENTAL_REPROCESSING", "true").lower() in ("true", "1", "yes")
+    incremental_chunk_tokens: int = int(os.getenv("INCREMENTAL_CHUNK_TOKENS", "2000"))
+    incremental_max_changed_ratio: float = float(os.getenv("INCREMENTAL_MAX_CHANGED_RATIO", "0.5"))
+    
+    # LLM backend: "openai", or "fake" for offline benchmarking and load tests.
+    # The fake answers every node with deterministic JSON built from the prompt,
+    # after a log-normal latency (median and sigma), and can inject 5xx errors,
+    # 429s and an RPM limit of its own (0 = none), invalid responses (a dropped
+    # field or truncated JSON) to exercise the repair path, and stragglers (10x
+    # the drawn latency) to exercise hedging
+    llm_provider: str = os.getenv("LLM_PROVIDER", "openai").lower()
+    fake_llm_latency_ms: float = float(os.getenv("FAKE_LLM_LATENCY_MS", "800"))
+    fake_llm_latency_sigma: float = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5"))
+    fake_llm_error_rate: float = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    fake_llm_rate_limit_rate: float = float(os.getenv("FAKE_LLM_RATE_LIMIT_RATE", "0"))
+    fake_llm_rpm_limit: float = float(os.getenv("FAKE_LLM_RPM_LIMIT", "0"))
+    fake_llm_invalid_rate: float = float(os.getenv("FAKE_LLM_INVALID_RATE", "0"))
+    fake_llm_slow_rate: float = float(os.getenv("FAKE_LLM_SLOW_RATE", "0"))
+    fake_llm_seed: int = int(os.getenv("FAKE_LLM_SEED", "0"))
+    
+    # Deadlines: a pipeline run (an API request or a CLI transcript) gets
+    # PIPELINE_DEADLINE_SECONDS, and each LLM-backed node at most
+    # NODE_DEADLINE_SECONDS (0 = no limit). A node that runs out of time is marked
+    # degraded and the minutes are drafted from the fields that completed
+    pipeline_deadline_seconds: float = float(os.getenv("PIPELINE_DEADLINE_SECONDS", "300"))
+    node_deadline_seconds: float = float(os.getenv("NODE_DEADLINE_SECONDS", "0"))
+    
+    # Batch CLI (--batch): transcripts processed at once through the shared graph.
+    # Their LLM calls still go through the rate-limit scheduler above
+    batch_concurrency: int = int(os.getenv("BATCH_CONCURRENCY", "4"))
+    
+    # Job queue of /api/meeting-data/generate: JOB_WORKERS pipelines run at once per
+    # API process; the queue is kept in "sqlite" (JOB_QUEUE_PATH, defaults to
+    # outputs/jobs.sqlite3) so jobs interrupted by a restart are run again, up to
+    # JOB_MAX_ATTEMPTS times. Finished jobs are kept for JOB_TTL_SECONDS
+    job_queue_backend: str = os.getenv("JOB_QUEUE_BACKEND", "sqlite").lower()
+    job_queue_path: str = os.getenv("JOB_QUEUE_PATH", "")
+    job_workers: int = int(os.getenv("JOB_WORKERS", "2"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_ttl_seconds: int = int(os.getenv("JOB_TTL_SECONDS", "86400"))
+    job_poll_seconds: float = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+    
+    # Index from transcript keys to the meeting generated from them, one JSON
+    # object in the processed bucket. Each API process re-reads it every
+    # MEETING_INDEX_REFRESH_SECONDS to see the writes of the others
+    meeting_index_key: str = os.getenv("MEETING_INDEX_KEY", "index/meeting_sources.json")
+    meeting_index_refresh_seconds: float = float(os.getenv("MEETING_INDEX_REFRESH_SECONDS", "30"))
+    
+    # Single-flight generation: concurrent requests for one transcript share a run
+    # within a process, and across workers a lease per transcript ("sqlite" for the
+    # workers of one host, "dynamodb" across containers, or "none") makes the others
+    # wait up to LEASE_WAIT_SECONDS. Leases last LEASE_TTL_SECONDS and are renewed
+    # while the run goes on
+    lease_backend: str = os.getenv("LEASE_BACKEND", "sqlite").lower()
+    lease_path: str = os.getenv("LEASE_PATH", "")
+    lease_ttl_seconds: float = float(os.getenv("LEASE_TTL_SECONDS", "120"))
+    lease_wait_seconds: float = float(os.getenv("LEASE_WAIT_SECONDS", "600"))
+    lease_poll_seconds: float = float(os.getenv("LEASE_POLL_SECONDS", "1.0"))
+    
+    # List endpoints are paginated with cursors. Transcripts by name come a page at
+    # a time from S3; other sorts page through a full listing of the bucket that is
+    # reused for LIST_CACHE_SECONDS. Meetings are listed from the meeting index
+    list_page_size: int = int(os.getenv("LIST_PAGE_SIZE", "50"))
+    list_max_page_size: int = int(os.getenv("LIST_MAX_PAGE_SIZE", "200"))
+    list_cache_seconds: float = float(os.getenv("LIST_CACHE_SECONDS", "30"))
     
     # Legacy setting for backward compatibility
     @property
@@ -12,17 +12,65 @@ It provides:
 
 2. MeetingState class - The core state object that tracks all information about
    a meeting as it flows through the processing pipeline, including:
-   - The original transcript
+   - The original transcript, its optional compacted form with the speaker alias
+     table, and the chunks it is split into
+   - Speaker statistics from the transcript parser
    - Extracted agenda items
    - Identified decisions
    - Assigned tasks
    - Generated meeting minutes
+   - Per-node timing, token and cost metrics for the run
+   - The run ID used for checkpoints, and the nodes restored from them
+   - The fields left incomplete by nodes that ran out of time
+
+3. CombinedExtraction class - The shape returned by the single-call extraction
+   mode, where every field is optional so invalid fields can be retried alone
+
+4. Node output classes (TitleOutput, AgendaOutput, ... TasksOutput) - The JSON each
+   extraction node asks the LLM for. Their JSON schemas constrain the responses,
+   and every response is validated against them before it is used
+
+5. Reducers - merge functions attached to the list fields of MeetingState so
+   that LangGraph can combine updates written by nodes running in parallel
 
 These Pydantic models ensure data validation and consistent structure.
 """
 
-from typing import List, Literal, Optional, Union, Any, Dict
-from pydantic import BaseModel, Field
+import operator
+from typing import Annotated, List, Literal, Optional, Union, Any, Dict
+from pydantic import BaseModel, Field, field_validator
+
+
+def _normalize_text(value: Any) -> str:
+    """Normalize a string for duplicate detection (case and whitespace insensitive)."""
+    return " ".join(str(value).split()).casefold()
+
+def merge_unique(left: List[str], right: List[str]) -> List[str]:
+    """Reducer that appends new items while preserving order and dropping duplicates."""
+    merged = list(left or [])
+    seen = {_normalize_text(item) for item in merged}
+    for item in right or []:
+        key = _normalize_text(item)
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged
+
+def _task_key(task: Any) -> tuple:
+    owner = task.get("owner", "") if isinstance(task, dict) else getattr(task, "owner", "")
+    text = task.get("task", "") if isinstance(task, dict) else getattr(task, "task", "")
+    return (_normalize_text(owner), _normalize_text(text))
+
+def merge_tasks(left: List[Any], right: List[Any]) -> List[Any]:
+    """Reducer for tasks: duplicates are detected on the (owner, task) pair."""
+    merged = list(left or [])
+    seen = {_task_key(task) for task in merged}
+    for task in right or []:
+        key = _task_key(task)
+        if key[1] and key not in seen:
+            seen.add(key)
+            merged.append(task)
+    return merged
 
 class Task(BaseModel):
     """Task or action item extracted from a meeting transcript."""
@@ -61,16 +109,27 @@ class MeetingState(BaseModel):
     # Source can be any string or dictionary to allow flexibility
     source: Union[str, Dict[str, Any]] = Field(default="local_text", description="Source of the meeting transcript")
     transcript: Optional[str] = Field(default=None, description="Raw meeting transcript")
+    compact_transcript: Optional[str] = Field(default=None, description="Transcript without filler, pleasantries and full speaker names")
+    speaker_aliases: Dict[str, str] = Field(default_factory=dict, description="Alias -> speaker name table used by the compact transcript")
+    compression_ratio: Optional[float] = Field(default=None, description="Compact transcript size as a fraction of the original")
+    chunks: List[str] = Field(default_factory=list, description="Token-budgeted transcript chunks, split on speaker turns")
+    transcript_stats: Dict[str, Any] = Field(default_factory=dict, description="Speakers, turn and word counts and parse confidence from the transcript parser")
     title: Optional[str] = Field(default=None, description="Concise meeting title extracted from transcript")
-    agenda: List[str] = Field(default_factory=list, description="Extracted agenda items")
-    decisions: List[str] = Field(default_factory=list, description="Extracted decisions")
-    tasks: List[Union[Task, Dict[str, Any]]] = Field(default_factory=list, description="Extracted action items")
+    # List fields carry reducers so parallel branches can update them in the same step
+    agenda: Annotated[List[str], merge_unique] = Field(default_factory=list, description="Extracted agenda items")
+    decisions: Annotated[List[str], merge_unique] = Field(default_factory=list, description="Extracted decisions")
+    tasks: Annotated[List[Union[Task, Dict[str, Any]]], merge_tasks] = Field(default_factory=list, description="Extracted action items")
     minutes_md: Optional[str] = Field(default=None, description="Generated meeting minutes in Markdown")
     outputs_uri: Optional[str] = Field(default=None, description="URI where outputs are stored")
-    participants: List[str] = Field(default_factory=list, description="Meeting participants")
+    participants: Annotated[List[str], merge_unique] = Field(default_factory=list, description="Meeting participants")
     date: Optional[str] = Field(default=None, description="Meeting date")
     meeting_id: Optional[str] = Field(default=None, description="Unique ID for the meeting")
     executive_summary: Optional[str] = Field(default=None, description="AI-generated executive summary of the meeting")
+    node_metrics: Annotated[List[Dict[str, Any]], operator.add] = Field(default_factory=list, description="Per-node timing, token and cost records for this run")
+    run_id: Optional[str] = Field(default=None, description="Checkpoint key of this run (set by the graph registry)")
+    resumed_nodes: Annotated[List[str], operator.add] = Field(default_factory=list, description="Nodes whose output was restored from a checkpoint")
+    reprocessing: Optional[Dict[str, Any]] = Field(default=None, description="How much of the previous run over this source was reused")
+    degraded_fields: Annotated[List[str], merge_unique] = Field(default_factory=list, description="Fields whose node ran out of time, so their value is missing or partial")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Allow dictionary-like access to attributes."""
@@ -108,3 +167,45 @@ class MeetingState(BaseModel):
             "meeting_id": self.meeting_id,
             "outputs_uri": self.outputs_uri
         }
+
+class ExtractedTask(BaseModel):
+    """An action item as returned by the LLM, before it becomes a Task."""
+    owner: str = Field(default="TBD", description="Person the task was assigned to, or TBD")
+    task: str = Field(..., min_length=1, description="The task description")
+    due: str = Field(default="", description="Due date in YYYY-MM-DD format, or empty")
+    priority: Literal["High", "Med", "Low"] = Field(default="Med")
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def _normalize_priority(cls, value: Any) -> str:
+        """Accept "medium", "high ", None, ... instead of asking the model again."""
+        normalized = str(value or "").strip().lower()
+        return {"high": "High", "low": "Low"}.get(normalized, "Med")
+
+class TitleOutput(BaseModel):
+    title: str = Field(..., min_length=3, description="Concise meeting title (3-6 words)")
+
+class ExecutiveSummaryOutput(BaseModel):
+    executive_summary: str = Field(..., min_length=3, description="Executive summary (3-6 sentences)")
+
+class AgendaOutput(BaseModel):
+    agenda: List[str] = Field(..., description="Agenda items (max 8)")
+
+class DecisionsOutput(BaseModel):
+    decisions: List[str] = Field(..., description="Explicit decisions")
+
+class ParticipantsOutput(BaseModel):
+    participants: List[str] = Field(..., description="Meeting participants")
+
+class TasksOutput(BaseModel):
+    tasks: List[ExtractedTask] = Field(..., description="Action items")
+
+class CombinedExtraction(BaseModel):
+    """All extraction fields returned by a single LLM request.
+    Every field is optional so a missing or invalid field can be re-extracted on its own."""
+    title: Optional[str] = Field(default=None, description="Concise meeting title")
+    executive_summary: Optional[str] = Field(default=None, description="Executive summary of the meeting")
+    agenda: Optional[List[str]] = Field(default=None, description="Agenda items")
+    decisions: Optional[List[str]] = Field(default=None, description="Explicit decisions")
+    participants: Optional[List[str]] = Field(default=None, description="Meeting participants")
+    tasks: Optional[List[ExtractedTask]] = Field(default=None, description="Action items")
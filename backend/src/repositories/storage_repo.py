@@ -20,7 +20,8 @@ providing a consistent interface regardless of where data is stored.
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Union
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Union
 
 from backend.src.utils.paths import MINUTES_MD, ACTIONS_JSON, get_output_dir
 from backend.src.config.settings import settings, logger
@@ -67,24 +68,26 @@ class StorageRepository:
             except Exception as e:
                 logger.error(f"Failed to initialize DynamoDB service: {str(e)}")
     
-    def save_minutes_local(self, text: str) -> str:
-        """Save meeting minutes to local file."""
+    def save_minutes_local(self, text: str, path: Optional[Path] = None) -> str:
+        """Save meeting minutes to local file (outputs/minutes.md unless a path is given)."""
+        path = path or MINUTES_MD
         try:
-            MINUTES_MD.parent.mkdir(parents=True, exist_ok=True)
-            MINUTES_MD.write_text(text, encoding="utf-8")
-            logger.info(f"Saved minutes: {MINUTES_MD}")
-            return str(MINUTES_MD)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+            logger.info(f"Saved minutes: {path}")
+            return str(path)
         except Exception as e:
             logger.error(f"Failed to save minutes locally: {str(e)}")
             return ""
 
-    def save_actions_local(self, tasks: List[Dict]) -> str:
-        """Save action items to local file."""
+    def save_actions_local(self, tasks: List[Dict], path: Optional[Path] = None) -> str:
+        """Save action items to local file (outputs/actions.json unless a path is given)."""
+        path = path or ACTIONS_JSON
         try:
-            ACTIONS_JSON.parent.mkdir(parents=True, exist_ok=True)
-            ACTIONS_JSON.write_text(json.dumps({"tasks": tasks}, indent=2), encoding="utf-8")
-            logger.info(f"Saved actions: {ACTIONS_JSON}")
-            return str(ACTIONS_JSON)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({"tasks": tasks}, indent=2), encoding="utf-8")
+            logger.info(f"Saved actions: {path}")
+            return str(path)
         except Exception as e:
             logger.error(f"Failed to save actions locally: {str(e)}")
             return ""
@@ -134,18 +137,42 @@ class StorageRepository:
             logger.error(f"Failed to get transcript from S3: {str(e)}")
             return ""
     
-    def list_s3_transcripts(self) -> List[str]:
-        """List all transcripts in S3."""
+    def list_s3_transcripts(self, prefix: Optional[str] = None) -> List[str]:
+        """List all transcripts in S3, optionally under a key prefix."""
         if not self.s3_service:
             logger.warning("S3 service not available. Cannot list S3 transcripts.")
             return []
         
         try:
-            return self.s3_service.list_transcripts()
+            return self.s3_service.list_transcripts(prefix)
         except Exception as e:
             logger.error(f"Failed to list S3 transcripts: {str(e)}")
             return []
     
+    def list_s3_transcript_objects(self, prefix: Optional[str] = None) -> List[Dict]:
+        """List the transcripts in S3 with their listing metadata (Key, Size, LastModified)."""
+        if not self.s3_service:
+            logger.warning("S3 service not available. Cannot list S3 transcripts.")
+            return []
+        
+        try:
+            return self.s3_service.list_transcript_objects(prefix)
+        except Exception as e:
+            logger.error(f"Failed to list S3 transcripts: {str(e)}")
+            return []
+    
+    def list_s3_transcript_page(self, limit: int, start_after: Optional[str] = None) -> Tuple[List[Dict], bool]:
+        """List one page of S3 transcripts in key order, after the key start_after; returns (objects, has_more)."""
+        if not self.s3_service:
+            logger.warning("S3 service not available. Cannot list S3 transcripts.")
+            return [], False
+        
+        try:
+            return self.s3_service.list_transcript_page(limit, start_after)
+        except Exception as e:
+            logger.error(f"Failed to list S3 transcripts: {str(e)}")
+            return [], False
+    
     def list_processed_files(self, prefix: str = None) -> List[str]:
         """List all files in the processed bucket with an optional prefix."""
         if not self.s3_service:
@@ -188,6 +215,24 @@ class StorageRepository:
             logger.error(f"Failed to save file to S3: {str(e)}")
             return False
     
+    def get_file_with_etag(self, key: str) -> Optional[Tuple[str, str]]:
+        """Content and ETag of a file in the processed bucket, or None if it does not exist.
+
+        Unlike get_file_from_s3(), S3 errors are raised instead of returned as a
+        missing file, for callers that must not overwrite a file they failed to read.
+        """
+        if not self.s3_service:
+            logger.warning("S3 service not available. Cannot get file from S3.")
+            return None
+        return self.s3_service.get_processed_file_with_etag(key)
+
+    def save_file_if_match(self, key: str, content: Union[str, bytes], etag: Optional[str] = None) -> bool:
+        """Save a file to the processed bucket only if its ETag is still `etag` (None: only
+        if it does not exist). False if another writer got there first; S3 errors are raised."""
+        if not self.s3_service:
+            raise RuntimeError("S3 service not available. Cannot save file to S3.")
+        return self.s3_service.save_processed_file_if_match(key, content, etag)
+
     def get_s3_object_metadata(self, key: str) -> Optional[Dict]:
         """Get S3 object metadata."""
         if not self.s3_service:
@@ -0,0 +1,162 @@
+"""
+Benchmark and fuzz the JSON extraction used on LLM responses
+
+Builds a corpus of response shapes seen from chat models (clean JSON, markdown
+fences, prose around or between blocks, braces and escaped quotes in strings,
+trailing commas, truncation), plus seeded random mutations of them, and
+compares the balanced-brace scanner behind robust_json_parse() with the old
+greedy-regex fallback:
+
+- recovery: share of responses each path turns into the expected object
+- speed: best-of-15 time per call for each shape (the two paths alternate), and the range of speedups on
+  the shapes the regex path already handled (flagged when the scanner is slower)
+- fuzz: the scanner never raises, only returns dicts, and recovers every object
+  the regex path recovered
+
+Usage: python -m backend.src.scripts.benchmark_json_extraction [--fuzz 5000] [--seed 0]
+       [--write-corpus corpus.jsonl]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import timeit
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from backend.src.utils.json_utils import extract_json_object, extract_json_objects, robust_json_parse
+
+PAYLOAD = {
+    "title": "Pricing Page Relaunch",
+    "agenda": ["Review Q3 pricing {draft}", "Plan the \"launch\" email", "Assign owners"],
+    "decisions": ["Ship the new tiers on 2024-10-01"],
+    "tasks": [{"owner": "Priya", "task": "Update the website copy", "due": "", "priority": "High"}],
+}
+LONG_PAYLOAD = {**PAYLOAD, "executive_summary": " ".join(["The team reviewed the launch plan."] * 200)}
+
+def _regex_parse(text: str):
+    """The previous fallback: strict JSON, else the greedy first-{ to last-} match."""
+    try:
+        return json.loads(text)
+    except Exception:
+        pass
+    m = re.search(r"\{.*\}", text, flags=re.S)
+    if m:
+        try:
+            return json.loads(m.group(0))
+        except Exception:
+            return {}
+    return {}
+
+def _cases():
+    """(name, text, expected object) for each response shape."""
+    clean = json.dumps(PAYLOAD)
+    pretty = json.dumps(PAYLOAD, indent=2)
+    trailing = pretty.replace('"High"\n', '"High",\n').replace("]\n}", "],\n}")
+    return [
+        ("clean", clean, PAYLOAD),
+        ("clean_long", json.dumps(LONG_PAYLOAD), LONG_PAYLOAD),
+        ("fenced", f"```json\n{pretty}\n```", PAYLOAD),
+        ("fenced_long", f"```json\n{json.dumps(LONG_PAYLOAD, indent=2)}\n```", LONG_PAYLOAD),
+        ("prose_around", f"Here is the extraction you asked for:\n{pretty}\nLet me know if you need more.", PAYLOAD),
+        ("two_blocks", f"{clean}\nNote: I also considered {{\"title\": \"Alt\"}} but preferred the first.", PAYLOAD),
+        ("braces_in_prose", f"Fields use the {{field}} syntax. Result:\n{clean}\nDone }}", PAYLOAD),
+        ("trailing_commas", trailing, PAYLOAD),
+        ("raw_newline_in_string", clean.replace("Assign owners", "Assign\nowners"),
+         {**PAYLOAD, "agenda": [*PAYLOAD["agenda"][:2], "Assign\nowners"]}),
+        ("truncated", pretty[: len(pretty) // 2], None),
+        ("truncated_long", json.dumps(LONG_PAYLOAD, indent=2)[:-40], None),
+    ]
+
+MUTATION_CHARS = '{}[]",:\\ \n`abc'
+
+def _mutate(rng: random.Random, text: str) -> str:
+    """Insert, delete or replace a few characters, or cut the text off."""
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        op = rng.random()
+        i = rng.randrange(len(chars) + 1)
+        if op < 0.35:
+            chars.insert(i, rng.choice(MUTATION_CHARS))
+        elif op < 0.7 and i < len(chars):
+            del chars[i]
+        elif op < 0.9 and i < len(chars):
+            chars[i] = rng.choice(MUTATION_CHARS)
+        else:
+            chars = chars[:i]
+    return "".join(chars)
+
+def _fuzz(cases, count: int, seed: int):
+    rng = random.Random(seed)
+    corpus = [_mutate(rng, rng.choice(cases)[1]) for _ in range(count)]
+    regressions, recovered_new, recovered_old = [], 0, 0
+    for text in corpus:
+        new = robust_json_parse(text)
+        assert isinstance(new, (dict, list, str, int, float, bool, type(None))), type(new)
+        for obj in extract_json_objects(text):
+            assert isinstance(obj, dict)
+        old = _regex_parse(text)
+        recovered_new += bool(new) and isinstance(new, dict)
+        recovered_old += bool(old) and isinstance(old, dict)
+        if isinstance(old, dict) and old and new != old:
+            regressions.append(text)
+    return corpus, recovered_new, recovered_old, regressions
+
+def _best_us(funcs, text: str, repeat: int = 15):
+    """Best time per call (us) of each function; runs alternate so load spikes hit both."""
+    number = max(1, 20000 // max(1, len(text) // 100 + 1))
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            best[i] = min(best[i], timeit.timeit(lambda: func(text), number=number))
+    return [b / number * 1e6 for b in best]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and fuzz the JSON extraction of LLM responses")
+    parser.add_argument("--fuzz", type=int, default=5000, help="Number of mutated responses")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the mutations")
+    parser.add_argument("--write-corpus", default=None, help="Write the fuzz corpus to this JSONL file")
+    args = parser.parse_args()
+
+    cases = _cases()
+    print("=" * 78)
+    print(f"{'Shape':<24}{'regex ok':>10}{'scanner ok':>12}{'regex (us)':>12}{'scanner (us)':>14}{'speedup':>9}")
+    print("-" * 78)
+    # Speedup on the shapes the regex path already handled
+    handled = {}
+    for name, text, expected in cases:
+        old_ok = _regex_parse(text) == (expected or {})
+        new_ok = robust_json_parse(text) == (expected or {})
+        old_us, new_us = _best_us((_regex_parse, robust_json_parse), text)
+        if old_ok:
+            handled[name] = old_us / new_us
+        print(f"{name:<24}{'yes' if old_ok else 'NO':>10}{'yes' if new_ok else 'NO':>12}"
+              f"{old_us:>12.1f}{new_us:>14.1f}{old_us / new_us:>8.2f}x")
+    two = extract_json_objects(cases[5][1])
+    print("-" * 78)
+    slowest = min(handled, key=handled.get)
+    # clean and clean_long run the same json.loads on both paths, so their spread is the timing noise
+    print(f"Shapes the regex path handled: scanner at {handled[slowest]:.2f}x-{max(handled.values()):.2f}x "
+          f"of its speed (slowest: {slowest})"
+          f"{' - SLOWER than the regex path' if handled[slowest] < 0.95 else ''}")
+    print(f"extract_json_objects(two_blocks) -> {len(two)} object(s); "
+          f"first title {extract_json_object(cases[5][1])['title']!r}")
+
+    corpus, new_ok, old_ok, regressions = _fuzz(cases, args.fuzz, args.seed)
+    print(f"Fuzz ({args.fuzz} mutated responses, seed {args.seed}): scanner recovered {new_ok}, "
+          f"regex recovered {old_ok}, {len(regressions)} regression(s), no exceptions")
+    for text in regressions[:3]:
+        print(f"Regression: {text[:120]!r}")
+    if args.write_corpus:
+        with open(args.write_corpus, "w", encoding="utf-8") as f:
+            for text in corpus:
+                f.write(json.dumps({"text": text}) + "\n")
+        print(f"Corpus written to {args.write_corpus}")
+    print("=" * 78)
+
+if __name__ == "__main__":
+    main()
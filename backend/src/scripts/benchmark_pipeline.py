@@ -0,0 +1,145 @@
+"""
+Load-test the pipeline offline with the fake LLM provider
+
+Runs the graph many times concurrently (cache bypassed) against FakeLLMProvider
+and reports throughput, run latency percentiles, retries, 429s, the rate-limit
+scheduler's queue wait, the share of prompt tokens served from the provider's
+prompt cache, the response parse-failure and repair rates and the hedged
+requests. The fake's latency distribution, stragglers and failure injection, the
+scheduler limits and hedging are set from the command line.
+
+Usage: python -m backend.src.scripts.benchmark_pipeline [--runs 50] [--concurrency 10] [--mode parallel]
+       [--latency-ms 800] [--sigma 0.5] [--error-rate 0.02] [--rate-limit-rate 0.02] [--fake-rpm 600]
+       [--invalid-rate 0.05] [--slow-rate 0.02 --hedge]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
+
+def _configure(args) -> None:
+    """Settings are read at import time, so the environment is set before importing the pipeline."""
+    os.environ["LLM_PROVIDER"] = "fake"
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_LLM_LATENCY_SIGMA"] = str(args.sigma)
+    os.environ["FAKE_LLM_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_LLM_RATE_LIMIT_RATE"] = str(args.rate_limit_rate)
+    os.environ["FAKE_LLM_RPM_LIMIT"] = str(args.fake_rpm)
+    os.environ["FAKE_LLM_SEED"] = str(args.seed)
+    os.environ["FAKE_LLM_INVALID_RATE"] = str(args.invalid_rate)
+    os.environ["FAKE_LLM_SLOW_RATE"] = str(args.slow_rate)
+    os.environ["LLM_HEDGING"] = "true" if args.hedge else "false"
+    if args.hedge_budget is not None:
+        os.environ["LLM_HEDGE_BUDGET"] = str(args.hedge_budget)
+    # Hedge thresholds follow the fake's latency scale rather than real API latencies
+    os.environ.setdefault("LLM_HEDGE_MIN_DELAY_SECONDS", "0")
+    if args.rpm is not None:
+        os.environ["LLM_RPM_LIMIT"] = str(args.rpm)
+    if args.max_concurrency is not None:
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    os.environ.setdefault("LLM_BACKOFF_BASE_SECONDS", "0.1")
+
+async def _benchmark(transcript: str, args):
+    from backend.src.agents.graph import graph_registry
+    from backend.src.models.schemas import MeetingState
+    from backend.src.services.llm_cache import bypass_cache
+    from backend.src.services.metrics_service import summarize_run
+
+    graph_registry.get(args.mode, args.compact)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                with bypass_cache():
+                    state = await graph_registry.ainvoke(MeetingState(transcript=transcript, source=f"bench-{i}"),
+                                                         args.mode, args.compact)
+            except Exception as e:
+                return None, time.perf_counter() - started, e
+            wall = time.perf_counter() - started
+            return summarize_run(state.get("node_metrics", []), wall), wall, None
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(args.runs)))
+    return results, time.perf_counter() - started
+
+def main():
+    from backend.src.utils.paths import SAMPLES_DIR
+
+    parser = argparse.ArgumentParser(description="Load-test the pipeline with the fake LLM provider")
+    parser.add_argument("--file", default=str(SAMPLES_DIR / "inputs" / "meeting_transcript.txt"), help="Transcript to process")
+    parser.add_argument("--runs", type=int, default=50, help="Pipeline runs in total")
+    parser.add_argument("--concurrency", type=int, default=10, help="Pipeline runs in flight at once")
+    parser.add_argument("--mode", choices=["parallel", "serial", "combined"], default="parallel", help="Pipeline topology")
+    parser.add_argument("--compact", action="store_true", help="Compact the transcript first")
+    parser.add_argument("--latency-ms", type=float, default=800, help="Median fake LLM latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Log-normal sigma of the fake latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fake calls failing with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of fake calls failing with a 429")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="Share of fake responses that fail validation")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of fake calls that straggle (10x latency)")
+    parser.add_argument("--hedge", action="store_true", help="Hedge calls slower than the node's latency percentile")
+    parser.add_argument("--hedge-budget", type=float, default=None, help="LLM_HEDGE_BUDGET override")
+    parser.add_argument("--fake-rpm", type=float, default=0, help="Requests per minute the fake accepts (0 = unlimited)")
+    parser.add_argument("--rpm", type=float, default=None, help="Scheduler LLM_RPM_LIMIT override")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Scheduler LLM_MAX_CONCURRENCY override")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake latency and failure draws")
+    args = parser.parse_args()
+
+    _configure(args)
+    with open(args.file, "r", encoding="utf-8") as f:
+        transcript = f.read()
+
+    results, elapsed = asyncio.run(_benchmark(transcript, args))
+
+    from backend.src.services.openai_service import llm_scheduler
+
+    runs = [summary for summary, _, error in results if error is None]
+    walls = [wall for summary, wall, error in results if error is None]
+    failures = [error for _, _, error in results if error is not None]
+    scheduler = llm_scheduler.stats()
+
+    print("=" * 60)
+    print(f"FAKE LLM LOAD TEST ({args.mode}{', compact' if args.compact else ''})")
+    print("=" * 60)
+    print(f"Runs:                {len(runs)} ok, {len(failures)} failed (concurrency {args.concurrency})")
+    print(f"Fake latency:        median {args.latency_ms:.0f} ms, sigma {args.sigma}, "
+          f"errors {args.error_rate:.1%}, 429s {args.rate_limit_rate:.1%}, rpm {args.fake_rpm or 'unlimited'}")
+    print(f"Elapsed:             {elapsed:.2f}s")
+    print(f"Throughput:          {len(runs) / elapsed:.2f} runs/s, "
+          f"{sum(r['llm_calls'] for r in runs) / elapsed:.1f} LLM calls/s")
+    print(f"Run latency:         p50 {_percentile(walls, 50):.2f}s, p95 {_percentile(walls, 95):.2f}s, "
+          f"p99 {_percentile(walls, 99):.2f}s, max {max(walls, default=0.0):.2f}s")
+    print(f"LLM calls:           {sum(r['llm_calls'] for r in runs)} ({sum(r['retries'] for r in runs)} retries)")
+    validated = sum(r["validated"] for r in runs)
+    repairs = sum(r["repairs"] for r in runs)
+    print(f"Validation:          {sum(r['parse_failures'] for r in runs)}/{validated} responses invalid, "
+          f"{repairs} repairs ({repairs - sum(r['repair_failures'] for r in runs)} valid), "
+          f"{sum(r['llm_calls'] for r in runs) / max(1, len(runs)):.1f} calls per run")
+    prompt_tokens = sum(r["prompt_tokens"] for r in runs)
+    cached_tokens = sum(r["cached_tokens"] for r in runs)
+    print(f"Prompt cache:        {cached_tokens}/{prompt_tokens} prompt tokens cached "
+          f"({cached_tokens / max(1, prompt_tokens):.1%})")
+    hedges = sum(r["hedges"] for r in runs)
+    print(f"Hedging:             {'on' if args.hedge else 'off'}, {hedges} hedged calls "
+          f"({sum(r['hedge_wins'] for r in runs)} won by the duplicate, "
+          f"{hedges / max(1, sum(r['llm_calls'] for r in runs)):.1%} of calls), stragglers {args.slow_rate:.1%}")
+    print(f"Scheduler:           {scheduler['rate_limited']} rate limited, {scheduler['failures']} failed, "
+          f"concurrency limit {scheduler['concurrency_limit']}")
+    print(f"Queue wait:          p50 {scheduler['queue_wait_p50_s']:.3f}s, p95 {scheduler['queue_wait_p95_s']:.3f}s, "
+          f"max {scheduler['queue_wait_max_s']:.3f}s")
+    for error in failures[:3]:
+        print(f"Failure:             {type(error).__name__}: {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Rebuild the source -> meeting index from the meeting data stored in S3
+
+Scans every meeting_data/*.json object of the processed bucket and rewrites the
+index object (MEETING_INDEX_KEY). The API rebuilds it on its own when it is
+missing; run this after writing meeting data outside the API or to restore an
+entry that could not be recorded (the API skips the index when it cannot read it).
+
+Usage: python -m backend.src.scripts.rebuild_meeting_index
+"""
+
+import os
+import sys
+
+# Add the project root to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+
+from backend.src.repositories.storage_repo import StorageRepository
+from backend.src.services.meeting_index import create_meeting_index
+
+def main():
+    meeting_index = create_meeting_index(StorageRepository())
+    count = meeting_index.rebuild()
+    print(f"Meeting index {meeting_index.key} rebuilt: {count} transcript(s) with meeting data")
+
+if __name__ == "__main__":
+    main()
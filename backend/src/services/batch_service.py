@@ -0,0 +1,187 @@
+"""
+BATCH PROCESSING SERVICE
+-----------------------
+This file runs many transcripts through the pipeline in one process, for
+backfills driven by the CLI's --batch option.
+It implements:
+
+1. collect_items() - expands a batch spec into transcripts: a directory (every
+   .txt/.md file in it), a glob pattern, or s3://<prefix> for the transcripts
+   under a key prefix of the raw bucket
+2. BatchManifest - an append-only JSONL record of the done, partial and failed
+   items, so an interrupted or partly failed batch resumes where it stopped; the
+   last line for an item wins and a line cut off by a crash is ignored. Partial
+   items (some node ran out of time) are processed again like failed ones
+3. run_batch() - processes the pending items with at most `concurrency` in flight,
+   a progress bar, and a throughput summary (meetings and tokens per minute)
+
+All items share one compiled graph and the rate-limit scheduler, so the
+concurrency limit sets how many meetings are in flight while the scheduler keeps
+their LLM calls within the account limits.
+"""
+
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+
+from backend.src.config.settings import logger
+from backend.src.utils.paths import BATCH_DIR
+
+S3_SCHEME = "s3://"
+TRANSCRIPT_SUFFIXES = (".txt", ".md")
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One transcript of a batch: a local path or a key in the raw bucket."""
+    source: str
+    s3: bool = False
+
+    @property
+    def slug(self) -> str:
+        """Directory name for the item's local outputs."""
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", self.source).strip("_") or "transcript"
+
+    @property
+    def key(self) -> str:
+        """Short stable ID of the item, so re-running it overwrites its earlier outputs."""
+        return hashlib.sha1(self.source.encode("utf-8")).hexdigest()[:12]
+
+def collect_items(spec: str, storage_repo=None) -> List[BatchItem]:
+    """Expand a directory, glob pattern or s3://<prefix> into batch items, in a stable order."""
+    if spec.startswith(S3_SCHEME):
+        if storage_repo is None:
+            raise ValueError("A storage repository is needed to list S3 transcripts")
+        keys = storage_repo.list_s3_transcripts(spec[len(S3_SCHEME):] or None)
+        return [BatchItem(key, s3=True) for key in sorted(keys)]
+    if os.path.isdir(spec):
+        paths = [str(p) for p in Path(spec).iterdir() if p.is_file() and p.suffix.lower() in TRANSCRIPT_SUFFIXES]
+    else:
+        paths = [p for p in glob.glob(spec, recursive=True) if os.path.isfile(p)]
+    return [BatchItem(path) for path in sorted(paths)]
+
+def default_manifest_path(spec: str) -> Path:
+    """Manifest of a batch spec, so re-running the same command resumes it."""
+    return BATCH_DIR / f"manifest-{hashlib.sha1(spec.encode('utf-8')).hexdigest()[:10]}.jsonl"
+
+class BatchManifest:
+    """Done, partial and failed items of a batch, appended to a JSONL file as they finish."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[entry["source"]] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def status(self, source: str) -> Optional[str]:
+        entry = self.entries.get(source)
+        return entry["status"] if entry else None
+
+    def record(self, source: str, status: str, **fields: Any) -> None:
+        entry = {"source": source, "status": status, "at": datetime.now().isoformat(timespec="seconds"), **fields}
+        with self._lock:
+            self.entries[source] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            statuses = [entry["status"] for entry in self.entries.values()]
+        return {"done": statuses.count("done"), "partial": statuses.count("partial"),
+                "failed": statuses.count("failed")}
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else 0.0
+
+async def run_batch(items: List[BatchItem], process: Callable[[BatchItem], Awaitable[Dict[str, Any]]],
+                    manifest: BatchManifest, concurrency: int, retry_failed: bool = True) -> Dict[str, Any]:
+    """Process the items not yet done in the manifest and summarize the throughput.
+
+    process(item) returns the item's meeting ID, run metrics (summarize_run) and the
+    fields left partial by the deadline as {"meetingId": ..., "run": ..., "partialFields": [...]};
+    an exception marks the item failed and partial fields mark it partial.
+    """
+    pending = [item for item in items
+               if manifest.status(item.source) != "done"
+               and (retry_failed or manifest.status(item.source) != "failed")]
+    skipped = len(items) - len(pending)
+    if skipped:
+        logger.info(f"Skipping {skipped} item(s) already in the manifest {manifest.path}")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    walls: List[float] = []
+    totals = {"done": 0, "partial": 0, "failed": 0, "llm_calls": 0, "tokens": 0, "cost_usd": 0.0}
+
+    async def one(item: BatchItem, progress: tqdm) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await process(item)
+            except Exception as e:
+                logger.error(f"Batch item {item.source} failed: {type(e).__name__}: {e}")
+                manifest.record(item.source, "failed", error=f"{type(e).__name__}: {e}",
+                                wall_s=round(time.perf_counter() - started, 3))
+                totals["failed"] += 1
+            else:
+                wall = time.perf_counter() - started
+                run = result.get("run", {})
+                tokens = run.get("prompt_tokens", 0) + run.get("completion_tokens", 0)
+                partial = result.get("partialFields") or []
+                status = "partial" if partial else "done"
+                manifest.record(item.source, status, meeting_id=result.get("meetingId"), wall_s=round(wall, 3),
+                                llm_calls=run.get("llm_calls", 0), tokens=tokens,
+                                cost_usd=round(run.get("cost_usd", 0.0), 6),
+                                **({"partial_fields": partial} if partial else {}))
+                walls.append(wall)
+                totals[status] += 1
+                totals["llm_calls"] += run.get("llm_calls", 0)
+                totals["tokens"] += tokens
+                totals["cost_usd"] += run.get("cost_usd", 0.0)
+            progress.update(1)
+            progress.set_postfix(done=totals["done"], partial=totals["partial"], failed=totals["failed"])
+
+    started = time.perf_counter()
+    # Log lines are written above the bar instead of breaking it
+    with logging_redirect_tqdm(loggers=[logger]), tqdm(total=len(pending), unit="meeting", desc="Batch") as progress:
+        await asyncio.gather(*(one(item, progress) for item in pending))
+    elapsed = time.perf_counter() - started
+    minutes = elapsed / 60 if elapsed else 0.0
+
+    return {
+        "items": len(items),
+        "processed": len(pending),
+        "skipped": skipped,
+        "done": totals["done"],
+        "partial": totals["partial"],
+        "failed": totals["failed"],
+        "elapsed_s": round(elapsed, 3),
+        "meetings_per_min": round((totals["done"] + totals["partial"]) / minutes, 2) if minutes else 0.0,
+        "tokens_per_min": round(totals["tokens"] / minutes, 1) if minutes else 0.0,
+        "llm_calls": totals["llm_calls"],
+        "tokens": totals["tokens"],
+        "cost_usd": round(totals["cost_usd"], 6),
+        "meeting_p50_s": round(_percentile(walls, 50), 3),
+        "meeting_p95_s": round(_percentile(walls, 95), 3),
+        "manifest": str(manifest.path),
+        "manifest_counts": manifest.counts(),
+    }
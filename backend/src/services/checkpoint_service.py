@@ -0,0 +1,331 @@
+"""
+PIPELINE CHECKPOINT SERVICE
+--------------------------
+This file makes pipeline runs resumable at node granularity.
+It implements:
+
+1. make_run_id() - a run ID derived from the source, the transcript and the graph
+   variant, so retrying the same request finds the checkpoints of the failed run
+2. SQLiteCheckpoints - an on-disk store for local runs (the default)
+3. S3Checkpoints - one JSON object per node under checkpoints/<run_id>/ in the
+   processed bucket
+4. DynamoDBCheckpoints - one item per (run_id, node), expired by DynamoDB TTL
+5. CheckpointStore - the wrapper used by the graph, with save/restore counters
+6. checkpoint_node() - wraps an LLM-backed graph node: when the run already has
+   a checkpoint for the node its stored update is returned without calling the
+   LLM, otherwise the node runs and its update is saved as soon as it finishes;
+   shielded_node() lets it finish when a sibling's failure cancels its step
+7. create_checkpoint_store() - builds the store from the CHECKPOINT_* settings;
+   the backend is only opened when the first run needs it
+
+Every node is checkpointed on its own, so a failure in assign_tasks keeps the
+results of the extraction nodes that ran next to it in the same parallel step.
+A run's checkpoints are deleted once it completes; those of failed runs expire
+after CHECKPOINT_TTL_SECONDS.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+from backend.src.config.settings import settings, logger
+from backend.src.utils.paths import OUTPUTS_DIR
+
+def make_run_id(source: Any, transcript: Optional[str], variant: str) -> str:
+    """Stable ID for a run of one graph variant over one transcript."""
+    payload = json.dumps([str(source), transcript or "", variant], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+class CheckpointBackend:
+    """Interface for checkpoint storage backends. Values are JSON strings."""
+
+    def get(self, run_id: str, node: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def put(self, run_id: str, node: str, value: str) -> None:
+        raise NotImplementedError
+
+    def delete_run(self, run_id: str) -> None:
+        raise NotImplementedError
+
+class SQLiteCheckpoints(CheckpointBackend):
+    """Checkpoints in a local SQLite file; rows past the TTL are ignored and purged."""
+
+    def __init__(self, path: Path, ttl_seconds: int = 604800):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "run_id TEXT NOT NULL, node TEXT NOT NULL, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (run_id, node))"
+            )
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM checkpoints WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+
+    def get(self, run_id: str, node: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM checkpoints WHERE run_id = ? AND node = ?", (run_id, node)
+            ).fetchone()
+        if row is None or (self.ttl_seconds and time.time() - row[1] > self.ttl_seconds):
+            return None
+        return row[0]
+
+    def put(self, run_id: str, node: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, node, value, created_at) VALUES (?, ?, ?, ?)",
+                (run_id, node, value, time.time()),
+            )
+            self._conn.commit()
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+
+class S3Checkpoints(CheckpointBackend):
+    """Checkpoints as JSON objects in the processed bucket (expire them with a lifecycle rule)."""
+
+    def __init__(self, bucket: str, prefix: str = "checkpoints/"):
+        self.s3_client = boto3.client(
+            's3',
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+            region_name=settings.aws_region
+        )
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, run_id: str, node: str) -> str:
+        return f"{self.prefix}{run_id}/{node}.json"
+
+    def get(self, run_id: str, node: str) -> Optional[str]:
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._key(run_id, node))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return response["Body"].read().decode("utf-8")
+
+    def put(self, run_id: str, node: str, value: str) -> None:
+        self.s3_client.put_object(Bucket=self.bucket, Key=self._key(run_id, node),
+                                  Body=value.encode("utf-8"), ContentType="application/json")
+
+    def delete_run(self, run_id: str) -> None:
+        response = self.s3_client.list_objects_v2(Bucket=self.bucket, Prefix=f"{self.prefix}{run_id}/")
+        objects = [{"Key": obj["Key"]} for obj in response.get("Contents", [])]
+        if objects:
+            self.s3_client.delete_objects(Bucket=self.bucket, Delete={"Objects": objects})
+
+class DynamoDBCheckpoints(CheckpointBackend):
+    """Checkpoints in a DynamoDB table keyed by (run_id, node), with an expires_at TTL attribute."""
+
+    def __init__(self, table_name: str, ttl_seconds: int = 604800):
+        dynamodb = boto3.resource(
+            'dynamodb',
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+            region_name=settings.aws_region
+        )
+        self.table = dynamodb.Table(table_name)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, run_id: str, node: str) -> Optional[str]:
+        item = self.table.get_item(Key={"run_id": run_id, "node": node}, ConsistentRead=True).get("Item")
+        # TTL deletion is lazy, so expired items can still be returned for a while
+        if item is None or (self.ttl_seconds and int(item.get("expires_at", 0)) < time.time()):
+            return None
+        return item["value"]
+
+    def put(self, run_id: str, node: str, value: str) -> None:
+        item = {"run_id": run_id, "node": node, "value": value}
+        if self.ttl_seconds:
+            item["expires_at"] = int(time.time() + self.ttl_seconds)
+        self.table.put_item(Item=item)
+
+    def delete_run(self, run_id: str) -> None:
+        response = self.table.query(
+            KeyConditionExpression=Key("run_id").eq(run_id),
+            ProjectionExpression="run_id, #n",
+            ExpressionAttributeNames={"#n": "node"},
+        )
+        with self.table.batch_writer() as batch:
+            for item in response.get("Items", []):
+                batch.delete_item(Key={"run_id": item["run_id"], "node": item["node"]})
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Cannot checkpoint {type(value).__name__}")
+
+class CheckpointStore:
+    """Saves and restores node updates; storage errors never fail the pipeline.
+
+    The backend is created on first use, so importing the pipeline opens no
+    database file or AWS client.
+    """
+
+    def __init__(self, backend_factory: Callable[[], Optional[CheckpointBackend]]):
+        self._backend_factory = backend_factory
+        self._backend: Optional[CheckpointBackend] = None
+        self._created = False
+        self.saved = 0
+        self.restored = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> Optional[CheckpointBackend]:
+        if not self._created:
+            with self._lock:
+                if not self._created:
+                    self._backend = self._backend_factory()
+                    self._created = True
+        return self._backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def load(self, run_id: str, node: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        try:
+            value = self.backend.get(run_id, node)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Checkpoint read failed for {run_id}/{node}: {e}")
+            return None
+        if value is None:
+            return None
+        self._count("restored")
+        return json.loads(value)
+
+    def save(self, run_id: str, node: str, update: Dict[str, Any]) -> None:
+        if self.backend is None:
+            return
+        try:
+            self.backend.put(run_id, node, json.dumps(update, default=_jsonable, ensure_ascii=False))
+            self._count("saved")
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Checkpoint write failed for {run_id}/{node}: {e}")
+
+    def clear(self, run_id: str) -> None:
+        """Drop the checkpoints of a run that completed."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.delete_run(run_id)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Could not delete checkpoints of run {run_id}: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "backend": type(self._backend).__name__ if self._backend else None,
+                "saved": self.saved,
+                "restored": self.restored,
+                "errors": self.errors,
+            }
+
+def _create_backend() -> Optional[CheckpointBackend]:
+    backend_name = settings.checkpoint_backend
+    backend: Optional[CheckpointBackend] = None
+    if backend_name == "sqlite":
+        path = Path(settings.checkpoint_path) if settings.checkpoint_path else OUTPUTS_DIR / "checkpoints.sqlite3"
+        backend = SQLiteCheckpoints(path, settings.checkpoint_ttl_seconds)
+    elif backend_name == "s3":
+        backend = S3Checkpoints(settings.s3_bucket_processed)
+    elif backend_name == "dynamodb":
+        backend = DynamoDBCheckpoints(settings.dynamodb_table_checkpoints, settings.checkpoint_ttl_seconds)
+    elif backend_name not in ("none", ""):
+        logger.warning(f"Unknown CHECKPOINT_BACKEND '{backend_name}', checkpointing disabled")
+    return backend
+
+def create_checkpoint_store() -> CheckpointStore:
+    """Create the checkpoint store configured by the CHECKPOINT_* settings."""
+    return CheckpointStore(_create_backend)
+
+checkpoint_store = create_checkpoint_store()
+
+def checkpoint_node(name: str, func: Callable) -> Callable:
+    """Wrap a graph node so a resumed run reuses its stored update instead of re-running it.
+
+    Restored updates are marked in the resumed_nodes field of the state.
+    """
+    def run_id_of(state) -> Optional[str]:
+        return getattr(state, "run_id", None) if checkpoint_store.enabled else None
+
+    def restored(run_id: str, update: Dict[str, Any]) -> Dict[str, Any]:
+        logger.info(f"Node {name} restored from checkpoint (run {run_id})")
+        return {**update, "resumed_nodes": [name]}
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, *args, **kwargs):
+            run_id = run_id_of(state)
+            if run_id is None:
+                return await func(state, *args, **kwargs)
+            # Remote backends block, so they run off the event loop
+            stored = await asyncio.to_thread(checkpoint_store.load, run_id, name)
+            if stored is not None:
+                return restored(run_id, stored)
+
+            update = await func(state, *args, **kwargs)
+            await asyncio.to_thread(checkpoint_store.save, run_id, name, update or {})
+            return update
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, *args, **kwargs):
+        run_id = run_id_of(state)
+        if run_id is None:
+            return func(state, *args, **kwargs)
+        stored = checkpoint_store.load(run_id, name)
+        if stored is not None:
+            return restored(run_id, stored)
+        update = func(state, *args, **kwargs)
+        checkpoint_store.save(run_id, name, update or {})
+        return update
+    return wrapper
+
+def shielded_node(func: Callable) -> Callable:
+    """Wrap an async checkpointed node so the cancellation of its step does not stop it.
+
+    When a sibling node fails, LangGraph cancels the rest of the step; the shield
+    lets this node finish and save its checkpoint for the retry. It goes outside
+    deadline_node, so the node's own deadline still cancels it.
+    """
+    @functools.wraps(func)
+    async def async_wrapper(state, *args, **kwargs):
+        if not (checkpoint_store.enabled and getattr(state, "run_id", None)):
+            return await func(state, *args, **kwargs)
+        task = asyncio.ensure_future(func(state, *args, **kwargs))
+        # Nobody awaits a task whose step was cancelled; this retrieves its error
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+    return async_wrapper
@@ -0,0 +1,109 @@
+"""
+PIPELINE DEADLINE SERVICE
+------------------------
+This file bounds how long a pipeline run may take, so a hung node or LLM call
+degrades the result instead of stalling the request.
+It implements:
+
+1. run_deadline() - sets the deadline of the current run (a context variable, so
+   graph nodes, their worker threads and their LLM calls all see it)
+2. remaining() / check() / check_wait() - used by the OpenAI service and the
+   rate-limit scheduler: every request's timeout is cut to the time left, and a
+   call that has no time left (or would have to wait past the deadline for a
+   rate-limit slot or a retry) raises DeadlineExceeded instead
+3. deadline_node() - wraps an LLM-backed graph node: the node runs under the
+   tighter of the run deadline and NODE_DEADLINE_SECONDS, and when it runs out
+   of time it returns {"degraded_fields": [...]} (the state fields it would have
+   filled) instead of failing the run
+
+draft_minutes then writes the minutes from the fields that did complete and the
+API reports the degraded ones as partialFields. Async nodes are also cancelled
+at the deadline (their LLM calls give back their rate-limit slots and token
+reservations); a sync node stops at its next LLM call or retry.
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.src.config.settings import settings, logger
+
+class DeadlineExceeded(TimeoutError):
+    """The run (or node) deadline passed before the work could finish."""
+
+# Absolute time.monotonic() by which the current run (or node) must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("pipeline_deadline", default=None)
+
+@contextmanager
+def run_deadline(seconds: Optional[float]):
+    """Give the current run `seconds` to finish (None or 0: no deadline)."""
+    token = _deadline.set(time.monotonic() + seconds if seconds and seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (possibly negative), or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def check() -> None:
+    """Raise DeadlineExceeded if the deadline has passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+
+def check_wait(seconds: float) -> None:
+    """Raise DeadlineExceeded if waiting `seconds` would run past the deadline."""
+    left = remaining()
+    if left is not None and seconds >= left:
+        raise DeadlineExceeded(f"Deadline exceeded (would wait {seconds:.2f}s with {max(left, 0.0):.2f}s left)")
+
+def _node_deadline() -> Optional[float]:
+    run = _deadline.get()
+    if settings.node_deadline_seconds <= 0:
+        return run
+    node = time.monotonic() + settings.node_deadline_seconds
+    return node if run is None else min(run, node)
+
+def deadline_node(name: str, fields: List[str], func: Callable) -> Callable:
+    """Wrap a graph node so it returns a degraded marker for `fields` when it runs out of time."""
+    def degraded(reason: str) -> Dict[str, Any]:
+        logger.warning(f"Node {name} ran out of time ({reason}); degraded fields: {', '.join(fields)}")
+        return {"degraded_fields": list(fields)}
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, *args, **kwargs):
+            deadline = _node_deadline()
+            token = _deadline.set(deadline)
+            try:
+                if deadline is None:
+                    return await func(state, *args, **kwargs)
+                return await asyncio.wait_for(func(state, *args, **kwargs), timeout=max(0.0, deadline - time.monotonic()))
+            except DeadlineExceeded as e:
+                return degraded(str(e))
+            except asyncio.TimeoutError:
+                # Only the deadline's own timeout degrades the node
+                if time.monotonic() < deadline:
+                    raise
+                return degraded("cancelled at the deadline")
+            finally:
+                _deadline.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, *args, **kwargs):
+        token = _deadline.set(_node_deadline())
+        try:
+            return func(state, *args, **kwargs)
+        except DeadlineExceeded as e:
+            return degraded(str(e))
+        finally:
+            _deadline.reset(token)
+    return wrapper
@@ -19,6 +19,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from backend.src.config.settings import settings, logger
 from backend.src.models.schemas import MeetingState, Task
+from backend.src.utils.transcript_parser import parse_transcript
 
 class DynamoDBService:
     """
@@ -44,10 +45,6 @@ class DynamoDBService:
         meeting_id = str(uuid.uuid4())
         today = datetime.now().isoformat()
         
-        # Extract participants from transcript (enhanced implementation)
-        participants = []
-        participant_keys = []
-        
         # Handle different types of state objects (direct attribute access or dict-like access)
         # This accommodates both Pydantic models and LangGraph's AddableValuesDict
         if hasattr(state, 'get'):
@@ -58,6 +55,7 @@ class DynamoDBService:
             source = state.get("source", "unknown")
             transcript = state.get("transcript", "")
             tasks = state.get("tasks", [])
+            participants = list(state.get("participants", []) or [])
         else:
             # Direct attribute access (for Pydantic model or similar)
             agenda = state.agenda if hasattr(state, 'agenda') else []
@@ -66,33 +64,20 @@ class DynamoDBService:
             source = state.source if hasattr(state, 'source') else "unknown"
             transcript = state.transcript if hasattr(state, 'transcript') else ""
             tasks = state.tasks if hasattr(state, 'tasks') else []
+            participants = list(getattr(state, 'participants', []) or [])
         
-        # Extract participants from transcript
-        if transcript:
-            # Try to find attendees list
-            if "Attendees:" in transcript:
-                attendee_line = ""
-                for line in transcript.split("\n"):
-                    if "Attendees:" in line:
-                        attendee_line = line
-                        break
-                
-                if attendee_line:
-                    participants = [
-                        name.strip() for name in 
-                        attendee_line.replace("Attendees:", "").split(",")
-                    ]
-            
-            # If no attendees list, extract participants from tasks
-            if not participants and tasks:
-                # Extract owners from tasks
-                for task in tasks:
-                    owner = task.get('owner', '') if isinstance(task, dict) else getattr(task, 'owner', '')
-                    if owner and owner not in participants:
-                        participants.append(owner)
-            
-            # Create participant keys for searching
-            participant_keys = [f"PARTICIPANT#{name.strip().lower()}" for name in participants]
+        # Participants: the pipeline's list, else the speaker turns (and any
+        # "Attendees:" line) parsed from the transcript, else the task owners
+        if not participants and transcript:
+            participants = parse_transcript(transcript).participants
+        if not participants and tasks:
+            for task in tasks:
+                owner = task.get('owner', '') if isinstance(task, dict) else getattr(task, 'owner', '')
+                if owner and owner not in participants:
+                    participants.append(owner)
+        
+        # Create participant keys for searching
+        participant_keys = [f"PARTICIPANT#{name.strip().lower()}" for name in participants]
         
         # Prepare tasks for storage
         task_dicts = []
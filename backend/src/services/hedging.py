@@ -0,0 +1,187 @@
+"""
+LLM REQUEST HEDGING
+------------------
+This file cuts the latency tail of LLM calls by sending a duplicate request
+when the first one is slower than usual for its node, and taking whichever
+answer comes back first.
+It implements:
+
+1. hedge_delay() - how long a node's call may run before it is hedged: the
+   LLM_HEDGE_PERCENTILE of the node's recent completion latencies (from the
+   metrics registry), never below LLM_HEDGE_MIN_DELAY_SECONDS; None until the node
+   has LLM_HEDGE_MIN_SAMPLES latencies
+2. HedgeBudget - caps hedges at LLM_HEDGE_BUDGET duplicates per call: every call
+   earns that fraction of a hedge (up to a small burst) and every hedge spends one
+3. hedged_call() / ahedged_call() - run the request, start the duplicate once the
+   delay has passed (if the budget and the scheduler allow it) and return the
+   first successful result; a failure of one request waits for the other
+
+The duplicate is only sent when the rate-limit scheduler has a free slot and
+budget right now (see LLMScheduler.try_admit), so hedging never queues behind
+regular traffic or pushes it past the account limits. With threads the losing
+request cannot be stopped and runs to completion in the background; coroutines
+cancel it, and its token reservation is charged the answer's usage, since the
+provider bills the request it already received.
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.src.config.settings import settings, logger
+from backend.src.services.metrics_service import metrics
+
+class HedgeBudget:
+    """Token bucket of hedges: each call deposits `ratio`, each hedge withdraws one."""
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = max(1.0, burst)
+        self.level = 1.0 if ratio > 0 else 0.0
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def on_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.level = min(self.burst, self.level + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.level >= 1.0:
+                self.level -= 1.0
+                self.hedged += 1
+                return True
+            self.denied += 1
+            return False
+
+    def refund(self) -> None:
+        """Give back a hedge the scheduler did not admit."""
+        with self._lock:
+            self.level = min(self.burst, self.level + 1.0)
+            self.hedged -= 1
+            self.denied += 1
+
+    def on_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": settings.llm_hedging,
+                "calls": self.calls,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "denied": self.denied,
+                "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            }
+
+hedge_budget = HedgeBudget(settings.llm_hedge_budget)
+
+def hedge_delay(node: Optional[str]) -> Optional[float]:
+    """Seconds after which a call of this node is hedged, or None to not hedge it."""
+    if not settings.llm_hedging or not node:
+        return None
+    threshold = metrics.latency_percentile("node", node, settings.llm_hedge_percentile,
+                                           min_samples=settings.llm_hedge_min_samples)
+    if threshold is None:
+        return None
+    return max(threshold, settings.llm_hedge_min_delay_seconds)
+
+class HedgeOutcome:
+    """Filled in by the hedged call: whether a duplicate was sent and whether it answered first."""
+
+    def __init__(self):
+        self.hedged = False
+        self.won = False
+
+# Hedged calls wait on futures, so both requests run in this pool
+_executor = ThreadPoolExecutor(max_workers=max(4, settings.llm_max_concurrency * 2), thread_name_prefix="llm-hedge")
+
+def hedged_call(primary: Callable[[], Any], duplicate: Callable[[], Any], delay: float,
+                admit: Callable[[], Optional[Callable[[bool, Any], None]]], outcome: HedgeOutcome) -> Any:
+    """Run primary(); if it has not returned after `delay` seconds, also run duplicate().
+
+    admit() returns the release callback of the duplicate's scheduler slot, or None
+    when it may not be sent; the callback gets (success, result) once it finishes.
+    """
+    first = _executor.submit(contextvars.copy_context().run, primary)
+    done, _ = wait([first], timeout=delay)
+    if done or not hedge_budget.try_spend():
+        return first.result()
+    release = admit()
+    if release is None:
+        hedge_budget.refund()
+        return first.result()
+    outcome.hedged = True
+    logger.info(f"LLM call slower than {delay:.2f}s, sending a hedged request")
+    second = _executor.submit(contextvars.copy_context().run, duplicate)
+    second.add_done_callback(lambda f: release(f.exception() is None, None if f.exception() else f.result()))
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is second:
+                    outcome.won = True
+                    hedge_budget.on_win()
+                return future.result()
+            # The primary's error is the one retried and reported
+            if error is None or future is first:
+                error = future.exception()
+    raise error
+
+async def ahedged_call(primary: Callable[[], Awaitable[Any]], duplicate: Callable[[], Awaitable[Any]], delay: float,
+                       admit: Callable[[], Optional[Callable[[bool, Any], None]]], outcome: HedgeOutcome) -> Any:
+    """Async version of hedged_call(); the request that loses is cancelled."""
+    first = asyncio.ensure_future(primary())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done or not hedge_budget.try_spend():
+            return await first
+        release = admit()
+        if release is None:
+            hedge_budget.refund()
+            return await first
+        outcome.hedged = True
+        logger.info(f"LLM call slower than {delay:.2f}s, sending a hedged request")
+        answer: List[Any] = []
+
+        def settle(f: asyncio.Future) -> None:
+            if not f.cancelled() and f.exception() is None:
+                release(True, f.result())
+            else:
+                # A duplicate cancelled after the answer arrived was still sent, and
+                # is billed like the answer, so it is charged the answer's tokens
+                release(False, answer[0] if f.cancelled() and answer else None)
+
+        second = asyncio.ensure_future(duplicate())
+        second.add_done_callback(settle)
+        tasks.append(second)
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        outcome.won = True
+                        hedge_budget.on_win()
+                    answer.append(task.result())
+                    return task.result()
+                if error is None or task is first:
+                    error = task.exception()
+        raise error
+    finally:
+        # The loser, or both requests if the caller itself was cancelled
+        for task in tasks:
+            if not task.done():
+                task.cancel()
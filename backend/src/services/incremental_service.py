@@ -0,0 +1,139 @@
+"""
+INCREMENTAL RE-PROCESSING SERVICE
+-------------------------------
+This file lets a corrected transcript be re-processed without redoing the LLM
+work for the parts that did not change.
+It implements:
+
+1. OutputMemo - the raw LLM outputs of the last run over a source, keyed by the
+   node, model and exact prompt, plus the hashes of the chunks they came from
+2. open_memo() / incremental_run() / save() - load the memo of a source, make it
+   available to a run (a context variable, so graph nodes and their worker
+   threads share it) and store the outputs the run used once it completes
+3. compare_chunks() - called by chunk_transcript: compares the new chunk hashes
+   with the stored ones and turns reuse off when more than
+   INCREMENTAL_MAX_CHANGED_RATIO of the chunks changed
+4. lookup() / remember() - used by the node flows around every LLM call
+
+Chunks are cut with content-defined boundaries (see chunking), so correcting a few
+lines only changes the chunks around the edit. The map calls of unchanged chunks
+have the same prompt as before and are answered from the memo; only changed
+chunks are re-extracted, and the reducers merge their results with the reused
+ones. Reduce steps whose input changed (the summary merge, the minutes) run again.
+
+Memos are stored in the checkpoint store under the run ID outputs-<source hash>,
+so they share its backend and TTL.
+"""
+
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from backend.src.config.settings import settings, logger
+from backend.src.services.checkpoint_service import checkpoint_store
+
+MEMO_NODE = "llm_outputs"
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha256(" ".join(chunk.split()).encode("utf-8")).hexdigest()[:16]
+
+def memo_key(node: Optional[str], model: str, system: str, user: str, temperature: float,
+             schema: Optional[str] = None) -> str:
+    payload = json.dumps([node, model, system, user, temperature, schema], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class OutputMemo:
+    """LLM outputs of the previous run over a source and the outputs of the current one."""
+
+    def __init__(self, run_id: str, previous: Optional[Dict[str, Any]] = None):
+        self.run_id = run_id
+        previous = previous or {}
+        self.previous_outputs: Dict[str, str] = previous.get("outputs", {})
+        self.previous_chunks: List[str] = previous.get("chunks", [])
+        self.outputs: Dict[str, str] = {}
+        self.chunks: List[str] = []
+        # Off until chunk_transcript has checked how much of the transcript changed
+        self.reuse = False
+        self.reused = 0
+        self.made = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str) -> Optional[str]:
+        if not self.reuse:
+            return None
+        output = self.previous_outputs.get(key)
+        if output is not None:
+            with self._lock:
+                self.outputs[key] = output
+                self.reused += 1
+        return output
+
+    def remember(self, key: str, output: str) -> None:
+        with self._lock:
+            self.outputs[key] = output
+            self.made += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"llmCallsReused": self.reused, "llmCallsMade": self.made}
+
+_memo: ContextVar[Optional[OutputMemo]] = ContextVar("incremental_memo", default=None)
+
+def _run_id(source: str) -> str:
+    return "outputs-" + hashlib.sha256(source.encode("utf-8")).hexdigest()[:24]
+
+def open_memo(source: Optional[str]) -> Optional[OutputMemo]:
+    """Load the memo of a source (None if incremental re-processing is off or the run has no source)."""
+    if not settings.incremental_reprocessing or not source or not checkpoint_store.enabled:
+        return None
+    run_id = _run_id(str(source))
+    return OutputMemo(run_id, checkpoint_store.load(run_id, MEMO_NODE))
+
+@contextmanager
+def incremental_run(memo: Optional[OutputMemo]):
+    """Make memo the memo of the current run."""
+    token = _memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _memo.reset(token)
+
+def save(memo: Optional[OutputMemo]) -> None:
+    """Store the outputs used by a completed run; they replace the previous memo."""
+    if memo is not None:
+        checkpoint_store.save(memo.run_id, MEMO_NODE, {"chunks": memo.chunks, "outputs": memo.outputs})
+
+def compare_chunks(chunks: List[str]) -> Optional[Dict[str, Any]]:
+    """Compare the chunks of this run with the previous run's and decide whether to reuse its outputs."""
+    memo = _memo.get()
+    if memo is None:
+        return None
+    memo.chunks = [chunk_hash(chunk) for chunk in chunks]
+    previous = set(memo.previous_chunks)
+    changed = sum(1 for h in memo.chunks if h not in previous)
+    changed_ratio = changed / len(memo.chunks) if memo.chunks else 1.0
+    memo.reuse = bool(memo.previous_outputs) and changed_ratio <= settings.incremental_max_changed_ratio
+    if memo.previous_outputs:
+        logger.info(f"{changed} of {len(chunks)} chunk(s) changed since the last run "
+                    f"({'reusing unchanged outputs' if memo.reuse else 'full re-run'})")
+    return {
+        "chunks": len(chunks),
+        "changedChunks": changed,
+        "changedRatio": round(changed_ratio, 3),
+        "fullRerun": not memo.reuse,
+    }
+
+def lookup(key: str) -> Optional[str]:
+    memo = _memo.get()
+    return memo.lookup(key) if memo is not None else None
+
+def remember(key: str, output: str) -> None:
+    memo = _memo.get()
+    if memo is not None:
+        memo.remember(key, output)
+
+def active() -> bool:
+    return _memo.get() is not None
@@ -0,0 +1,249 @@
+"""
+PIPELINE JOB QUEUE
+-----------------
+This file takes pipeline runs out of the HTTP request: the generate endpoint
+enqueues a job and answers at once with its ID, and a pool of workers in the
+API process drains the queue.
+It implements:
+
+1. JobBackend - the storage interface: enqueue, claim the oldest queued job,
+   finish, look up, and requeue the jobs a previous process left running
+2. SQLiteJobs - jobs in a local SQLite file (the default); JOB_QUEUE_PATH=:memory:
+   keeps them in memory only
+3. JobQueue - submit() / get() for the API and start() / stop() for the worker
+   pool: JOB_WORKERS asyncio tasks that claim jobs and run the handler, woken up
+   by submit() and polling every JOB_POLL_SECONDS otherwise
+4. create_job_queue() - builds the queue from the JOB_* settings
+
+Jobs go queued -> running -> done or failed. A job still running when the
+process stopped (a deploy, a crash) is queued again at the next startup, up to
+JOB_MAX_ATTEMPTS attempts, so accepted work survives a container restart as long
+as the queue file does. Finished jobs are purged after JOB_TTL_SECONDS.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.src.config.settings import settings, logger
+from backend.src.utils.paths import OUTPUTS_DIR
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+class JobBackend:
+    """Interface for job storage backends. Payloads and results are JSON strings."""
+
+    def enqueue(self, job_id: str, payload: str, created_at: float) -> None:
+        raise NotImplementedError
+
+    def claim(self, now: float) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job running and return it, or None if the queue is empty."""
+        raise NotImplementedError
+
+    def finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str], now: float) -> None:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def position(self, job_id: str) -> int:
+        """Queued jobs ahead of this one."""
+        raise NotImplementedError
+
+    def requeue_running(self, max_attempts: int, now: float) -> Tuple[int, int]:
+        """Queue the running jobs again (failing those out of attempts); returns (requeued, failed)."""
+        raise NotImplementedError
+
+    def counts(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+class SQLiteJobs(JobBackend):
+    """Jobs in a local SQLite file; finished jobs past the TTL are purged at startup."""
+
+    COLUMNS = "id, payload, status, attempts, result, error, created_at, started_at, finished_at"
+
+    def __init__(self, path: str, ttl_seconds: int = 86400):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)")
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                                   (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+
+    def _row(self, row) -> Dict[str, Any]:
+        return dict(zip([c.strip() for c in self.COLUMNS.split(",")], row))
+
+    def enqueue(self, job_id: str, payload: str, created_at: float) -> None:
+        with self._lock:
+            self._conn.execute("INSERT INTO jobs (id, payload, status, created_at) VALUES (?, ?, 'queued', ?)",
+                               (job_id, payload, created_at))
+            self._conn.commit()
+
+    def claim(self, now: float) -> Optional[Dict[str, Any]]:
+        # One statement, so two workers can never claim the same job
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1) "
+                f"RETURNING {self.COLUMNS}", (now,)
+            ).fetchone()
+            self._conn.commit()
+        return self._row(row) if row else None
+
+    def finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str], now: float) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                               (status, result, error, now, job_id))
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self.COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def position(self, job_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' "
+                "AND created_at < (SELECT created_at FROM jobs WHERE id = ?)", (job_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def requeue_running(self, max_attempts: int, now: float) -> Tuple[int, int]:
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted too many times', finished_at = ? "
+                "WHERE status = 'running' AND attempts >= ?", (now, max_attempts)
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'"
+            ).rowcount
+            self._conn.commit()
+        return requeued, failed
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | dict(rows)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+class JobQueue:
+    """Durable queue of pipeline jobs drained by a pool of asyncio workers."""
+
+    def __init__(self, backend: JobBackend, max_attempts: int = 3, poll_seconds: float = 1.0):
+        self.backend = backend
+        self.max_attempts = max(1, max_attempts)
+        self.poll_seconds = poll_seconds
+        self.completed = 0
+        self.failed = 0
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        """Queue a job and return its ID (blocking: call it from a thread in async code)."""
+        job_id = uuid.uuid4().hex
+        self.backend.enqueue(job_id, json.dumps(payload, ensure_ascii=False), time.time())
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job with its payload and result decoded, and its queue position while queued."""
+        job = self.backend.get(job_id)
+        if job is None:
+            return None
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["position"] = self.backend.position(job_id) if job["status"] == "queued" else None
+        return job
+
+    def start(self, handler: Handler, workers: int) -> None:
+        """Start the worker pool on the running event loop, after requeueing interrupted jobs."""
+        requeued, failed = self.backend.requeue_running(self.max_attempts, time.time())
+        if requeued or failed:
+            logger.warning(f"Job queue: {requeued} interrupted job(s) queued again, "
+                           f"{failed} failed after {self.max_attempts} attempts")
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._work(handler)) for _ in range(max(1, workers))]
+        logger.info(f"Job queue: {len(self._workers)} worker(s) started ({type(self.backend).__name__})")
+
+    async def stop(self) -> None:
+        """Stop the workers; the jobs they were running are queued again at the next start()."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    async def _work(self, handler: Handler) -> None:
+        while True:
+            # Cleared before claiming, so a job submitted in between still wakes us up
+            self._wakeup.clear()
+            job = await asyncio.to_thread(self.backend.claim, time.time())
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(handler, job)
+
+    async def _run(self, handler: Handler, job: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            result = await handler(json.loads(job["payload"]))
+        except Exception as e:
+            # HTTPExceptions carry their message in detail
+            error = str(getattr(e, "detail", None) or e) or type(e).__name__
+            logger.error(f"Job {job['id']} failed after {time.perf_counter() - started:.2f}s: {error}")
+            await asyncio.to_thread(self.backend.finish, job["id"], "failed", None, error, time.time())
+            with self._lock:
+                self.failed += 1
+        else:
+            await asyncio.to_thread(self.backend.finish, job["id"], "done",
+                                    json.dumps(result, default=str, ensure_ascii=False), None, time.time())
+            logger.info(f"Job {job['id']} done in {time.perf_counter() - started:.2f}s")
+            with self._lock:
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed, failed = self.completed, self.failed
+        return {
+            "backend": type(self.backend).__name__,
+            "workers": len(self._workers),
+            "jobs": self.backend.counts(),
+            "completed": completed,
+            "failed": failed,
+        }
+
+def create_job_queue() -> JobQueue:
+    """Create the job queue configured by the JOB_* settings."""
+    backend_name = settings.job_queue_backend
+    if backend_name != "sqlite":
+        logger.warning(f"Unknown JOB_QUEUE_BACKEND '{backend_name}', using sqlite")
+    path = settings.job_queue_path or str(OUTPUTS_DIR / "jobs.sqlite3")
+    return JobQueue(SQLiteJobs(path, settings.job_ttl_seconds), settings.job_max_attempts, settings.job_poll_seconds)
+
+job_queue = create_job_queue()
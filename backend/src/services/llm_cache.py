@@ -0,0 +1,241 @@
+"""
+LLM RESPONSE CACHE
+-----------------
+This file provides a content-addressed cache for chat completions.
+It implements:
+
+1. make_key() - a SHA-256 hash of (model, system prompt, user prompt, temperature,
+   and max_tokens and the response schema when set)
+2. MemoryLRUCache - an in-process LRU store with size and TTL eviction
+3. SQLiteCache - an on-disk store that survives restarts, with the same eviction rules
+4. LLMCache - the wrapper used by the OpenAI service, with hit/miss counters
+5. create_llm_cache() - builds the cache from the LLM_CACHE_* settings
+6. bypass_cache() - a context manager that skips the cache for one request
+
+Reprocessing the same transcript (retries, re-clicks, backfills) produces identical
+prompts, so those calls are answered from the cache instead of the API.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from backend.src.config.settings import settings, logger
+from backend.src.utils.paths import OUTPUTS_DIR
+
+# Set by bypass_cache(); propagates into the graph's node tasks and threads
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+@contextmanager
+def bypass_cache():
+    """Skip cache lookups and writes for every LLM call made inside the block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+def make_key(model: str, system: str, user: str, temperature: float, max_tokens: Optional[int] = None,
+             schema: Optional[str] = None) -> str:
+    """Build the content address of a chat request (schema names its response format)."""
+    parts = [model, system, user, round(float(temperature), 4)]
+    if max_tokens:
+        parts.append(int(max_tokens))
+    if schema:
+        parts.append(schema)
+    payload = json.dumps(parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CacheBackend:
+    """Interface for cache storage backends."""
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+class MemoryLRUCache(CacheBackend):
+    """In-memory LRU cache with a maximum entry count and a TTL."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: int = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache stored in a single SQLite file.
+    Entries past the TTL are dropped, and the least recently used entries are
+    evicted once the table grows past max_entries."""
+
+    def __init__(self, path: Path, max_entries: int = 1000, ttl_seconds: int = 86400):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+class LLMCache:
+    """Content-addressed cache for chat completions with hit/miss counters."""
+
+    def __init__(self, backend: Optional[CacheBackend], max_temperature: float = 0.2):
+        self.backend = backend
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def should_cache(self, temperature: float, use_cache: Optional[bool] = None) -> bool:
+        """Decide whether a call is cacheable.
+
+        use_cache=False bypasses the cache and use_cache=True opts in regardless of
+        temperature. By default only calls at or below max_temperature are cached,
+        so creative calls (e.g. the title at 0.7) stay opt-in.
+        """
+        if not self.enabled or use_cache is False or _bypass.get():
+            return False
+        return use_cache is True or temperature <= self.max_temperature
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Return the hit/miss counters and current size."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "entries": len(self.backend) if self.backend is not None else 0,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+def create_llm_cache() -> LLMCache:
+    """Create the LLM cache configured by the LLM_CACHE_* settings."""
+    backend_name = settings.llm_cache_backend
+    backend: Optional[CacheBackend] = None
+    if backend_name == "memory":
+        backend = MemoryLRUCache(settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds)
+    elif backend_name == "sqlite":
+        path = Path(settings.llm_cache_path) if settings.llm_cache_path else OUTPUTS_DIR / "llm_cache.sqlite3"
+        backend = SQLiteCache(path, settings.llm_cache_max_entries, settings.llm_cache_ttl_seconds)
+    elif backend_name not in ("none", ""):
+        logger.warning(f"Unknown LLM_CACHE_BACKEND '{backend_name}', caching disabled")
+    return LLMCache(backend, max_temperature=settings.llm_cache_max_temperature)
@@ -0,0 +1,367 @@
+"""
+LLM PROVIDERS
+------------
+This file holds the backends that actually answer a chat request.
+It provides:
+
+1. Completion - the text and token usage of one response, streamed or not
+2. LLMProvider - the interface used by the OpenAI service: complete() and
+   acomplete() take the prepared request, the calling node and an optional
+   listener that receives the text as it streams in
+3. OpenAIProvider - the OpenAI API; the sync and async clients are only created
+   on first use, so importing the service needs no network or API key
+4. FakeLLMProvider - a local stand-in that answers each node's prompt with
+   deterministic, schema-valid JSON built from the transcript in the prompt.
+   Latency follows a log-normal distribution, and 5xx errors, 429s (with
+   Retry-After) and an RPM limit can be injected to exercise retries and the
+   rate-limit scheduler, invalid responses to exercise validation and repair,
+   and stragglers (SLOW_FACTOR times the drawn latency) to exercise hedging.
+   With a response_format schema it only answers the fields the schema asks for.
+   It also mimics provider-side prompt caching: a prompt that repeats the leading
+   part of an earlier one reports those tokens as cached and answers faster
+5. create_llm_provider() - selects the provider with the LLM_PROVIDER setting
+
+The fake makes it possible to benchmark and load-test the graph, the API and the
+storage paths on a plain machine without spending money or adding network noise.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+from openai import APITimeoutError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
+from openai.types import CompletionUsage
+
+from backend.src.config.settings import settings, logger
+from backend.src.utils.chunking import CHARS_PER_TOKEN, estimate_tokens
+from backend.src.utils.transcript_parser import parse_transcript
+
+@dataclass
+class Completion:
+    """Text and usage of a completion, streamed or not."""
+    content: str
+    usage: Any = None
+
+class LLMProvider:
+    """Interface for chat completion backends.
+
+    listener, when given, is called with each piece of text as it arrives.
+    Errors are raised as the OpenAI SDK exceptions so the scheduler can retry them.
+    """
+
+    name = "base"
+
+    def complete(self, request: Dict[str, Any], node: Optional[str] = None,
+                 listener: Optional[Callable[[str], None]] = None) -> Completion:
+        raise NotImplementedError
+
+    async def acomplete(self, request: Dict[str, Any], node: Optional[str] = None,
+                        listener: Optional[Callable[[str], None]] = None) -> Completion:
+        raise NotImplementedError
+
+class OpenAIProvider(LLMProvider):
+    """The OpenAI chat completions API."""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str]):
+        self._api_key = api_key
+        self._client: Optional[OpenAI] = None
+        self._async_client: Optional[AsyncOpenAI] = None
+
+    # Retries are handled by the scheduler rather than inside the SDK so they can be
+    # rate-limit aware and counted
+    @property
+    def client(self) -> OpenAI:
+        if self._client is None:
+            self._client = OpenAI(api_key=self._api_key, max_retries=0)
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self._api_key, max_retries=0)
+        return self._async_client
+
+    def complete(self, request, node=None, listener=None) -> Completion:
+        if listener is None:
+            resp = self.client.chat.completions.create(**request)
+            return Completion(resp.choices[0].message.content or "", resp.usage)
+        parts, usage = [], None
+        for chunk in self.client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True}):
+            usage = chunk.usage or usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                listener(chunk.choices[0].delta.content)
+        return Completion("".join(parts), usage)
+
+    async def acomplete(self, request, node=None, listener=None) -> Completion:
+        if listener is None:
+            resp = await self.async_client.chat.completions.create(**request)
+            return Completion(resp.choices[0].message.content or "", resp.usage)
+        parts, usage = [], None
+        stream = await self.async_client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True})
+        async for chunk in stream:
+            usage = chunk.usage or usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                listener(chunk.choices[0].delta.content)
+        return Completion("".join(parts), usage)
+
+# ----- Fake provider -----
+
+# Prompt caching as the OpenAI API does it: prefixes of at least 1024 tokens, in
+# steps of 128, and (for the fake) a proportional cut of the latency
+PREFIX_CACHE_MIN_TOKENS = 1024
+PREFIX_CACHE_STEP_TOKENS = 128
+PREFIX_CACHE_ENTRIES = 20000
+CACHED_LATENCY_SAVING = 0.5
+
+# Latency multiplier of the fake's stragglers (FAKE_LLM_SLOW_RATE)
+SLOW_FACTOR = 10.0
+
+FAKE_URL = "http://fake-llm.local/v1/chat/completions"
+
+STOPWORDS = {
+    "about", "after", "again", "also", "because", "been", "before", "being", "could", "does",
+    "doing", "going", "have", "into", "just", "know", "like", "make", "maybe", "more", "need",
+    "next", "okay", "other", "really", "right", "should", "some", "sure", "than", "thank",
+    "thanks", "that", "their", "them", "then", "there", "these", "they", "thing", "things",
+    "think", "this", "those", "today", "want", "week", "well", "were", "what", "when", "where",
+    "which", "while", "will", "with", "would", "yeah", "your", "we're", "let's", "it's", "i'll",
+    "everyone", "everybody", "joining", "great", "good", "started", "looks", "here", "there's",
+}
+
+DECISION = re.compile(r"\b(?:decid\w*|agree\w*|approv\w*|go with|settled on|final answer)\b", re.IGNORECASE)
+ACTION = re.compile(r"\b(?:i'll|i will|i can take|can you|could you|will you|action item|by (?:monday|tuesday|"
+                    r"wednesday|thursday|friday|tomorrow|next week|end of (?:day|week)))\b", re.IGNORECASE)
+ASKS_OTHER = re.compile(r"\b(?:can|could|will) you\b", re.IGNORECASE)
+SENTENCE = re.compile(r"(?<=[.!?])\s+")
+# "<Label>:\n<text>\n[End of <label>]" at the start of the user message
+CONTEXT = re.compile(r"(Transcript|Partial summaries):\n(.*?)\n\[End of (?:transcript|partial summaries)\]", re.S)
+PRIORITIES = ("High", "Med", "Low")
+
+def _transcript_of(prompt: str) -> str:
+    """The transcript (or partial summaries) at the start of a node prompt."""
+    match = CONTEXT.match(prompt)
+    return match.group(2) if match else prompt
+
+def _words(text: str, limit: int) -> str:
+    words = text.split()
+    return " ".join(words[:limit]).rstrip(",;:") + ("..." if len(words) > limit else "")
+
+def _sentences(text: str):
+    """(speaker, sentence) pairs of a transcript, in order."""
+    parsed = parse_transcript(text)
+    turns = [t for t in parsed.turns if t.speaker] or parsed.turns
+    for turn in turns:
+        for sentence in SENTENCE.split(turn.utterance):
+            if sentence.strip():
+                yield turn.speaker, sentence.strip()
+
+def fake_fields(node: Optional[str], prompt: str) -> Dict[str, Any]:
+    """Deterministic, schema-valid answer of a node for the transcript in its prompt."""
+    text = _transcript_of(prompt)
+    sentences = list(_sentences(text))
+    speakers = parse_transcript(text).speakers
+    names = {part.lower() for name in speakers for part in name.split()}
+    words = (w.strip(".,!?\"'()").lower() for _, s in sentences for w in s.split())
+    topics = [w for w, _ in Counter(
+        w for w in words if len(w) > 4 and w not in STOPWORDS and w not in names
+    ).most_common(3)]
+
+    fields: Dict[str, Any] = {}
+    if node in ("extract_title", "extract_combined"):
+        fields["title"] = " ".join(t.capitalize() for t in topics) + " Review" if topics else "Team Sync"
+    if node in ("extract_agenda", "extract_combined"):
+        agenda: List[str] = []
+        for _, sentence in sentences:
+            item = _words(sentence, 8)
+            if len(sentence.split()) >= 8 and not names & {w.strip(",.").lower() for w in sentence.split()[:3]} \
+                    and item not in agenda:
+                agenda.append(item)
+        fields["agenda"] = agenda[:5]
+    if node in ("extract_decisions", "extract_combined"):
+        fields["decisions"] = [_words(s, 14) for _, s in sentences if DECISION.search(s)][:5]
+    if node in ("extract_participants", "extract_combined"):
+        fields["participants"] = speakers
+    if node in ("assign_tasks", "extract_combined"):
+        fields["tasks"] = [
+            {"owner": "TBD" if ASKS_OTHER.search(s) else (speaker or "TBD"), "task": _words(s, 14),
+             "due": "", "priority": PRIORITIES[len(s) % 3]}
+            for speaker, s in sentences if ACTION.search(s)
+        ][:8]
+    if node in ("extract_executive_summary", "extract_combined"):
+        fields["executive_summary"] = (
+            f"The meeting focused on {', '.join(topics) or 'general updates'}. "
+            f"{len(speakers)} participant(s) contributed {len(sentences)} statements, "
+            f"with {sum(1 for _, s in sentences if DECISION.search(s))} decision(s) and "
+            f"{sum(1 for _, s in sentences if ACTION.search(s))} follow-up(s) noted."
+        )
+    return fields
+
+def _error(cls, message: str, status: int, headers: Optional[Dict[str, str]] = None):
+    response = httpx.Response(status, headers=headers or {}, request=httpx.Request("POST", FAKE_URL))
+    return cls(message, response=response, body=None)
+
+class FakeLLMProvider(LLMProvider):
+    """Offline provider with deterministic answers and configurable latency and failures."""
+
+    name = "fake"
+
+    def __init__(self, latency_ms: float = 800.0, latency_sigma: float = 0.5, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, rpm_limit: float = 0.0, seed: int = 0, invalid_rate: float = 0.0,
+                 slow_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rpm_limit = rpm_limit
+        self.invalid_rate = invalid_rate
+        self.slow_rate = slow_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window: Deque[float] = deque()
+        self._prefixes: "OrderedDict[int, None]" = OrderedDict()
+
+    def _cached_tokens(self, request: Dict[str, Any]) -> int:
+        """Tokens of the longest cached prefix of the prompt; caches the prompt's prefixes."""
+        text = "".join(m["content"] for m in request["messages"])
+        cached = 0
+        with self._lock:
+            tokens = PREFIX_CACHE_MIN_TOKENS
+            while tokens * CHARS_PER_TOKEN <= len(text):
+                key = hash(text[:tokens * CHARS_PER_TOKEN])
+                if key in self._prefixes:
+                    self._prefixes.move_to_end(key)
+                    cached = tokens
+                else:
+                    self._prefixes[key] = None
+                tokens += PREFIX_CACHE_STEP_TOKENS
+            while len(self._prefixes) > PREFIX_CACHE_ENTRIES:
+                self._prefixes.popitem(last=False)
+        return cached
+
+    def _plan(self, request: Dict[str, Any]) -> Tuple[float, Optional[float], int]:
+        """Draw this attempt's latency (seconds), where to break an invalid response
+        and the cached prompt tokens; or raise the injected failure."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rpm_limit > 0:
+                while self._window and now - self._window[0] >= 60:
+                    self._window.popleft()
+                if len(self._window) >= self.rpm_limit:
+                    retry_after = 60 - (now - self._window[0])
+                    raise _error(RateLimitError, "Rate limit reached (fake RPM limit)", 429,
+                                 {"retry-after": f"{retry_after:.3f}"})
+                self._window.append(now)
+            draw = self._random.random()
+            latency = self.latency_ms / 1000 * math.exp(self._random.gauss(0, self.latency_sigma))
+            invalid = self._random.random() if self._random.random() < self.invalid_rate else None
+            if self._random.random() < self.slow_rate:
+                latency *= SLOW_FACTOR
+        if draw < self.rate_limit_rate:
+            raise _error(RateLimitError, "Rate limit reached (fake)", 429, {"retry-after": "1"})
+        if draw < self.rate_limit_rate + self.error_rate:
+            raise _error(InternalServerError, "Server error (fake)", 500)
+        cached = self._cached_tokens(request)
+        if cached:
+            prompt_tokens = sum(estimate_tokens(m["content"]) for m in request["messages"])
+            latency *= 1 - CACHED_LATENCY_SAVING * min(1.0, cached / prompt_tokens)
+        return latency, invalid, cached
+
+    @staticmethod
+    def _answer(request: Dict[str, Any], node: Optional[str], invalid: Optional[float] = None,
+                cached_tokens: int = 0) -> Completion:
+        user = request["messages"][-1]["content"]
+        fields = fake_fields(node, user)
+        schema = request.get("response_format", {}).get("json_schema", {}).get("schema")
+        if schema:
+            fields = {name: fields.get(name) for name in schema.get("properties", {})}
+        content = json.dumps(fields, ensure_ascii=False)
+        if invalid is not None:
+            # Drop one field, or cut the JSON off, at a position given by the draw
+            if fields and invalid < 0.5:
+                dropped = sorted(fields)[int(invalid * 2 * len(fields))]
+                content = json.dumps({k: v for k, v in fields.items() if k != dropped}, ensure_ascii=False)
+            else:
+                content = content[:int(len(content) * invalid)]
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in request["messages"])
+        completion_tokens = estimate_tokens(content)
+        usage = CompletionUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                total_tokens=prompt_tokens + completion_tokens,
+                                prompt_tokens_details={"cached_tokens": min(cached_tokens, prompt_tokens)})
+        return Completion(content, usage)
+
+    @staticmethod
+    def _pieces(content: str, count: int = 8) -> List[str]:
+        size = max(1, math.ceil(len(content) / count))
+        return [content[i:i + size] for i in range(0, len(content), size)]
+
+    @staticmethod
+    def _timed_out(request: Dict[str, Any], latency: float) -> Optional[float]:
+        """Seconds after which the attempt times out, or None if it answers in time."""
+        timeout = request.get("timeout")
+        return timeout if timeout is not None and latency > timeout else None
+
+    def complete(self, request, node=None, listener=None) -> Completion:
+        latency, invalid, cached = self._plan(request)
+        timeout = self._timed_out(request, latency)
+        if timeout is not None:
+            # Like the client, give up once the timeout has passed
+            time.sleep(timeout)
+            raise APITimeoutError(request=httpx.Request("POST", FAKE_URL))
+        completion = self._answer(request, node, invalid, cached)
+        if listener is None:
+            time.sleep(latency)
+            return completion
+        # Time to first token is ~30% of the latency, the rest is spent streaming
+        time.sleep(latency * 0.3)
+        pieces = self._pieces(completion.content)
+        for piece in pieces:
+            listener(piece)
+            time.sleep(latency * 0.7 / len(pieces))
+        return completion
+
+    async def acomplete(self, request, node=None, listener=None) -> Completion:
+        latency, invalid, cached = self._plan(request)
+        timeout = self._timed_out(request, latency)
+        if timeout is not None:
+            await asyncio.sleep(timeout)
+            raise APITimeoutError(request=httpx.Request("POST", FAKE_URL))
+        completion = self._answer(request, node, invalid, cached)
+        if listener is None:
+            await asyncio.sleep(latency)
+            return completion
+        await asyncio.sleep(latency * 0.3)
+        pieces = self._pieces(completion.content)
+        for piece in pieces:
+            listener(piece)
+            await asyncio.sleep(latency * 0.7 / len(pieces))
+        return completion
+
+def create_llm_provider() -> LLMProvider:
+    """Create the provider selected by LLM_PROVIDER."""
+    if settings.llm_provider == "fake":
+        logger.warning("Using the fake LLM provider: responses are generated locally")
+        return FakeLLMProvider(
+            latency_ms=settings.fake_llm_latency_ms,
+            latency_sigma=settings.fake_llm_latency_sigma,
+            error_rate=settings.fake_llm_error_rate,
+            rate_limit_rate=settings.fake_llm_rate_limit_rate,
+            rpm_limit=settings.fake_llm_rpm_limit,
+            seed=settings.fake_llm_seed,
+            invalid_rate=settings.fake_llm_invalid_rate,
+            slow_rate=settings.fake_llm_slow_rate,
+        )
+    if settings.llm_provider != "openai":
+        logger.warning(f"Unknown LLM_PROVIDER '{settings.llm_provider}', using openai")
+    return OpenAIProvider(settings.openai_api_key)
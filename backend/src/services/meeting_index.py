@@ -0,0 +1,214 @@
+"""
+SOURCE TO MEETING INDEX
+----------------------
+This file keeps one map from transcript keys to the meeting generated from
+them, so the API no longer lists and downloads every meeting_data/*.json
+object to find out which transcripts were processed.
+It implements:
+
+1. MeetingIndex.lookup() - the index entry of a transcript: its meeting ID,
+   title and date, status ("processed", or "partial" when some node ran out of
+   time), transcript hash and partial fields; None if it was never processed. fresh=True re-reads
+   the index first, for decisions that must see the other containers' writes
+2. MeetingIndex.entries() - every entry, for listing transcripts with their status
+   and for the meeting list
+3. MeetingIndex.record() - updates a transcript's entry; called on every meeting
+   data write
+4. MeetingIndex.rebuild() - scans meeting_data/*.json and rewrites the index;
+   runs automatically when the index object does not exist yet, and from
+   scripts/rebuild_meeting_index.py
+
+The index is a single JSON object (MEETING_INDEX_KEY) in the processed bucket,
+cached in memory and re-read every MEETING_INDEX_REFRESH_SECONDS so writes from
+other API containers show up. Every write is conditional on the ETag it read
+(S3 If-Match, or If-None-Match when creating it) and is retried on a fresh read
+when another container wrote first, so no container drops another's entries.
+Only a missing object counts as "no index": when the read fails, nothing is
+written and the cached index (if any) keeps serving lookups.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from backend.src.config.settings import settings, logger
+
+# An index of another version is rebuilt on first use
+INDEX_VERSION = 2
+# Conditional writes that lose to another container are retried on a fresh read
+WRITE_ATTEMPTS = 5
+
+def _processed_at(meeting_data: Dict[str, Any]) -> str:
+    """Sortable processing time of meeting data; older objects only have a display date."""
+    if meeting_data.get("processedAt"):
+        return meeting_data["processedAt"]
+    try:
+        return datetime.strptime(meeting_data.get("date", ""), "%B %d, %Y").date().isoformat()
+    except ValueError:
+        return ""
+
+def index_entry(meeting_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The index entry of a stored meeting data object."""
+    partial = meeting_data.get("partialFields") or []
+    return {
+        "id": meeting_data["id"],
+        "source": meeting_data["source"],
+        "title": meeting_data.get("title"),
+        "date": meeting_data.get("date"),
+        "processedAt": _processed_at(meeting_data),
+        "status": "partial" if partial else "processed",
+        "transcriptHash": meeting_data.get("transcriptHash"),
+        "partialFields": partial,
+        "updatedAt": datetime.now().isoformat(timespec="seconds"),
+    }
+
+class MeetingIndex:
+    """Transcript key -> meeting entry, stored as one JSON object through the storage repository."""
+
+    def __init__(self, storage_repo, key: str = "index/meeting_sources.json", refresh_seconds: float = 30.0):
+        self.storage_repo = storage_repo
+        self.key = key
+        self.refresh_seconds = refresh_seconds
+        self._sources: Optional[Dict[str, Dict[str, Any]]] = None
+        self._loaded_at = 0.0
+        self.loads = 0
+        self.rebuilds = 0
+        self._lock = threading.Lock()
+
+    def _read(self) -> Tuple[Optional[Dict[str, Dict[str, Any]]], Optional[str]]:
+        """The stored map and its ETag; no map if the object is missing, unreadable or of
+        another version. Storage errors are raised, never taken for a missing index."""
+        found = self.storage_repo.get_file_with_etag(self.key)
+        if found is None:
+            return None, None
+        content, etag = found
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning(f"Meeting index {self.key} is not valid JSON; it will be rebuilt")
+            return None, etag
+        self.loads += 1
+        return (data.get("sources", {}) if data.get("version") == INDEX_VERSION else None), etag
+
+    def _write(self, sources: Dict[str, Dict[str, Any]], etag: Optional[str]) -> Optional[bool]:
+        """Write the map if the object still has this ETag; False if another container
+        wrote first, None if the write failed."""
+        payload = {"version": INDEX_VERSION, "updatedAt": datetime.now().isoformat(timespec="seconds"),
+                   "sources": sources}
+        try:
+            return self.storage_repo.save_file_if_match(
+                self.key, json.dumps(payload, ensure_ascii=False).encode("utf-8"), etag)
+        except Exception as e:
+            logger.warning(f"Could not write the meeting index {self.key}: {e}")
+            return None
+
+    def _scan(self) -> Dict[str, Dict[str, Any]]:
+        sources: Dict[str, Dict[str, Any]] = {}
+        for key in self.storage_repo.list_processed_files("meeting_data/"):
+            if not key.endswith(".json"):
+                continue
+            content = self.storage_repo.get_file_from_s3(key)
+            if not content:
+                continue
+            try:
+                meeting_data = json.loads(content)
+            except json.JSONDecodeError:
+                logger.warning(f"Could not parse meeting data JSON: {key}")
+                continue
+            if "source" in meeting_data and "id" in meeting_data:
+                sources.setdefault(meeting_data["source"], index_entry(meeting_data))
+        return sources
+
+    def _current(self, fresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """The cached map, re-read when stale and rebuilt when missing (call with the lock held).
+        When the read fails the cached map is kept, unless there is none or fresh is set."""
+        if not fresh and self._sources is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return self._sources
+        try:
+            sources = self._load()
+        except Exception as e:
+            if fresh or self._sources is None:
+                raise
+            logger.warning(f"Could not read the meeting index {self.key}, using the cached one: {e}")
+            return self._sources
+        self._sources, self._loaded_at = sources, time.monotonic()
+        return sources
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """The stored map, rebuilt from the meeting data when there is none."""
+        for _ in range(WRITE_ATTEMPTS):
+            sources, etag = self._read()
+            if sources is not None:
+                return sources
+            started = time.perf_counter()
+            sources = self._scan()
+            written = self._write(sources, etag)
+            if written is False:
+                # Another container created or rebuilt it meanwhile; use theirs
+                continue
+            self.rebuilds += 1
+            logger.info(f"Meeting index rebuilt from S3: {len(sources)} source(s) in "
+                        f"{time.perf_counter() - started:.2f}s")
+            return sources
+        raise RuntimeError(f"Meeting index {self.key} kept changing while it was rebuilt")
+
+    def lookup(self, source: str, fresh: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._current(fresh).get(source)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._current())
+
+    def record(self, meeting_data: Dict[str, Any]) -> None:
+        """Point the meeting data's source at it."""
+        entry = index_entry(meeting_data)
+        with self._lock:
+            for _ in range(WRITE_ATTEMPTS):
+                try:
+                    sources, etag = self._read()
+                except Exception as e:
+                    # Writing now could replace entries we failed to read; the rebuild script adds this one
+                    logger.warning(f"Could not read the meeting index; {entry['source']} not recorded: {e}")
+                    return
+                if sources is None:
+                    # No index yet: the scan also finds this meeting data, which is already saved
+                    sources = self._scan()
+                sources = {**sources, entry["source"]: entry}
+                written = self._write(sources, etag)
+                if written is not False:
+                    self._sources, self._loaded_at = sources, time.monotonic()
+                    return
+            logger.warning(f"Meeting index kept changing; {entry['source']} not recorded")
+
+    def rebuild(self) -> int:
+        """Rebuild the index from the stored meeting data; returns the number of sources."""
+        with self._lock:
+            for _ in range(WRITE_ATTEMPTS):
+                _, etag = self._read()
+                sources = self._scan()
+                written = self._write(sources, etag)
+                if written is None:
+                    raise RuntimeError(f"Could not write the meeting index {self.key}")
+                if written:
+                    break
+            else:
+                raise RuntimeError(f"Meeting index {self.key} kept changing while it was rebuilt")
+            self.rebuilds += 1
+            self._sources, self._loaded_at = sources, time.monotonic()
+            return len(sources)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "key": self.key,
+                "sources": len(self._sources) if self._sources is not None else None,
+                "loads": self.loads,
+                "rebuilds": self.rebuilds,
+            }
+
+def create_meeting_index(storage_repo) -> MeetingIndex:
+    """Create the index configured by the MEETING_INDEX_* settings."""
+    return MeetingIndex(storage_repo, settings.meeting_index_key, settings.meeting_index_refresh_seconds)
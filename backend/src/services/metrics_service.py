@@ -0,0 +1,334 @@
+"""
+PIPELINE METRICS SERVICE
+-----------------------
+This file records latency, token usage and cost for the meeting pipeline.
+It provides:
+
+1. estimate_cost() - converts prompt/completion tokens into USD per model, with
+   prompt tokens served from the provider's prompt cache at the cached price
+2. MetricsRegistry - process-wide aggregates per graph node and per model, with
+   p50/p95 latencies over a window of recent calls to tune model routing
+3. instrument_node() - wraps a graph node (sync or async) to time it and collect
+   every LLM call it makes; the node's summary is appended to the
+   node_metrics field of the pipeline state
+4. record_llm_call() - called by the OpenAI service after every completion, with
+   the API latency, the time the call waited in the rate-limit scheduler, the
+   cached prompt tokens reported in the usage and whether the call was hedged (see
+   hedging)
+5. record_validation() - called by the node flows after validating an LLM
+   response against its output model, with the outcome of the repair request
+   made for its invalid fields, if any
+6. summarize_run() - turns the node_metrics of one run into a per-run summary,
+   including the parse-failure and repair rates and the nodes that ran out of
+   time (degraded)
+
+Each meeting result gets the per-run summary attached, so it is easy to see which
+node dominates latency and spend; /api/metrics exposes the process-wide totals.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.src.config.settings import logger
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+}
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimate the USD cost of a completion (0.0 for models without a known price).
+    cached_tokens is the part of prompt_tokens served from the prompt cache."""
+    input_price, cached_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0, 0.0))
+    return ((prompt_tokens - cached_tokens) * input_price + cached_tokens * cached_price
+            + completion_tokens * output_price) / 1_000_000
+
+# Recent call latencies kept per node and per model for the percentiles
+LATENCY_WINDOW = 1000
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of a list of values (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def _empty_validation() -> Dict[str, int]:
+    return {"validated": 0, "parse_failures": 0, "repairs": 0, "repair_failures": 0}
+
+def _validation_rates(stats: Dict[str, int]) -> Dict[str, float]:
+    validated = stats.get("validated", 0)
+    return {
+        "parse_failure_rate": round(stats.get("parse_failures", 0) / validated, 4) if validated else 0.0,
+        "repair_rate": round(stats.get("repairs", 0) / validated, 4) if validated else 0.0,
+    }
+
+def _empty_stats() -> Dict[str, Any]:
+    return {
+        "calls": 0, "errors": 0, "cache_hits": 0, "retries": 0,
+        "total_latency_s": 0.0, "max_latency_s": 0.0, "queue_wait_s": 0.0,
+        "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+        "hedges": 0, "hedge_wins": 0,
+    }
+
+def _add_call(stats: Dict[str, Any], call: Dict[str, Any]) -> None:
+    stats["calls"] += 1
+    stats["errors"] += 0 if call["ok"] else 1
+    stats["cache_hits"] += 1 if call["cache_hit"] else 0
+    stats["retries"] += call["retries"]
+    stats["total_latency_s"] += call["latency_s"]
+    stats["max_latency_s"] = max(stats["max_latency_s"], call["latency_s"])
+    stats["queue_wait_s"] += call["queue_wait_s"]
+    stats["prompt_tokens"] += call["prompt_tokens"]
+    stats["cached_tokens"] += call["cached_tokens"]
+    stats["completion_tokens"] += call["completion_tokens"]
+    stats["cost_usd"] += call["cost_usd"]
+    stats["hedges"] += 1 if call["hedged"] else 0
+    stats["hedge_wins"] += 1 if call["hedge_won"] else 0
+
+class MetricsRegistry:
+    """Thread-safe process-wide aggregates of LLM calls and node executions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.llm_by_node: Dict[str, Dict[str, Any]] = {}
+            self.llm_by_model: Dict[str, Dict[str, Any]] = {}
+            self.nodes: Dict[str, Dict[str, Any]] = {}
+            self.validation: Dict[str, Dict[str, int]] = {}
+            self._latencies: Dict[str, Deque[float]] = {}
+
+    def add_llm_call(self, call: Dict[str, Any]) -> None:
+        with self._lock:
+            _add_call(self.llm_by_node.setdefault(call["node"], _empty_stats()), call)
+            _add_call(self.llm_by_model.setdefault(call["model"], _empty_stats()), call)
+            # Cache hits and failures would skew the latency of real completions
+            if call["ok"] and not call["cache_hit"]:
+                for key in (f"node:{call['node']}", f"model:{call['model']}"):
+                    self._latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(call["latency_s"])
+
+    def add_validation(self, node: str, result: Dict[str, int]) -> None:
+        with self._lock:
+            stats = self.validation.setdefault(node, _empty_validation())
+            for key, value in result.items():
+                stats[key] += value
+
+    def latency_percentile(self, kind: str, name: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """Percentile q of recent completion latencies for a "node" or "model", or None
+        with fewer than min_samples latencies."""
+        with self._lock:
+            window = list(self._latencies.get(f"{kind}:{name}", ()))
+        return _percentile(window, q) if window and len(window) >= min_samples else None
+
+    def add_node_run(self, node: str, wall_time_s: float, ok: bool, degraded: bool = False) -> None:
+        with self._lock:
+            stats = self.nodes.setdefault(node, {"runs": 0, "errors": 0, "degraded": 0,
+                                                 "total_wall_time_s": 0.0, "max_wall_time_s": 0.0})
+            stats["runs"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["degraded"] += 1 if degraded else 0
+            stats["total_wall_time_s"] += wall_time_s
+            stats["max_wall_time_s"] = max(stats["max_wall_time_s"], wall_time_s)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the aggregates with average latencies filled in."""
+        def with_averages(groups: Dict[str, Dict[str, Any]], total_key: str, count_key: str) -> Dict[str, Dict[str, Any]]:
+            result = {}
+            for name, stats in groups.items():
+                entry = dict(stats)
+                entry[total_key.replace("total_", "avg_")] = stats[total_key] / stats[count_key] if stats[count_key] else 0.0
+                result[name] = entry
+            return result
+
+        def with_percentiles(groups: Dict[str, Dict[str, Any]], kind: str) -> Dict[str, Dict[str, Any]]:
+            for name, entry in groups.items():
+                window = list(self._latencies.get(f"{kind}:{name}", ()))
+                entry["p50_latency_s"] = _percentile(window, 50)
+                entry["p95_latency_s"] = _percentile(window, 95)
+            return groups
+
+        with self._lock:
+            return {
+                "nodes": with_averages(self.nodes, "total_wall_time_s", "runs"),
+                "llm_by_node": with_percentiles(with_averages(self.llm_by_node, "total_latency_s", "calls"), "node"),
+                "llm_by_model": with_percentiles(with_averages(self.llm_by_model, "total_latency_s", "calls"), "model"),
+                "validation": {name: {**stats, **_validation_rates(stats)} for name, stats in self.validation.items()},
+            }
+
+metrics = MetricsRegistry()
+
+# Name of the graph node currently executing, the list collecting its LLM calls
+# and the counters of its response validations
+_current_node: ContextVar[Optional[str]] = ContextVar("metrics_current_node", default=None)
+_node_calls: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("metrics_node_calls", default=None)
+_node_validation: ContextVar[Optional[Dict[str, int]]] = ContextVar("metrics_node_validation", default=None)
+
+def current_node() -> Optional[str]:
+    """Name of the graph node whose code is currently running, if any."""
+    return _current_node.get()
+
+def record_llm_call(model: str, latency_s: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+                    retries: int = 0, cache_hit: bool = False, ok: bool = True,
+                    queue_wait_s: float = 0.0, cached_tokens: int = 0, hedged: bool = False,
+                    hedge_won: bool = False) -> Dict[str, Any]:
+    """Record one chat completion (or cache hit) against the current node and model.
+    queue_wait_s is the time spent waiting for the rate-limit scheduler; cached_tokens
+    the prompt tokens the provider served from its prompt cache. A hedged call sent a
+    duplicate request (hedge_won: the duplicate answered first), billed like the answer,
+    so its tokens and cost count twice."""
+    copies = 2 if hedged else 1
+    cost = 0.0 if cache_hit else estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+    call = {
+        "node": _current_node.get() or "unknown",
+        "model": model,
+        "latency_s": latency_s,
+        "prompt_tokens": prompt_tokens * copies,
+        "cached_tokens": cached_tokens * copies,
+        "completion_tokens": completion_tokens * copies,
+        "retries": retries,
+        "queue_wait_s": queue_wait_s,
+        "cache_hit": cache_hit,
+        "ok": ok,
+        "cost_usd": cost * copies,
+        "hedged": hedged,
+        "hedge_won": hedge_won,
+    }
+    metrics.add_llm_call(call)
+    collector = _node_calls.get()
+    if collector is not None:
+        collector.append(call)
+    return call
+
+def record_validation(valid: bool, repaired: Optional[bool] = None) -> None:
+    """Record the validation of one LLM response against its output model.
+    repaired is None when no repair was requested, else whether the repair was valid."""
+    result = {
+        "validated": 1,
+        "parse_failures": 0 if valid else 1,
+        "repairs": 0 if repaired is None else 1,
+        "repair_failures": 1 if repaired is False else 0,
+    }
+    metrics.add_validation(_current_node.get() or "unknown", result)
+    collector = _node_validation.get()
+    if collector is not None:
+        for key, value in result.items():
+            collector[key] += value
+
+def _node_summary(node: str, wall_time_s: float, calls: List[Dict[str, Any]],
+                  validation: Optional[Dict[str, int]] = None, degraded: bool = False) -> Dict[str, Any]:
+    stats = _empty_stats()
+    for call in calls:
+        _add_call(stats, call)
+    return {
+        "node": node,
+        "wall_time_s": round(wall_time_s, 4),
+        "llm_calls": stats["calls"],
+        "llm_errors": stats["errors"],
+        "cache_hits": stats["cache_hits"],
+        "retries": stats["retries"],
+        "llm_latency_s": round(stats["total_latency_s"], 4),
+        "queue_wait_s": round(stats["queue_wait_s"], 4),
+        "prompt_tokens": stats["prompt_tokens"],
+        "cached_tokens": stats["cached_tokens"],
+        "completion_tokens": stats["completion_tokens"],
+        "cost_usd": round(stats["cost_usd"], 6),
+        "hedges": stats["hedges"],
+        "hedge_wins": stats["hedge_wins"],
+        "models": sorted({call["model"] for call in calls}),
+        "degraded": degraded,
+        **(validation or _empty_validation()),
+    }
+
+def instrument_node(name: str, func: Callable) -> Callable:
+    """Wrap a graph node so its wall time and LLM calls are recorded.
+
+    The node's summary is added to its state update under "node_metrics".
+    """
+    def start():
+        return (_current_node.set(name), _node_calls.set([]), _node_validation.set(_empty_validation()),
+                time.perf_counter())
+
+    def finish(tokens, update: Optional[Dict[str, Any]], ok: bool) -> Dict[str, Any]:
+        node_token, calls_token, validation_token, started = tokens
+        wall_time_s = time.perf_counter() - started
+        calls = _node_calls.get() or []
+        validation = _node_validation.get()
+        _current_node.reset(node_token)
+        _node_calls.reset(calls_token)
+        _node_validation.reset(validation_token)
+        degraded = bool(update and update.get("degraded_fields"))
+        metrics.add_node_run(name, wall_time_s, ok, degraded)
+        summary = _node_summary(name, wall_time_s, calls, validation, degraded)
+        if summary["llm_calls"]:
+            logger.info(f"Node {name} finished in {wall_time_s:.2f}s ({summary['llm_calls']} LLM call(s), "
+                        f"{summary['prompt_tokens'] + summary['completion_tokens']} tokens, ${summary['cost_usd']:.5f})")
+        if update is None:
+            return summary
+        return {**update, "node_metrics": [summary]}
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, *args, **kwargs):
+            tokens = start()
+            try:
+                update = await func(state, *args, **kwargs)
+            except Exception:
+                finish(tokens, None, ok=False)
+                raise
+            return finish(tokens, update or {}, ok=True)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, *args, **kwargs):
+        tokens = start()
+        try:
+            update = func(state, *args, **kwargs)
+        except Exception:
+            finish(tokens, None, ok=False)
+            raise
+        return finish(tokens, update or {}, ok=True)
+    return wrapper
+
+def summarize_run(node_metrics: List[Dict[str, Any]], wall_time_s: Optional[float] = None) -> Dict[str, Any]:
+    """Build the per-run summary attached to a meeting result."""
+    nodes = {entry["node"]: entry for entry in node_metrics or []}
+    llm_nodes = [entry for entry in nodes.values() if entry["llm_calls"]]
+    validation = {key: sum(e.get(key, 0) for e in nodes.values()) for key in _empty_validation()}
+    prompt_tokens = sum(e["prompt_tokens"] for e in nodes.values())
+    cached_tokens = sum(e.get("cached_tokens", 0) for e in nodes.values())
+    summary = {
+        "llm_calls": sum(e["llm_calls"] for e in nodes.values()),
+        "cache_hits": sum(e["cache_hits"] for e in nodes.values()),
+        "retries": sum(e["retries"] for e in nodes.values()),
+        "queue_wait_s": round(sum(e.get("queue_wait_s", 0.0) for e in nodes.values()), 4),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        # Share of the prompt tokens served from the provider's prompt cache
+        "cached_prompt_ratio": round(cached_tokens / prompt_tokens, 4) if prompt_tokens else 0.0,
+        "completion_tokens": sum(e["completion_tokens"] for e in nodes.values()),
+        "cost_usd": round(sum(e["cost_usd"] for e in nodes.values()), 6),
+        "hedges": sum(e.get("hedges", 0) for e in nodes.values()),
+        "hedge_wins": sum(e.get("hedge_wins", 0) for e in nodes.values()),
+        **validation,
+        **_validation_rates(validation),
+        "slowest_node": max(nodes.values(), key=lambda e: e["wall_time_s"])["node"] if nodes else None,
+        "costliest_node": max(llm_nodes, key=lambda e: e["cost_usd"])["node"] if llm_nodes else None,
+        "degraded_nodes": [e["node"] for e in nodes.values() if e.get("degraded")],
+        "nodes": nodes,
+    }
+    if wall_time_s is not None:
+        summary["wall_time_s"] = round(wall_time_s, 4)
+    return summary
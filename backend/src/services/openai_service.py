@@ -4,28 +4,236 @@ AI MODEL INTEGRATION SERVICE
 This file provides the interface to OpenAI's language models.
 Specifically, it:
 
-1. Initializes the connection to OpenAI using the API key
+1. Creates the LLM provider selected by LLM_PROVIDER: the OpenAI API (clients
+   created on first use), or a local fake for offline benchmarks and load tests
 2. Provides the chat_5_8_sentences() function which:
-   - Takes system instructions and user input
-   - Sends them to the GPT-4o-mini model
+   - Takes system instructions, user input and the calling node
+   - Routes the request to the model configured for that node
    - Sets appropriate parameters for reliable outputs
    - Returns the AI-generated response
+3. Provides achat_5_8_sentences(), the same call on the AsyncOpenAI client,
+   so the API can keep many pipelines in flight without blocking the event loop
+4. Answers repeated requests from the content-addressed LLM cache
+5. Sends every call through the shared rate-limit scheduler (token buckets,
+   adaptive concurrency, jittered backoff honoring Retry-After) and records
+   latency, queue wait, token usage (resp.usage, including the prompt tokens served
+   from the provider's prompt cache), retries and estimated cost of every call in
+   the metrics registry
+6. Streams the completion when the run is being streamed to a client (see
+   progress_service), emitting partial fields as soon as they are complete
+7. Constrains the response to the JSON schema of the node's output model when
+   one is given (structured outputs, LLM_STRUCTURED_OUTPUTS)
+8. Hedges calls that run longer than usual for their node (LLM_HEDGING): a
+   duplicate request is sent and the first answer wins (see hedging)
+9. Cuts every request's timeout to the time left before the run's deadline, and
+   raises DeadlineExceeded instead of sending a request with no time left
+
+Model routing: resolve_route() combines the defaults (LLM_MODEL,
+LLM_TIMEOUT_SECONDS and the temperature chosen by the node) with the per-node
+overrides in LLM_ROUTES, so a node can move to a cheaper or stronger model
+without code changes.
 
 This service abstracts away the details of API communication and
 parameter settings, making it easy to use AI capabilities throughout
 the application.
 """
 
-from openai import OpenAI
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type
+
+from openai import APIConnectionError, InternalServerError, RateLimitError
+from pydantic import BaseModel
 from backend.src.config.settings import settings
+from backend.src.services import deadline_service
+from backend.src.services.hedging import HedgeOutcome, ahedged_call, hedge_budget, hedge_delay, hedged_call
+from backend.src.services.llm_cache import create_llm_cache, make_key
+from backend.src.services.llm_provider import Completion, create_llm_provider
+from backend.src.services.metrics_service import current_node, record_llm_call
+from backend.src.services.progress_service import partial_listener
+from backend.src.services.rate_limiter import CallStats, create_llm_scheduler
+from backend.src.utils.chunking import estimate_tokens
+from backend.src.utils.json_utils import response_format
+
+# Default model, used by every node without a route
+MODEL = settings.llm_model
+
+llm_provider = create_llm_provider()
+
+llm_cache = create_llm_cache()
+
+# APITimeoutError is a subclass of APIConnectionError
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
 
-_client = OpenAI(api_key=settings.openai_api_key)
+llm_scheduler = create_llm_scheduler(RETRYABLE_ERRORS)
 
-def chat_5_8_sentences(system: str, user: str, temperature: float = 0.2) -> str:
-    resp = _client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "system", "content": system},
-                  {"role": "user", "content": user}],
-        temperature=temperature,
+# Completion size assumed when reserving token budget for a node without max_tokens
+DEFAULT_COMPLETION_TOKENS = 512
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model parameters used for one node's requests."""
+    model: str
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    timeout: float = 60.0
+
+def resolve_route(node: Optional[str]) -> ModelRoute:
+    """Return the route for a node: its LLM_ROUTES entry over the defaults."""
+    override = settings.llm_routes.get(node or "", {})
+    return ModelRoute(
+        model=override.get("model", MODEL),
+        temperature=override.get("temperature"),
+        max_tokens=override.get("max_tokens"),
+        timeout=float(override.get("timeout", settings.llm_timeout_seconds)),
     )
-    return resp.choices[0].message.content.strip()
+
+def _messages(system: str, user: str):
+    return [{"role": "system", "content": system},
+            {"role": "user", "content": user}]
+
+def _prepare(system: str, user: str, temperature: float, use_cache: Optional[bool], node: Optional[str],
+             schema: Optional[Type[BaseModel]] = None):
+    """Resolve the route and build the request arguments, the cache key (None if
+    uncached) and the token budget to reserve."""
+    route = resolve_route(node or current_node())
+    if route.temperature is not None:
+        temperature = route.temperature
+    request: Dict[str, Any] = {
+        "model": route.model,
+        "messages": _messages(system, user),
+        "temperature": temperature,
+        "timeout": route.timeout,
+    }
+    if route.max_tokens:
+        request["max_tokens"] = route.max_tokens
+    schema_name = None
+    if schema is not None and settings.llm_structured_outputs:
+        request["response_format"] = response_format(schema)
+        schema_name = schema.__name__
+    key = None
+    if llm_cache.should_cache(temperature, use_cache):
+        key = make_key(route.model, system, user, temperature, route.max_tokens, schema_name)
+    estimated_tokens = estimate_tokens(system) + estimate_tokens(user) + (route.max_tokens or DEFAULT_COMPLETION_TOKENS)
+    return route, request, key, estimated_tokens
+
+def _bounded(request: Dict[str, Any]) -> Dict[str, Any]:
+    """The request with its timeout cut to the time left before the deadline."""
+    left = deadline_service.remaining()
+    if left is None or left >= request["timeout"]:
+        return request
+    if left <= 0:
+        raise deadline_service.DeadlineExceeded("Deadline exceeded before the LLM request was sent")
+    return {**request, "timeout": left}
+
+# Each attempt gets a fresh listener, so a retried stream starts parsing from scratch
+def _complete(request: Dict[str, Any], node: Optional[str]) -> Completion:
+    listener = partial_listener(node)
+    return llm_provider.complete(_bounded(request), node, listener.feed if listener else None)
+
+async def _acomplete(request: Dict[str, Any], node: Optional[str]) -> Completion:
+    listener = partial_listener(node)
+    return await llm_provider.acomplete(_bounded(request), node, listener.feed if listener else None)
+
+def _attempt(request: Dict[str, Any], node: Optional[str], estimated_tokens: int, outcome: HedgeOutcome):
+    """The function the scheduler runs for each attempt: the request, hedged once
+    the node has enough latency history. The duplicate does not stream."""
+    if settings.llm_hedging:
+        hedge_budget.on_call()
+    delay = hedge_delay(node)
+    if delay is None:
+        return lambda: _complete(request, node)
+    return lambda: hedged_call(lambda: _complete(request, node), lambda: llm_provider.complete(_bounded(request), node),
+                               delay, lambda: llm_scheduler.try_admit(estimated_tokens, _tokens_used), outcome)
+
+def _aattempt(request: Dict[str, Any], node: Optional[str], estimated_tokens: int, outcome: HedgeOutcome):
+    """Async version of _attempt()."""
+    if settings.llm_hedging:
+        hedge_budget.on_call()
+    delay = hedge_delay(node)
+    if delay is None:
+        return lambda: _acomplete(request, node)
+    return lambda: ahedged_call(lambda: _acomplete(request, node), lambda: llm_provider.acomplete(_bounded(request), node),
+                                delay, lambda: llm_scheduler.try_admit(estimated_tokens, _tokens_used), outcome)
+
+def _tokens_used(completion: Completion) -> int:
+    return getattr(completion.usage, "total_tokens", 0) or 0
+
+def _cached_tokens(usage: Any) -> int:
+    """usage.prompt_tokens_details.cached_tokens (a plain dict on SDK versions without the field)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        return details.get("cached_tokens") or 0
+    return getattr(details, "cached_tokens", 0) or 0
+
+def _record(completion: Completion, model: str, started: float, stats: CallStats, outcome: HedgeOutcome) -> str:
+    """Record the usage of a completion and return its content."""
+    usage = completion.usage
+    record_llm_call(
+        model=model,
+        # Latency of the API itself; time spent queued is reported separately
+        latency_s=time.perf_counter() - started - stats.queue_wait_s,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        retries=stats.retries,
+        queue_wait_s=stats.queue_wait_s,
+        cached_tokens=_cached_tokens(usage),
+        hedged=outcome.hedged,
+        hedge_won=outcome.won,
+    )
+    return completion.content.strip()
+
+def chat_5_8_sentences(system: str, user: str, temperature: float = 0.2,
+                       use_cache: Optional[bool] = None, node: Optional[str] = None,
+                       schema: Optional[Type[BaseModel]] = None) -> str:
+    """Send a chat request, answering from the LLM cache when possible.
+    node selects the model route (defaults to the graph node currently running).
+    use_cache=False bypasses the cache; use_cache=True opts high-temperature calls in.
+    schema is the Pydantic model the response must follow (structured outputs)."""
+    started = time.perf_counter()
+    route, request, key, estimated_tokens = _prepare(system, user, temperature, use_cache, node, schema)
+    if key:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            record_llm_call(route.model, time.perf_counter() - started, cache_hit=True)
+            return cached
+    stats = CallStats()
+    node = node or current_node()
+    outcome = HedgeOutcome()
+    try:
+        completion = llm_scheduler.call(_attempt(request, node, estimated_tokens, outcome),
+                                        estimated_tokens, stats, tokens_used=_tokens_used)
+    except Exception:
+        record_llm_call(route.model, time.perf_counter() - started - stats.queue_wait_s, retries=stats.retries,
+                        queue_wait_s=stats.queue_wait_s, ok=False, hedged=outcome.hedged)
+        raise
+    content = _record(completion, route.model, started, stats, outcome)
+    if key:
+        llm_cache.set(key, content)
+    return content
+
+async def achat_5_8_sentences(system: str, user: str, temperature: float = 0.2,
+                              use_cache: Optional[bool] = None, node: Optional[str] = None,
+                              schema: Optional[Type[BaseModel]] = None) -> str:
+    """Async version of chat_5_8_sentences (AsyncOpenAI with the OpenAI provider)."""
+    started = time.perf_counter()
+    route, request, key, estimated_tokens = _prepare(system, user, temperature, use_cache, node, schema)
+    if key:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            record_llm_call(route.model, time.perf_counter() - started, cache_hit=True)
+            return cached
+    stats = CallStats()
+    node = node or current_node()
+    outcome = HedgeOutcome()
+    try:
+        completion = await llm_scheduler.acall(_aattempt(request, node, estimated_tokens, outcome),
+                                               estimated_tokens, stats, tokens_used=_tokens_used)
+    except Exception:
+        record_llm_call(route.model, time.perf_counter() - started - stats.queue_wait_s, retries=stats.retries,
+                        queue_wait_s=stats.queue_wait_s, ok=False, hedged=outcome.hedged)
+        raise
+    content = _record(completion, route.model, started, stats, outcome)
+    if key:
+        llm_cache.set(key, content)
+    return content
@@ -0,0 +1,170 @@
+"""
+PIPELINE PROGRESS STREAMING SERVICE
+---------------------------------
+This file lets a pipeline run report its progress while it is still running.
+It provides:
+
+1. ProgressStream - a per-request event queue that can be fed from the event loop
+   or from worker threads and is read back as Server-Sent Events
+2. attach() - makes a stream the destination for every event emitted by the
+   current run (a context variable, so graph nodes and their LLM calls see it)
+3. track_node() - wraps a graph node to emit node_start and node_end events; the
+   node_end event carries the fields the node produced and its metrics
+4. partial_listener() - used by the OpenAI service while a completion streams in;
+   it parses the JSON incrementally and emits a partial event whenever a field or
+   a list item (an agenda bullet, a task, ...) is complete
+
+Without an attached stream every function here is a no-op, so the CLI and the
+blocking endpoint run exactly as before.
+"""
+
+import asyncio
+import functools
+import inspect
+import itertools
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from backend.src.utils.compaction import expand_aliases
+from backend.src.utils.json_utils import IncrementalJSONParser
+
+# Fields of the meeting state that are shown to users
+PUBLIC_FIELDS = ("title", "executive_summary", "agenda", "decisions", "participants", "tasks", "minutes_md")
+
+_CLOSED = object()
+
+class ProgressStream:
+    """Events of one pipeline run, consumed as an SSE response."""
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._call_ids = itertools.count(1)
+        self.started = time.perf_counter()
+        self.first_partial_s: Optional[float] = None
+
+    def next_call_id(self) -> int:
+        return next(self._call_ids)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Queue an event; safe to call from any thread."""
+        event = {**event, "elapsedS": round(time.perf_counter() - self.started, 3)}
+        if event["type"] == "partial" and self.first_partial_s is None:
+            self.first_partial_s = event["elapsedS"]
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, _CLOSED)
+
+    async def sse(self, keepalive_s: float = 15.0) -> AsyncIterator[str]:
+        """Yield the events as Server-Sent Events until the stream is closed."""
+        while True:
+            try:
+                event = await asyncio.wait_for(self._queue.get(), keepalive_s)
+            except asyncio.TimeoutError:
+                # Comment line, keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            if event is _CLOSED:
+                return
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=_jsonable)}\n\n"
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+_stream: ContextVar[Optional[ProgressStream]] = ContextVar("progress_stream", default=None)
+# Speaker aliases of the running node, so partial results show real names
+_aliases: ContextVar[Dict[str, str]] = ContextVar("progress_aliases", default={})
+
+@contextmanager
+def attach(stream: ProgressStream):
+    """Send the events of the current run to stream."""
+    token = _stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _stream.reset(token)
+
+def streaming() -> bool:
+    """True if the current run is being streamed to a client."""
+    return _stream.get() is not None
+
+def emit(event: Dict[str, Any]) -> None:
+    stream = _stream.get()
+    if stream is not None:
+        stream.emit(event)
+
+def _public(update: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: v for k, v in (update or {}).items() if k in PUBLIC_FIELDS}
+
+def track_node(name: str, func: Callable) -> Callable:
+    """Wrap a graph node to emit node_start and node_end (or node_error) events."""
+    def start(state) -> Any:
+        emit({"type": "node_start", "node": name})
+        return _aliases.set(getattr(state, "speaker_aliases", None) or {})
+
+    def finish(token, update: Optional[Dict[str, Any]]) -> None:
+        _aliases.reset(token)
+        node_metrics = (update or {}).get("node_metrics") or [{}]
+        emit({"type": "node_end", "node": name, "fields": _public(update),
+              "wallTimeS": node_metrics[0].get("wall_time_s")})
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, *args, **kwargs):
+            token = start(state)
+            try:
+                update = await func(state, *args, **kwargs)
+            except Exception as e:
+                _aliases.reset(token)
+                emit({"type": "node_error", "node": name, "message": str(e)})
+                raise
+            finish(token, update)
+            return update
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, *args, **kwargs):
+        token = start(state)
+        try:
+            update = func(state, *args, **kwargs)
+        except Exception as e:
+            _aliases.reset(token)
+            emit({"type": "node_error", "node": name, "message": str(e)})
+            raise
+        finish(token, update)
+        return update
+    return wrapper
+
+class PartialListener:
+    """Feeds streamed completion text to an IncrementalJSONParser and emits the
+    public fields whose value changed."""
+
+    def __init__(self, stream: ProgressStream, node: Optional[str]):
+        self._stream = stream
+        self._node = node
+        self._call_id = stream.next_call_id()
+        self._parser = IncrementalJSONParser()
+        self._sent: Dict[str, Any] = {}
+        self._aliases = _aliases.get()
+
+    def feed(self, delta: str) -> None:
+        value = self._parser.feed(delta)
+        if value is None:
+            return
+        for field, current in _public(value).items():
+            if self._sent.get(field) == current:
+                continue
+            self._sent[field] = current
+            self._stream.emit({"type": "partial", "node": self._node, "call": self._call_id,
+                               "field": field, "value": expand_aliases(current, self._aliases)})
+
+def partial_listener(node: Optional[str]) -> Optional[PartialListener]:
+    """A listener for one streamed completion, or None if the run is not streamed."""
+    stream = _stream.get()
+    return PartialListener(stream, node) if stream is not None else None
@@ -0,0 +1,402 @@
+"""
+LLM REQUEST SCHEDULER
+--------------------
+This file keeps OpenAI traffic inside the account's rate limits.
+Every LLM call (sync or async) goes through the shared llm_scheduler, which:
+
+1. Waits for a request token and for enough tokens-per-minute budget in two
+   token buckets sized from LLM_RPM_LIMIT and LLM_TPM_LIMIT; the token estimate
+   is settled against resp.usage once the call returns
+2. Holds an adaptive concurrency slot: the limit grows by one per window of
+   successful calls and halves on a 429 (AIMD), so bursts back off quickly and
+   recover towards the account limit
+3. Retries transient errors with jittered exponential backoff, honoring the
+   Retry-After header; a 429 also pauses new requests until Retry-After has passed
+4. Reports the time each call spent queued, plus the current limit and bucket
+   levels, to the metrics endpoint
+5. Never waits past the run's deadline (see deadline_service): an admission
+   delay, concurrency slot or retry backoff that would end after it raises
+   DeadlineExceeded instead; an async call cancelled while it waits or runs
+   gives back its slot and token reservation
+6. Admits hedged duplicate requests (see hedging) only when a slot and budget are
+   free right now, so they never wait behind or crowd out regular calls
+
+Waiting is done with time.sleep() for threads and asyncio.sleep() (or a future
+woken by the releasing caller) for coroutines, so one scheduler serves both the
+CLI's thread pool and the API's event loop.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Type
+
+from backend.src.config.settings import settings, logger
+from backend.src.services import deadline_service
+
+@dataclass
+class CallStats:
+    """Filled in by the scheduler for one call, on success and on failure."""
+    retries: int = 0
+    queue_wait_s: float = 0.0
+    rate_limited: int = 0
+
+class TokenBucket:
+    """A per-minute budget that refills continuously.
+
+    reserve() always succeeds: it takes the amount (the level may go negative)
+    and returns how long the caller must wait before the reservation is covered.
+    This keeps waiters in arrival order without a queue.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        if self.capacity <= 0:
+            return 0.0
+        # A single request larger than the bucket can never be covered; cap it
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.level -= amount
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def try_reserve(self, amount: float) -> bool:
+        """Take the amount only if the bucket covers it now."""
+        if self.capacity <= 0:
+            return True
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.level < amount:
+                return False
+            self.level -= amount
+            return True
+
+    def refund(self, amount: float) -> None:
+        """Return (or, if negative, take) tokens after the real usage is known."""
+        if self.capacity <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.level = min(self.capacity, self.level + amount)
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int, cooldown_s: float = 5.0):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown_s = cooldown_s
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def _try_acquire(self) -> bool:
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def _wake(self) -> None:
+        """Wake every waiter (called with the lock held); they re-check the limit."""
+        self._cond.notify_all()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            return self._try_acquire()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot; False if none became free within timeout seconds."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._try_acquire():
+                if end is None:
+                    self._cond.wait()
+                    continue
+                left = end - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    async def aacquire(self, timeout: Optional[float] = None) -> bool:
+        """Async version of acquire()."""
+        loop = asyncio.get_running_loop()
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._try_acquire():
+                    return True
+                if end is not None and time.monotonic() >= end:
+                    return False
+                future = loop.create_future()
+                self._async_waiters.append((loop, future))
+            try:
+                await asyncio.wait_for(future, None if end is None else end - time.monotonic())
+            except asyncio.TimeoutError:
+                pass
+
+    def release(self, success: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if success and self.limit < self.maximum:
+                # +1 per "window" of limit successful calls
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._wake()
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            # Only halve once per cooldown, since one burst produces many 429s at once
+            if now - self._last_decrease >= self.cooldown_s:
+                self.limit = max(float(self.minimum), self.limit / 2)
+                self._last_decrease = now
+                logger.warning(f"Rate limited: LLM concurrency reduced to {int(self.limit)}")
+
+def _is_rate_limit(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by the Retry-After (or retry-after-ms) header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+class LLMScheduler:
+    """Shared admission control, retries and backoff for every LLM call."""
+
+    def __init__(self, rpm: float, tpm: float, max_concurrency: int, min_concurrency: int = 1,
+                 max_retries: int = 4, backoff_base_s: float = 0.5, backoff_max_s: float = 30.0,
+                 retryable: Tuple[Type[BaseException], ...] = ()):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AIMDLimiter(max_concurrency, min_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.retryable = retryable
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self.calls = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    def backoff(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)))
+        retry_after = _retry_after(error) if error is not None else None
+        return max(delay, retry_after or 0.0)
+
+    def _admission_delay(self, estimated_tokens: int) -> float:
+        """Reserve budget for one request and return how long to wait before sending it."""
+        wait = max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+        with self._lock:
+            return max(wait, self._paused_until - time.monotonic())
+
+    def _check_wait(self, delay: float, estimated_tokens: int) -> None:
+        """Give back the reservation and raise DeadlineExceeded if the wait would end past the deadline."""
+        try:
+            deadline_service.check_wait(delay)
+        except deadline_service.DeadlineExceeded:
+            self.requests.refund(1)
+            self.tokens.refund(estimated_tokens)
+            raise
+
+    def _record_wait(self, wait_s: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self._waits.append(wait_s)
+
+    def _on_error(self, error: Exception, attempt: int, stats: CallStats) -> float:
+        """Classify a failed attempt; return the backoff delay, or re-raise if it should not be retried."""
+        if not isinstance(error, self.retryable) or attempt >= self.max_retries:
+            with self._lock:
+                self.failures += 1
+            raise error
+        delay = self.backoff(attempt, error)
+        if _is_rate_limit(error):
+            stats.rate_limited += 1
+            self.concurrency.on_rate_limited()
+            with self._lock:
+                self.rate_limited += 1
+                # Everyone waits out Retry-After, not just the caller that hit it
+                self._paused_until = max(self._paused_until, time.monotonic() + (_retry_after(error) or 0.0))
+        logger.warning(f"LLM call failed ({type(error).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+        return delay
+
+    def _settle(self, estimated_tokens: int, result: Any, tokens_used: Optional[Callable[[Any], int]]) -> None:
+        used = tokens_used(result) if tokens_used is not None else 0
+        # Without usage data the estimate stands
+        if used:
+            self.tokens.refund(estimated_tokens - used)
+
+    def try_admit(self, estimated_tokens: int,
+                  tokens_used: Optional[Callable[[Any], int]] = None) -> Optional[Callable[[bool, Any], None]]:
+        """Admit one extra request only if a concurrency slot and budget are free now.
+
+        Returns the callback releasing them, called with (success, result) when the
+        request finishes, or None when the request must not be sent. The token
+        reservation is settled against result, or refunded when it is None.
+        """
+        with self._lock:
+            if time.monotonic() < self._paused_until:
+                return None
+        if not self.concurrency.try_acquire():
+            return None
+        if not self.requests.try_reserve(1):
+            self.concurrency.release(success=False)
+            return None
+        if not self.tokens.try_reserve(estimated_tokens):
+            self.requests.refund(1)
+            self.concurrency.release(success=False)
+            return None
+        self._record_wait(0.0)
+
+        def release(success: bool, result: Any) -> None:
+            self.concurrency.release(success)
+            if result is not None:
+                self._settle(estimated_tokens, result, tokens_used)
+            else:
+                self.tokens.refund(estimated_tokens)
+        return release
+
+    def call(self, fn: Callable[[], Any], estimated_tokens: int, stats: CallStats,
+             tokens_used: Optional[Callable[[Any], int]] = None) -> Any:
+        """Run fn() under the rate limits, retrying transient errors."""
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            delay = self._admission_delay(estimated_tokens)
+            if delay > 0:
+                self._check_wait(delay, estimated_tokens)
+                time.sleep(delay)
+            if not self.concurrency.acquire(timeout=deadline_service.remaining()):
+                self.requests.refund(1)
+                self.tokens.refund(estimated_tokens)
+                raise deadline_service.DeadlineExceeded("Deadline exceeded waiting for an LLM concurrency slot")
+            wait_s = time.perf_counter() - queued
+            stats.queue_wait_s += wait_s
+            self._record_wait(wait_s)
+            try:
+                result = fn()
+            except Exception as e:
+                self.concurrency.release(success=False)
+                self.tokens.refund(estimated_tokens)
+                delay = self._on_error(e, attempt, stats)
+                deadline_service.check_wait(delay)
+                time.sleep(delay)
+                attempt += 1
+                stats.retries = attempt
+                continue
+            self.concurrency.release(success=True)
+            self._settle(estimated_tokens, result, tokens_used)
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], estimated_tokens: int, stats: CallStats,
+                    tokens_used: Optional[Callable[[Any], int]] = None) -> Any:
+        """Async version of call(); a cancelled call gives back its slot and token reservation."""
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            delay = self._admission_delay(estimated_tokens)
+            if delay > 0:
+                self._check_wait(delay, estimated_tokens)
+            acquired = succeeded = False
+            error: Optional[Exception] = None
+            try:
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                acquired = await self.concurrency.aacquire(timeout=deadline_service.remaining())
+                if not acquired:
+                    self.requests.refund(1)
+                    self.tokens.refund(estimated_tokens)
+                    raise deadline_service.DeadlineExceeded("Deadline exceeded waiting for an LLM concurrency slot")
+                wait_s = time.perf_counter() - queued
+                stats.queue_wait_s += wait_s
+                self._record_wait(wait_s)
+                try:
+                    result = await fn()
+                    succeeded = True
+                except Exception as e:
+                    error = e
+            except asyncio.CancelledError:
+                # E.g. a node cancelled at its deadline; the request was not sent if no slot was held
+                if not acquired:
+                    self.requests.refund(1)
+                self.tokens.refund(estimated_tokens)
+                raise
+            finally:
+                if acquired:
+                    self.concurrency.release(success=succeeded)
+            if succeeded:
+                self._settle(estimated_tokens, result, tokens_used)
+                return result
+            self.tokens.refund(estimated_tokens)
+            delay = self._on_error(error, attempt, stats)
+            deadline_service.check_wait(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            stats.retries = attempt
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limits and queue wait percentiles."""
+        with self._lock:
+            waits: List[float] = sorted(self._waits)
+            calls, rate_limited, failures = self.calls, self.rate_limited, self.failures
+
+        def pct(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q / 100 * len(waits)))], 4) if waits else 0.0
+
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level, 1),
+            "attempts": calls,
+            "rate_limited": rate_limited,
+            "failures": failures,
+            "queue_wait_p50_s": pct(50),
+            "queue_wait_p95_s": pct(95),
+            "queue_wait_max_s": round(waits[-1], 4) if waits else 0.0,
+        }
+
+def create_llm_scheduler(retryable: Tuple[Type[BaseException], ...]) -> LLMScheduler:
+    """Create the scheduler configured by the LLM_* rate limit settings."""
+    return LLMScheduler(
+        rpm=settings.llm_rpm_limit,
+        tpm=settings.llm_tpm_limit,
+        max_concurrency=settings.llm_max_concurrency,
+        min_concurrency=settings.llm_min_concurrency,
+        max_retries=settings.llm_max_retries,
+        backoff_base_s=settings.llm_backoff_base_seconds,
+        backoff_max_s=settings.llm_backoff_max_seconds,
+        retryable=retryable,
+    )
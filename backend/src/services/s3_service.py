@@ -32,39 +32,70 @@ class S3Service:
         self.bucket_raw = settings.s3_bucket_raw
         self.bucket_processed = settings.s3_bucket_processed
 
-    def list_transcripts(self):
-        """List all transcript files in the raw bucket"""
+    def list_transcript_objects(self, prefix=None):
+        """List the transcript objects in the raw bucket (Key, Size, LastModified), optionally under a prefix"""
         try:
             logger.info(f"Listing all transcripts in bucket: {self.bucket_raw}")
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket_raw)
-            if 'Contents' in response:
-                # Filter for only transcript files (typically .txt files)
-                transcript_files = []
-                for item in response['Contents']:
-                    key = item['Key']
+            params = {'Bucket': self.bucket_raw}
+            if prefix:
+                params['Prefix'] = prefix
+            # A listing returns at most 1000 keys, so follow the continuation tokens
+            transcript_objects = []
+            for page in self.s3_client.get_paginator('list_objects_v2').paginate(**params):
+                for item in page.get('Contents', []):
                     # Only include files that are likely transcripts (.txt, .md, .docx)
-                    if key.lower().endswith(('.txt', '.md', '.docx')):
-                        transcript_files.append(key)
-                        logger.info(f"Found transcript: {key}")
-                logger.info(f"Total transcripts found: {len(transcript_files)}")
-                return transcript_files
-            logger.warning(f"No contents found in bucket: {self.bucket_raw}")
-            return []
+                    if item['Key'].lower().endswith(('.txt', '.md', '.docx')):
+                        transcript_objects.append(item)
+                        logger.debug(f"Found transcript: {item['Key']}")
+            if not transcript_objects:
+                logger.warning(f"No transcripts found in bucket: {self.bucket_raw}")
+                return []
+            logger.info(f"Total transcripts found: {len(transcript_objects)}")
+            return transcript_objects
         except ClientError as e:
             logger.error(f"Error listing objects in bucket {self.bucket_raw}: {e}")
             return []
     
+    def list_transcripts(self, prefix=None):
+        """List all transcript files in the raw bucket, optionally under a prefix"""
+        return [item['Key'] for item in self.list_transcript_objects(prefix)]
+    
+    def list_transcript_page(self, limit, start_after=None, prefix=None):
+        """List up to `limit` transcript objects after the key start_after, in key order.
+        Returns (objects, has_more); only as many keys as the page needs are listed."""
+        params = {'Bucket': self.bucket_raw}
+        if prefix:
+            params['Prefix'] = prefix
+        if start_after:
+            params['StartAfter'] = start_after
+        transcript_objects = []
+        try:
+            # One extra object tells whether there is a next page
+            while True:
+                response = self.s3_client.list_objects_v2(**params, MaxKeys=min(1000, limit + 1))
+                for item in response.get('Contents', []):
+                    if item['Key'].lower().endswith(('.txt', '.md', '.docx')):
+                        transcript_objects.append(item)
+                if len(transcript_objects) > limit or not response.get('IsTruncated'):
+                    break
+                params.pop('StartAfter', None)
+                params['ContinuationToken'] = response['NextContinuationToken']
+        except ClientError as e:
+            logger.error(f"Error listing objects in bucket {self.bucket_raw}: {e}")
+            return [], False
+        return transcript_objects[:limit], len(transcript_objects) > limit
+    
     def list_processed_files(self, prefix=None):
         """List all files in the processed bucket, optionally with a prefix"""
         try:
             params = {'Bucket': self.bucket_processed}
             if prefix:
                 params['Prefix'] = prefix
-                
-            response = self.s3_client.list_objects_v2(**params)
-            if 'Contents' in response:
-                return [item['Key'] for item in response['Contents']]
-            return []
+            
+            keys = []
+            for page in self.s3_client.get_paginator('list_objects_v2').paginate(**params):
+                keys.extend(item['Key'] for item in page.get('Contents', []))
+            return keys
         except ClientError as e:
             logger.error(f"Error listing objects in bucket {self.bucket_processed}: {e}")
             return []
@@ -332,6 +363,30 @@ class S3Service:
             logger.error(f"Error getting file {key}: {e}")
             return None
     
+    def get_processed_file_with_etag(self, key):
+        """Content and ETag of a file in the processed bucket, or None if it does not exist.
+        Other errors are raised, so callers can tell a failed read from a missing file."""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_processed, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return response['Body'].read().decode('utf-8'), response['ETag']
+
+    def save_processed_file_if_match(self, key, content, etag=None):
+        """Write a file to the processed bucket only if it still has this ETag (None: only
+        if it does not exist yet). Returns False when another writer changed it first."""
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            self.s3_client.put_object(Bucket=self.bucket_processed, Key=key, Body=content, **condition)
+            return True
+        except ClientError as e:
+            # 412 when the ETag no longer matches, 409 when a concurrent write to the key won
+            if e.response.get("Error", {}).get("Code") in ("PreconditionFailed", "ConditionalRequestConflict"):
+                return False
+            raise
+
     def get_object(self, key):
         """Get an S3 object and return it (backward compatibility)"""
         return self.get_file(key)
@@ -358,25 +413,19 @@ class S3Service:
             processed_objects = []
             raw_objects = []
             
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            
             # Get objects from processed bucket
             try:
-                response = self.s3_client.list_objects_v2(
-                    Bucket=self.bucket_processed,
-                    Prefix=prefix
-                )
-                if 'Contents' in response:
-                    processed_objects = [item['Key'] for item in response['Contents']]
+                for page in paginator.paginate(Bucket=self.bucket_processed, Prefix=prefix):
+                    processed_objects.extend(item['Key'] for item in page.get('Contents', []))
             except ClientError as e:
                 logger.error(f"Error listing objects in bucket {self.bucket_processed}: {e}")
             
             # Get objects from raw bucket
             try:
-                response = self.s3_client.list_objects_v2(
-                    Bucket=self.bucket_raw,
-                    Prefix=prefix
-                )
-                if 'Contents' in response:
-                    raw_objects = [item['Key'] for item in response['Contents']]
+                for page in paginator.paginate(Bucket=self.bucket_raw, Prefix=prefix):
+                    raw_objects.extend(item['Key'] for item in page.get('Contents', []))
             except ClientError as e:
                 logger.error(f"Error listing objects in bucket {self.bucket_raw}: {e}")
             
@@ -0,0 +1,264 @@
+"""
+SINGLE-FLIGHT GENERATION
+-----------------------
+This file makes sure a transcript is processed by one pipeline run at a time,
+so concurrent generate requests for it do not pay for the LLM calls twice or
+leave two meetings for one source.
+It implements:
+
+1. SingleFlight.run() - in-process coalescing: the first request for a key (the
+   leader) runs the work, and requests arriving while it runs (followers) await
+   the leader's result, or its error, instead of running it again
+2. LeaseBackend - a lease per key across API workers and containers, taken by a
+   conditional write: it is granted when the key is free, expired, or already
+   held by the same owner
+3. SQLiteLeases - the local stand-in (a SQLite file shared by the workers of one
+   host); DynamoDBLeases - a conditional PutItem on a table keyed by lease_key,
+   whose expires_at is the table's TTL attribute (provisioned as the leases table
+   in infra/dynamodb-infra)
+4. create_single_flight() - builds it from the LEASE_* settings
+
+A leader that finds the lease taken waits for it (up to LEASE_WAIT_SECONDS)
+and then runs the work itself, which finds the other worker's result through the
+fresh "already processed" check. The lease lasts LEASE_TTL_SECONDS and is renewed
+while the work runs, so a crashed worker's lease expires quickly. Lease storage
+errors are logged and the work runs without the lease.
+"""
+
+import asyncio
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from backend.src.config.settings import settings, logger
+from backend.src.utils.paths import OUTPUTS_DIR
+
+class LeaseTimeout(TimeoutError):
+    """Another worker held the lease for longer than we may wait."""
+
+class LeaseBackend:
+    """Interface for lease storage; times are time.time() seconds."""
+
+    def acquire(self, key: str, owner: str, ttl_seconds: float, now: float) -> bool:
+        raise NotImplementedError
+
+    def renew(self, key: str, owner: str, ttl_seconds: float, now: float) -> bool:
+        raise NotImplementedError
+
+    def release(self, key: str, owner: str) -> None:
+        raise NotImplementedError
+
+class SQLiteLeases(LeaseBackend):
+    """Leases in a local SQLite file, taken by a conditional upsert."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "lease_key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def acquire(self, key: str, owner: str, ttl_seconds: float, now: float) -> bool:
+        with self._lock:
+            granted = self._conn.execute(
+                "INSERT INTO leases (lease_key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (lease_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                (key, owner, now + ttl_seconds, now),
+            ).rowcount == 1
+            self._conn.commit()
+        return granted
+
+    def renew(self, key: str, owner: str, ttl_seconds: float, now: float) -> bool:
+        with self._lock:
+            renewed = self._conn.execute("UPDATE leases SET expires_at = ? WHERE lease_key = ? AND owner = ?",
+                                         (now + ttl_seconds, key, owner)).rowcount == 1
+            self._conn.commit()
+        return renewed
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE lease_key = ? AND owner = ?", (key, owner))
+            self._conn.commit()
+
+class DynamoDBLeases(LeaseBackend):
+    """Leases in a DynamoDB table keyed by lease_key, taken by a conditional PutItem."""
+
+    def __init__(self, table_name: str):
+        dynamodb = boto3.resource(
+            'dynamodb',
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+            region_name=settings.aws_region
+        )
+        self.table = dynamodb.Table(table_name)
+
+    @staticmethod
+    def _conditional(call: Callable[[], Any]) -> bool:
+        try:
+            call()
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    def acquire(self, key: str, owner: str, ttl_seconds: float, now: float) -> bool:
+        return self._conditional(lambda: self.table.put_item(
+            Item={"lease_key": key, "owner": owner, "expires_at": int(now + ttl_seconds)},
+            ConditionExpression="attribute_not_exists(lease_key) OR expires_at < :now OR #o = :owner",
+            ExpressionAttributeNames={"#o": "owner"},
+            ExpressionAttributeValues={":now": int(now), ":owner": owner},
+        ))
+
+    def renew(self, key: str, owner: str, ttl_seconds: float, now: float) -> bool:
+        return self._conditional(lambda: self.table.update_item(
+            Key={"lease_key": key},
+            UpdateExpression="SET expires_at = :expires",
+            ConditionExpression="#o = :owner",
+            ExpressionAttributeNames={"#o": "owner"},
+            ExpressionAttributeValues={":expires": int(now + ttl_seconds), ":owner": owner},
+        ))
+
+    def release(self, key: str, owner: str) -> None:
+        self._conditional(lambda: self.table.delete_item(
+            Key={"lease_key": key},
+            ConditionExpression="#o = :owner",
+            ExpressionAttributeNames={"#o": "owner"},
+            ExpressionAttributeValues={":owner": owner},
+        ))
+
+class SingleFlight:
+    """Runs the work for a key once at a time: within the process by sharing the
+    leader's result, across processes through the lease backend."""
+
+    def __init__(self, leases: Optional[LeaseBackend], ttl_seconds: float = 120.0,
+                 wait_seconds: float = 600.0, poll_seconds: float = 1.0):
+        self.leases = leases
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.lease_waits = 0
+        self.lease_wait_s = 0.0
+        self.lease_timeouts = 0
+        self.lease_errors = 0
+
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run work() for the key, or await the run already in flight; returns (result, shared)."""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            logger.info(f"Single-flight: joining the run in flight for {key}")
+            # Shielded, so a follower that goes away does not cancel the leader
+            return await asyncio.shield(flight), True
+
+        flight = asyncio.get_running_loop().create_future()
+        # Followers retrieve the error; this keeps an unshared one from being reported as never retrieved
+        flight.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._flights[key] = flight
+        self.leaders += 1
+        try:
+            async with self._lease(key):
+                result = await work()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result, False
+        finally:
+            self._flights.pop(key, None)
+
+    async def _call(self, method: str, *args) -> Optional[bool]:
+        """Call the lease backend; None if it failed (the caller then goes without the lease)."""
+        try:
+            return await asyncio.to_thread(getattr(self.leases, method), *args)
+        except Exception as e:
+            self.lease_errors += 1
+            logger.warning(f"Lease {method} failed: {e}")
+            return None
+
+    @asynccontextmanager
+    async def _lease(self, key: str):
+        if self.leases is None:
+            yield
+            return
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        started = time.monotonic()
+        while True:
+            granted = await self._call("acquire", key, owner, self.ttl_seconds, time.time())
+            if granted is None:
+                yield
+                return
+            if granted:
+                break
+            if time.monotonic() - started > self.wait_seconds:
+                self.lease_timeouts += 1
+                raise LeaseTimeout(f"{key} is still being processed by another worker")
+            await asyncio.sleep(self.poll_seconds)
+        waited = time.monotonic() - started
+        if waited >= self.poll_seconds:
+            self.lease_waits += 1
+            self.lease_wait_s += waited
+            logger.info(f"Single-flight: waited {waited:.1f}s for another worker's lease on {key}")
+
+        heartbeat = asyncio.create_task(self._renew(key, owner))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await self._call("release", key, owner)
+
+    async def _renew(self, key: str, owner: str) -> None:
+        while True:
+            await asyncio.sleep(self.ttl_seconds / 3)
+            if await self._call("renew", key, owner, self.ttl_seconds, time.time()) is False:
+                logger.warning(f"Lost the lease on {key}; another worker may process it too")
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.leases).__name__ if self.leases else None,
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "lease_waits": self.lease_waits,
+            "lease_wait_s": round(self.lease_wait_s, 3),
+            "lease_timeouts": self.lease_timeouts,
+            "lease_errors": self.lease_errors,
+        }
+
+def create_single_flight() -> SingleFlight:
+    """Create the single-flight guard configured by the LEASE_* settings."""
+    backend_name = settings.lease_backend
+    leases: Optional[LeaseBackend] = None
+    if backend_name == "sqlite":
+        leases = SQLiteLeases(settings.lease_path or str(OUTPUTS_DIR / "leases.sqlite3"))
+    elif backend_name == "dynamodb":
+        leases = DynamoDBLeases(settings.dynamodb_table_leases)
+    elif backend_name not in ("none", ""):
+        logger.warning(f"Unknown LEASE_BACKEND '{backend_name}', leases disabled")
+    return SingleFlight(leases, settings.lease_ttl_seconds, settings.lease_wait_seconds, settings.lease_poll_seconds)
+
+single_flight = create_single_flight()
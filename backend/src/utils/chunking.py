@@ -0,0 +1,133 @@
+"""
+TRANSCRIPT CHUNKING UTILITIES
+---------------------------
+This file splits long transcripts into windows that fit a token budget.
+It provides:
+
+1. estimate_tokens() - a cheap token estimate (about 4 characters per token)
+2. split_speaker_turns() - the raw text of each turn found by the transcript parser
+3. chunk_transcript() - packs consecutive turns into token-budgeted chunks,
+   only cutting inside a turn when a single turn is larger than the budget;
+   turns that were already parsed can be passed in to avoid a second parse
+4. content_defined_chunks() - like chunk_transcript(), but the cut points are chosen
+   by a hash of the turns rather than by filling each chunk, so editing a few
+   lines only changes the chunks around the edit (used for incremental
+   re-processing)
+5. sample_transcript() - an evenly spread excerpt of the chunks for prompts that
+   need an overview of the whole meeting rather than every word
+
+Chunks always end on speaker-turn boundaries, so each one can be sent to the
+extraction nodes independently and the partial results merged afterwards.
+"""
+
+import hashlib
+from typing import List, Optional
+
+from backend.src.utils.transcript_parser import Turn, parse_transcript
+
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_speaker_turns(text: str) -> List[str]:
+    """Split a transcript into the raw text of its speaker turns.
+    Text before the first speaker line becomes its own turn."""
+    return [turn.text for turn in parse_transcript(text).turns]
+
+def _split_oversized(turn: str, max_chars: int) -> List[str]:
+    """Split a single turn that is larger than the budget on sentence or word boundaries."""
+    pieces: List[str] = []
+    remaining = turn
+    while len(remaining) > max_chars:
+        window = remaining[:max_chars]
+        cut = max(window.rfind(". "), window.rfind("? "), window.rfind("! "))
+        if cut < max_chars // 2:
+            cut = window.rfind(" ")
+        if cut <= 0:
+            cut = max_chars - 1
+        pieces.append(remaining[:cut + 1].strip())
+        remaining = remaining[cut + 1:].strip()
+    if remaining:
+        pieces.append(remaining)
+    return pieces
+
+def chunk_transcript(text: str, max_tokens: int, turns: Optional[List[Turn]] = None) -> List[str]:
+    """Pack speaker turns into chunks of at most max_tokens (estimated)."""
+    if not text:
+        return []
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    turn_texts = [turn.text for turn in turns] if turns is not None else split_speaker_turns(text)
+    for turn in turn_texts:
+        for piece in _split_oversized(turn, max_chars):
+            # +2 accounts for the blank line used to join turns
+            if current and current_len + len(piece) + 2 > max_chars:
+                chunks.append("\n\n".join(current))
+                current, current_len = [], 0
+            current.append(piece)
+            current_len += len(piece) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def _turn_hash(text: str) -> int:
+    normalized = " ".join(text.split()).casefold()
+    return int.from_bytes(hashlib.sha1(normalized.encode("utf-8")).digest()[:4], "big")
+
+def content_defined_chunks(text: str, target_tokens: int, max_tokens: int,
+                           turns: Optional[List[Turn]] = None) -> List[str]:
+    """Split on turn boundaries where a turn's hash hits 1 in (turns per target chunk).
+
+    Chunks are at least half the target and never above max_tokens. A cut depends
+    only on the turns around it, so an edit moves at most the neighbouring cuts.
+    """
+    if not text:
+        return []
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    min_chars = target_tokens * CHARS_PER_TOKEN // 2
+    turn_texts = [turn.text for turn in turns] if turns is not None else split_speaker_turns(text)
+    pieces = [piece for turn in turn_texts for piece in _split_oversized(turn, max_chars)]
+    if not pieces:
+        return [text]
+    # Cut after about one in `divisor` turns, so chunks average about target_tokens
+    average_chars = max(1, sum(len(p) + 2 for p in pieces) // len(pieces))
+    divisor = max(1, (target_tokens * CHARS_PER_TOKEN) // average_chars)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 2
+        if current_len >= min_chars and _turn_hash(piece) % divisor == 0:
+            chunks.append("\n\n".join(current))
+            current, current_len = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def sample_transcript(chunks: List[str], max_tokens: int) -> str:
+    """Return an excerpt of at most max_tokens drawn evenly from every chunk."""
+    if not chunks:
+        return ""
+    if len(chunks) == 1 or sum(estimate_tokens(c) for c in chunks) <= max_tokens:
+        return "\n\n".join(chunks)
+    per_chunk_chars = max(1, (max_tokens * CHARS_PER_TOKEN) // len(chunks))
+    excerpts = []
+    for chunk in chunks:
+        excerpt = chunk[:per_chunk_chars]
+        # Avoid ending the excerpt in the middle of a word
+        if len(chunk) > per_chunk_chars and " " in excerpt:
+            excerpt = excerpt[:excerpt.rfind(" ")]
+        excerpts.append(excerpt.strip() + " [...]")
+    return "\n\n".join(excerpts)
@@ -0,0 +1,145 @@
+"""
+TRANSCRIPT COMPACTION
+--------------------
+This file shrinks a transcript before it is sent to the LLM.
+It provides:
+
+1. strip_filler() - removes filler words ("um", "uh", "you know", ", like,")
+2. is_pleasantry() - detects greeting and sign-off sentences ("Hi team", "Thanks all")
+3. make_aliases() - maps speaker names to short aliases (S1, S2, ...), choosing a
+   prefix that never occurs in the transcript so aliases cannot collide with real text
+4. compact_transcript() - rewrites the transcript as one "alias: utterance" line per
+   turn without filler, pleasantries or repeated whitespace, and reports the
+   compression ratio
+5. expand_aliases() - puts the real names back into extracted outputs
+
+Speaker names are also replaced where they are mentioned inside utterances, so
+the model sees one consistent identifier per person and owners in its output can
+be mapped back to full names.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List
+
+from backend.src.utils.chunking import estimate_tokens
+from backend.src.utils.transcript_parser import parse_transcript
+
+FILLER = re.compile(
+    r"(?:\b(?:um+|uh+|erm+|er|ah+|hmm+|mm+)\b[,.]?\s*"
+    r"|,?\s*\b(?:you know|i mean)\b,\s*"
+    r"|,\s*like,\s*)",
+    re.IGNORECASE,
+)
+
+PLEASANTRY = re.compile(
+    r"^(?:(?:hi|hello|hey|morning|good (?:morning|afternoon|evening))"
+    r"(?: (?:all|everyone|everybody|team|folks|guys|there))?"
+    r"|(?:thanks|thank you)(?: (?:all|everyone|everybody|team|so much))?"
+    r"(?: for (?:joining|coming|your time)(?: today| everyone)?)?"
+    r"|(?:bye|goodbye|cheers)(?: (?:all|everyone|everybody|team))?"
+    r"|see you(?: all| everyone)?(?: (?:next week|tomorrow|soon|then))?"
+    r"|talk (?:to you )?(?:all )?(?:soon|later)"
+    r"|have a (?:good|great|nice) (?:day|weekend|one|evening)"
+    r"|i'm (?:here|good to go)|i am here|great|perfect|sounds good"
+    r"|all|everyone|everybody|team|folks)$",
+    re.IGNORECASE,
+)
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+ALIAS_PREFIXES = ("S", "P", "SPK", "SPEAKER_")
+
+@dataclass
+class CompactTranscript:
+    """A compacted transcript and the alias table needed to read it back."""
+    text: str
+    aliases: Dict[str, str] = field(default_factory=dict)
+    original_tokens: int = 0
+    compact_tokens: int = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Compacted size as a fraction of the original (lower is better)."""
+        return round(self.compact_tokens / self.original_tokens, 3) if self.original_tokens else 1.0
+
+def strip_filler(text: str) -> str:
+    """Remove filler words and collapse the whitespace left behind."""
+    text = FILLER.sub(" ", text)
+    text = re.sub(r"\s+([,.!?])", r"\1", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def is_pleasantry(sentence: str, names: Collection[str] = ()) -> bool:
+    """True if every comma-separated clause of the sentence is a greeting, a sign-off
+    or one of the given names ("Thanks, Sarah!")."""
+    clauses = [c.strip(" .!?") for c in sentence.split(",")]
+    clauses = [c for c in clauses if c]
+    return (bool(clauses) and any(PLEASANTRY.match(c) for c in clauses)
+            and all(PLEASANTRY.match(c) or c in names for c in clauses))
+
+def make_aliases(speakers: List[str], text: str) -> Dict[str, str]:
+    """Map alias -> speaker name using the first prefix that does not occur in the text."""
+    for prefix in ALIAS_PREFIXES:
+        if not re.search(rf"\b{re.escape(prefix)}\d+\b", text):
+            break
+    else:
+        prefix = "SPEAKER_X"
+    return {f"{prefix}{i}": name for i, name in enumerate(speakers, 1)}
+
+def _mention_pattern(aliases: Dict[str, str]):
+    """Regex and lookup for speaker names (and unambiguous first names) in utterances."""
+    lookup: Dict[str, str] = {}
+    first_names: Dict[str, List[str]] = {}
+    for alias, name in aliases.items():
+        lookup[name] = alias
+        first = name.split()[0]
+        if first != name and len(first) > 2:
+            first_names.setdefault(first, []).append(alias)
+    for first, owners in first_names.items():
+        if len(owners) == 1 and first not in lookup:
+            lookup[first] = owners[0]
+    if not lookup:
+        return None, lookup
+    names = sorted(lookup, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(n) for n in names) + r")\b"), lookup
+
+def compact_transcript(text: str) -> CompactTranscript:
+    """Rewrite a transcript as compact "alias: utterance" lines."""
+    parsed = parse_transcript(text)
+    aliases = make_aliases(parsed.speakers, text)
+    by_name = {name: alias for alias, name in aliases.items()}
+    pattern, lookup = _mention_pattern(aliases)
+
+    lines: List[str] = []
+    for turn in parsed.turns:
+        sentences = [strip_filler(s) for s in SENTENCE_END.split(turn.utterance)]
+        kept = " ".join(s for s in sentences if s and not is_pleasantry(s, lookup))
+        if not kept:
+            continue
+        if pattern is not None:
+            kept = pattern.sub(lambda m: lookup[m.group(1)], kept)
+        # Section labels ("Agenda: ...") keep their prefix; header text has none
+        prefix = by_name[turn.speaker] if turn.speaker else turn.label
+        lines.append(f"{prefix}: {kept}" if prefix else kept)
+
+    compact = "\n".join(lines)
+    return CompactTranscript(compact, aliases, estimate_tokens(text), estimate_tokens(compact))
+
+def expand_aliases(value: Any, aliases: Dict[str, str]) -> Any:
+    """Replace aliases with speaker names in a string, list, dict or Pydantic model (recursively)."""
+    if not aliases:
+        return value
+    pattern = re.compile(r"\b(" + "|".join(re.escape(a) for a in sorted(aliases, key=len, reverse=True)) + r")\b")
+
+    def expand(item: Any) -> Any:
+        if isinstance(item, str):
+            return pattern.sub(lambda m: aliases[m.group(1)], item)
+        if isinstance(item, list):
+            return [expand(v) for v in item]
+        if isinstance(item, dict):
+            return {k: expand(v) for k, v in item.items()}
+        if hasattr(item, "model_dump") and hasattr(item, "model_copy"):
+            return item.model_copy(update=expand(item.model_dump()))
+        return item
+
+    return expand(value)
@@ -6,10 +6,27 @@ It contains:
 
 1. The robust_json_parse() function which:
    - Attempts to parse standard JSON text
-   - Falls back to regex extraction if standard parsing fails
+   - Falls back to extracting the first JSON object embedded in the text
    - Handles common formatting issues in AI-generated JSON
    - Returns empty objects rather than raising errors
-   
+2. The extract_json_object() and extract_json_objects() functions which:
+   - Scan the text once for balanced {...} blocks, skipping braces inside
+     strings (with escapes), so prose, markdown code fences or a second JSON
+     block around the object do not break the parse
+   - Give up on a block that is never closed (truncated output) instead of
+     returning an object nested in it
+   - Tolerate trailing commas and raw newlines inside strings
+   - Return the first valid top-level object, or all of them
+3. The IncrementalJSONParser class which:
+   - Is fed a streamed completion delta by delta
+   - Tracks the open strings, objects and arrays as the text arrives
+   - Returns the object parsed so far whenever a top-level field or a list item
+     is complete, so partial results can be shown before the response ends
+4. The strict_json_schema() and response_format() functions which:
+   - Turn a Pydantic model into the JSON schema of an OpenAI structured output
+     (every property required, no additional properties)
+   - Drop the keywords strict mode rejects; the model validation still checks them
+
 This utility makes the application more resilient when working with
 JSON data that might be imperfectly formatted, especially important
 when processing AI outputs that don't always produce perfect JSON.
@@ -17,18 +34,201 @@ when processing AI outputs that don't always produce perfect JSON.
 
 import json
 import re
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+CLOSERS = {"{": "}", "[": "]"}
+
+# Keywords that OpenAI strict structured outputs do not accept
+UNSUPPORTED_SCHEMA_KEYWORDS = ("default", "minLength", "maxLength", "pattern", "format", "minItems", "maxItems")
+
+# A complete JSON string (unrolled loop, so long strings match without backtracking),
+# or one of the characters that matter inside an object: braces and a lone quote
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}"]', re.S)
+# A trailing comma before a closing bracket, or a string to leave untouched
+_TRAILING_COMMA = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*")|,(\s*[}\]])', re.S)
 
 def robust_json_parse(text: str) -> Dict[str, Any]:
-    """Try strict JSON, else extract first {...} block."""
+    """Try strict JSON, else extract the first valid {...} object."""
     try:
         return json.loads(text)
     except Exception:
         pass
-    m = re.search(r"\{.*\}", text, flags=re.S)
-    if m:
+    return extract_json_object(text) or {}
+
+def _object_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of every balanced {...} block, found in a single pass.
+    Outside any block quotes are prose; inside, braces within strings are skipped.
+    The scan stops at the last "}" and at an unterminated string, since nothing
+    after either can close a block; a block left open there is dropped with the
+    blocks nested in it, so truncated output yields no partial object."""
+    spans: List[Tuple[int, int]] = []
+    end = text.rfind("}") + 1
+    pos = 0
+    while True:
+        start = text.find("{", pos, end)
+        if start < 0:
+            break
+        stack, nested = [start], len(spans)
+        for match in _TOKEN.finditer(text, start + 1, end):
+            index = match.start()
+            char = text[index]
+            if char == "{":
+                stack.append(index)
+            elif char == "}":
+                spans.append((stack.pop(), index + 1))
+                if not stack:
+                    break
+            elif match.end() - index == 1:
+                # Unterminated string
+                break
+        if stack:
+            # The block is never closed (truncated output): give it up with everything in it
+            del spans[nested:]
+            break
+        pos = spans[-1][1]
+    spans.sort()
+    return spans
+
+def _loads_object(candidate: str) -> Optional[Dict[str, Any]]:
+    for attempt in (candidate, None):
+        if attempt is None:
+            attempt = _TRAILING_COMMA.sub(lambda m: m.group(1) or m.group(2), candidate)
+            if attempt == candidate:
+                return None
+        try:
+            value = json.loads(attempt, strict=False)
+        except ValueError:
+            continue
+        return value if isinstance(value, dict) else None
+    return None
+
+def extract_json_objects(text: str, first_only: bool = False) -> List[Dict[str, Any]]:
+    """Every valid top-level JSON object in text, in order.
+    When a block is not valid JSON, the objects nested in it are tried instead."""
+    objects: List[Dict[str, Any]] = []
+    if not text:
+        return objects
+    consumed = -1
+    for start, end in _object_spans(text):
+        if start < consumed:
+            continue
+        value = _loads_object(text[start:end])
+        if value is not None:
+            objects.append(value)
+            if first_only:
+                break
+            consumed = end
+    return objects
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """The first valid JSON object in text, or None."""
+    # Fast path for the common case of one object wrapped in prose or a fence: if
+    # everything from the first "{" to the last "}" parses, it is the first object
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidate = text[start:end + 1]
         try:
-            return json.loads(m.group(0))
-        except Exception:
-            return {}
-    return {}
+            value = json.loads(candidate)
+        except json.JSONDecodeError as e:
+            # Valid up to the end of the span: the first block is still open after the last "}"
+            # (truncated output), and the scan would give it up with everything nested in it
+            if e.pos >= len(candidate) or e.msg.startswith("Unterminated string"):
+                return None
+        else:
+            if isinstance(value, dict):
+                return value
+    objects = extract_json_objects(text, first_only=True)
+    return objects[0] if objects else None
+
+class IncrementalJSONParser:
+    """Parse a JSON object while it is being streamed.
+
+    feed() only re-parses when a value at most two levels deep has just been
+    completed (a top-level field or an item of a top-level list), by closing the
+    brackets that are still open; anything before the first "{" (such as a
+    markdown fence) is skipped.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._done = False
+        self.value: Dict[str, Any] = {}
+
+    def feed(self, delta: str) -> Optional[Dict[str, Any]]:
+        """Add a chunk of text; return the updated object if a field or item was completed."""
+        updated = None
+        for char in delta:
+            if self._done:
+                break
+            if not self._stack and char != "{":
+                continue
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in CLOSERS:
+                self._stack.append(char)
+            elif char in "]}" and self._stack:
+                self._stack.pop()
+                self._done = not self._stack
+                if len(self._stack) <= 2:
+                    updated = self._parse(len(self._buffer)) or updated
+            elif char == "," and len(self._stack) <= 2:
+                # The value before the comma is complete
+                updated = self._parse(len(self._buffer) - 1) or updated
+        return updated
+
+    def _parse(self, end: int) -> Optional[Dict[str, Any]]:
+        closing = "".join(CLOSERS[c] for c in reversed(self._stack))
+        try:
+            value = json.loads("".join(self._buffer[:end]) + closing)
+        except ValueError:
+            return None
+        if not isinstance(value, dict):
+            return None
+        self.value = value
+        return value
+
+def _make_strict(node: Any) -> None:
+    if isinstance(node, list):
+        for item in node:
+            _make_strict(item)
+        return
+    if not isinstance(node, dict):
+        return
+    for keyword in UNSUPPORTED_SCHEMA_KEYWORDS:
+        node.pop(keyword, None)
+    properties = node.get("properties")
+    if node.get("type") == "object" and isinstance(properties, dict):
+        node["additionalProperties"] = False
+        node["required"] = list(properties)
+        for prop in properties.values():
+            _make_strict(prop)
+    for key, value in node.items():
+        if key != "properties":
+            _make_strict(value)
+
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema of a Pydantic model in the form accepted by strict structured outputs."""
+    schema = model.model_json_schema()
+    _make_strict(schema)
+    return schema
+
+def response_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """The chat completions response_format that constrains the reply to a model's schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "strict": True, "schema": strict_json_schema(model)},
+    }
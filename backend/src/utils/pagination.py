@@ -0,0 +1,59 @@
+"""
+CURSOR PAGINATION HELPERS
+------------------------
+This file implements the cursor pagination shared by the list endpoints.
+It provides:
+
+1. encode_cursor() / decode_cursor() - opaque, URL-safe cursors holding the sort
+   and the position of the last item of a page; a cursor only continues the
+   sort it was issued for
+2. paginate() - keyset pagination over a list: items are ordered by (sort value,
+   ID) and a page is the `limit` items after the cursor's position, so items
+   added or removed between two requests never shift, repeat or skip a page
+
+Cursors are positions, not offsets, so the S3-backed listing can use the last
+key of a page as StartAfter for the next one.
+"""
+
+import base64
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+def encode_cursor(sort: str, order: str, value: Any, item_id: str) -> str:
+    """Cursor of the page after the item with this sort value and ID."""
+    payload = json.dumps({"s": sort, "o": order, "v": value, "id": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Dict[str, Any]:
+    """The position stored in a cursor; ValueError if it is malformed (including a
+    non-string value or ID) or from another sort."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        position = {"value": data["v"], "id": data["id"]}
+        issued_for = (data["s"], data["o"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    # Every sort value is a string; anything else could not be compared with the items
+    if not all(isinstance(field, str) for field in (*position.values(), *issued_for)):
+        raise ValueError("Invalid cursor")
+    if issued_for != (sort, order):
+        raise ValueError(f"Cursor was issued for sort={issued_for[0]}&order={issued_for[1]}")
+    return position
+
+def paginate(items: Sequence[Any], sort: str, order: str, limit: int, cursor: Optional[str],
+             sort_value: Callable[[Any], Any], item_id: Callable[[Any], str]) -> Tuple[List[Any], Optional[str]]:
+    """One page of items ordered by (sort_value, item_id) and the cursor of the next page (None on the last)."""
+    descending = order == "desc"
+    ordered = sorted(items, key=lambda item: (sort_value(item), item_id(item)), reverse=descending)
+    if cursor:
+        position = decode_cursor(cursor, sort, order)
+        after = (position["value"], position["id"])
+        ordered = [item for item in ordered
+                   if ((sort_value(item), item_id(item)) < after if descending
+                       else (sort_value(item), item_id(item)) > after)]
+    page = ordered[:limit]
+    if len(ordered) <= limit:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(sort, order, sort_value(last), item_id(last))
@@ -10,6 +10,7 @@ It provides:
 4. TRANSCRIPT_TXT - Path to the default transcript file
 5. MINUTES_MD - Path where meeting minutes will be saved
 6. ACTIONS_JSON - Path where action items will be saved
+7. BATCH_DIR - Directory for batch runs: per-transcript outputs and manifests
 
 Using Path objects from the pathlib library ensures cross-platform
 compatibility for all file operations, regardless of operating system.
@@ -24,6 +25,7 @@ OUTPUTS_DIR = ROOT / "outputs"
 TRANSCRIPT_TXT = SAMPLES_DIR / "transcript.txt"
 MINUTES_MD = OUTPUTS_DIR / "minutes.md"
 ACTIONS_JSON = OUTPUTS_DIR / "actions.json"
+BATCH_DIR = OUTPUTS_DIR / "batch"
 
 def get_output_dir() -> Path:
     """Get the output directory and ensure it exists."""
@@ -0,0 +1,147 @@
+"""
+TRANSCRIPT PARSER
+----------------
+This file turns a "Name: utterance" transcript into structured speaker turns
+in a single linear pass, without calling the LLM.
+It provides:
+
+1. Turn - one speaker turn (speaker, raw text, utterance and word count)
+2. ParsedTranscript - the turns plus the speaker set, per-speaker turn and word
+   counts, any "Attendees:" list from the header, and a parse confidence
+3. parse_transcript() - the parser itself
+
+The confidence says how much of the transcript is covered by speaker turns and
+whether the speaker set looks plausible. When it is high the participants come
+straight from the parse; when it is low the LLM extraction is used instead.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# "Sarah: ...", "Dr. Lee: ...", "Jordan Smith (PM): ...", "[00:12:03] Alex: ..."
+SPEAKER_LINE = re.compile(
+    r"^\s*(?:\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s+)?([A-Z][\w .'()-]{0,40}?):\s+(\S.*)$"
+)
+
+# Header lines that list attendees rather than speak
+ATTENDEE_LABELS = {"attendees", "participants", "present", "attendance"}
+
+# "Name:" prefixes that are section labels, not speakers
+NON_SPEAKER_LABELS = ATTENDEE_LABELS | {
+    "agenda", "action items", "action item", "actions", "date", "time", "subject",
+    "location", "summary", "notes", "note", "decision", "decisions", "next steps",
+    "topic", "title", "meeting", "absent", "apologies", "todo",
+}
+
+ROLE_SUFFIX = re.compile(r"\s*\([^)]*\)\s*$")
+
+@dataclass
+class Turn:
+    """One speaker turn. speaker is None for text before the first speaker line
+    and for section labels; label is the raw "Name:" prefix, if any."""
+    speaker: Optional[str]
+    text: str
+    utterance: str
+    words: int
+    label: Optional[str] = None
+
+@dataclass
+class ParsedTranscript:
+    """Speaker turns and statistics of one transcript."""
+    turns: List[Turn] = field(default_factory=list)
+    speakers: List[str] = field(default_factory=list)
+    attendees: List[str] = field(default_factory=list)
+    turn_counts: Dict[str, int] = field(default_factory=dict)
+    word_counts: Dict[str, int] = field(default_factory=dict)
+    total_words: int = 0
+    confidence: float = 0.0
+
+    @property
+    def participants(self) -> List[str]:
+        """Speakers in order of appearance, followed by listed attendees who never spoke."""
+        seen = {name.lower() for name in self.speakers}
+        return self.speakers + [name for name in self.attendees if name.lower() not in seen]
+
+    def stats(self) -> Dict[str, object]:
+        """Compact summary stored in the pipeline state."""
+        return {
+            "speakers": self.speakers,
+            "participants": self.participants,
+            "turns": len([t for t in self.turns if t.speaker]),
+            "turn_counts": self.turn_counts,
+            "word_counts": self.word_counts,
+            "total_words": self.total_words,
+            "confidence": self.confidence,
+        }
+
+def _speaker_name(label: str) -> Optional[str]:
+    """Normalize a "Name:" prefix, or return None if it is a section label."""
+    name = ROLE_SUFFIX.sub("", label).strip()
+    if not name or name.lower() in NON_SPEAKER_LABELS:
+        return None
+    return name
+
+def _confidence(parsed: ParsedTranscript) -> float:
+    """Share of words spoken in attributed turns, discounted for implausible speaker sets."""
+    if not parsed.speakers or not parsed.total_words:
+        return 0.0
+    coverage = sum(parsed.word_counts.values()) / parsed.total_words
+    if len(parsed.speakers) == 1 or len(parsed.speakers) > 30:
+        coverage *= 0.5
+    return round(coverage, 3)
+
+def parse_transcript(text: str) -> ParsedTranscript:
+    """Parse a transcript into speaker turns in one pass over its lines.
+
+    A turn starts at every "Name: utterance" line and any other line continues the
+    current turn. Section labels such as "Agenda:" start an unattributed turn, and an
+    "Attendees: a, b" line is recorded as the attendee list.
+    """
+    parsed = ParsedTranscript()
+    if not text:
+        return parsed
+
+    canonical: Dict[str, str] = {}
+    speaker: Optional[str] = None
+    is_label = False
+    label: Optional[str] = None
+    lines: List[str] = []
+    utterance: List[str] = []
+
+    def close_turn():
+        raw = "\n".join(lines).strip()
+        if not raw:
+            return
+        spoken = " ".join(utterance).strip()
+        words = len(spoken.split())
+        parsed.turns.append(Turn(speaker, raw, spoken, words, label))
+        # Section labels are metadata, so they do not count against the coverage
+        if not is_label:
+            parsed.total_words += words
+        if speaker:
+            parsed.turn_counts[speaker] = parsed.turn_counts.get(speaker, 0) + 1
+            parsed.word_counts[speaker] = parsed.word_counts.get(speaker, 0) + words
+
+    for line in text.splitlines():
+        match = SPEAKER_LINE.match(line)
+        if match:
+            close_turn()
+            label, content = match.group(1).strip(), match.group(2)
+            name = _speaker_name(label)
+            if name is None and ROLE_SUFFIX.sub("", label).strip().lower() in ATTENDEE_LABELS:
+                parsed.attendees.extend(a.strip() for a in re.split(r",|;| and ", content) if a.strip())
+            if name is not None:
+                # Keep the first spelling seen for each speaker
+                if name.lower() not in canonical:
+                    canonical[name.lower()] = name
+                    parsed.speakers.append(name)
+                name = canonical[name.lower()]
+            speaker, is_label, lines, utterance = name, name is None, [line], [content]
+        else:
+            lines.append(line)
+            utterance.append(line.strip())
+    close_turn()
+
+    parsed.confidence = _confidence(parsed)
+    return parsed
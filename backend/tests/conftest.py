@@ -0,0 +1,119 @@
+"""
+TEST CONFIGURATION
+-----------------
+Runs the tests offline: the fake LLM provider, no AWS credentials, in-memory
+job queue and caches, and no checkpoint, lease or incremental stores unless a
+test opts in. The settings are read at import time, so this must run before
+anything under backend.src is imported.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+# The modules import each other as backend.src.*
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+os.environ.update({
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_LATENCY_MS": "5",
+    "FAKE_LLM_LATENCY_SIGMA": "0",
+    "LLM_CACHE_BACKEND": "memory",
+    "CHECKPOINT_BACKEND": "none",
+    "INCREMENTAL_REPROCESSING": "false",
+    "PIPELINE_DEADLINE_SECONDS": "0",
+    "JOB_QUEUE_PATH": ":memory:",
+    "LEASE_BACKEND": "none",
+    "AWS_ACCESS_KEY_ID": "",
+    "AWS_SECRET_ACCESS_KEY": "",
+    "USE_DYNAMODB": "false",
+    "LOG_LEVEL": "WARNING",
+})
+
+class FakeStorage:
+    """In-memory stand-in for the S3 side of StorageRepository."""
+
+    def __init__(self):
+        self.transcripts: Dict[str, str] = {}
+        self.modified: Dict[str, datetime] = {}
+        self.files: Dict[str, str] = {}
+        self.etags: Dict[str, str] = {}
+        self.writes = 0
+
+    def add_transcript(self, key: str, content: str, modified: Optional[datetime] = None) -> None:
+        self.transcripts[key] = content
+        self.modified[key] = modified or datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=len(self.modified))
+
+    def _object(self, key: str) -> Dict:
+        return {"Key": key, "Size": len(self.transcripts[key]), "LastModified": self.modified[key]}
+
+    def get_transcript_from_s3(self, key: str) -> str:
+        return self.transcripts.get(key, "")
+
+    def list_s3_transcripts(self, prefix: Optional[str] = None) -> List[str]:
+        return sorted(k for k in self.transcripts if k.startswith(prefix or ""))
+
+    def list_s3_transcript_objects(self, prefix: Optional[str] = None) -> List[Dict]:
+        return [self._object(k) for k in self.list_s3_transcripts(prefix)]
+
+    def list_s3_transcript_page(self, limit: int, start_after: Optional[str] = None) -> Tuple[List[Dict], bool]:
+        keys = [k for k in sorted(self.transcripts) if start_after is None or k > start_after]
+        return [self._object(k) for k in keys[:limit]], len(keys) > limit
+
+    def list_processed_files(self, prefix: Optional[str] = None) -> List[str]:
+        return sorted(k for k in self.files if k.startswith(prefix or ""))
+
+    def get_file_from_s3(self, key: str) -> Optional[str]:
+        return self.files.get(key)
+
+    def save_file_to_s3(self, key: str, content) -> bool:
+        self.files[key] = content.decode("utf-8") if isinstance(content, bytes) else content
+        self.writes += 1
+        self.etags[key] = f'"{self.writes}"'
+        return True
+
+    def get_file_with_etag(self, key: str) -> Optional[Tuple[str, str]]:
+        return (self.files[key], self.etags[key]) if key in self.files else None
+
+    def save_file_if_match(self, key: str, content, etag: Optional[str] = None) -> bool:
+        if self.etags.get(key) != etag:
+            return False
+        return self.save_file_to_s3(key, content)
+
+    def save_minutes_s3(self, key: str, text: str) -> bool:
+        return True
+
+    def save_actions_s3(self, key: str, tasks: List[Dict]) -> bool:
+        return True
+
+@pytest.fixture
+def storage(monkeypatch):
+    """The API's storage replaced by a FakeStorage, with an empty meeting index and listing cache."""
+    from backend.src import api
+    fake = FakeStorage()
+    monkeypatch.setattr(api, "storage_repo", fake)
+    monkeypatch.setattr(api.meeting_index, "storage_repo", fake)
+    monkeypatch.setattr(api.meeting_index, "_sources", None)
+    monkeypatch.setattr(api, "_transcript_listing", {"objects": None, "at": 0.0})
+    return fake
+
+@pytest.fixture
+def client(storage):
+    """A TestClient of the API (its lifespan runs the job queue's workers)."""
+    from fastapi.testclient import TestClient
+    from backend.src import api
+    with TestClient(api.app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    """Checkpoint to a SQLite file under tmp_path for the test."""
+    from backend.src.services import checkpoint_service
+    backend = checkpoint_service.SQLiteCheckpoints(tmp_path / "checkpoints.sqlite3")
+    monkeypatch.setattr(checkpoint_service.checkpoint_store, "_backend", backend)
+    monkeypatch.setattr(checkpoint_service.checkpoint_store, "_created", True)
+    return backend
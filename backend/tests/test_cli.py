@@ -0,0 +1,67 @@
+"""Command-line runs over the fake provider."""
+
+import re
+import sys
+
+import pytest
+
+from backend.src import app
+from backend.src.services import openai_service
+from backend.src.utils.paths import SAMPLES_DIR
+
+SAMPLE = SAMPLES_DIR / "inputs" / "meeting_transcript.txt"
+
+def run_cli(monkeypatch, capsys, *args) -> str:
+    monkeypatch.setattr(sys, "argv", ["app", *args])
+    app.main()
+    return capsys.readouterr().out
+
+@pytest.fixture
+def transcript(tmp_path, monkeypatch):
+    """A copy of the sample transcript under a source name of its own; outputs go to tmp_path."""
+    for method, default in (("save_minutes_local", "minutes.md"), ("save_actions_local", "actions.json")):
+        save = getattr(app.StorageRepository, method)
+        monkeypatch.setattr(app.StorageRepository, method,
+                            lambda repo, content, path=None, save=save, default=tmp_path / default:
+                            save(repo, content, path or default))
+    path = tmp_path / f"{tmp_path.name}.txt"
+    path.write_text(SAMPLE.read_text(encoding="utf-8"), encoding="utf-8")
+    return path
+
+def llm_calls(output: str):
+    """(calls, cache hits) from the CLI's pipeline summary line."""
+    match = re.search(r"(\d+) LLM calls \((\d+) cached", output)
+    assert match, output
+    return int(match.group(1)), int(match.group(2))
+
+def test_no_cache_run_reports_no_cache_hits(monkeypatch, capsys, transcript):
+    run_cli(monkeypatch, capsys, "--file", str(transcript))
+    calls, hits = llm_calls(run_cli(monkeypatch, capsys, "--file", str(transcript)))
+    assert calls and hits
+
+    calls, hits = llm_calls(run_cli(monkeypatch, capsys, "--file", str(transcript), "--no-cache"))
+    assert calls and hits == 0
+
+def test_interrupted_run_resumes_from_checkpoints(monkeypatch, capsys, transcript, checkpoints):
+    complete = openai_service.llm_provider.complete
+
+    def fail_assign_tasks(request, node=None, listener=None):
+        if node == "assign_tasks":
+            raise RuntimeError("connection lost")
+        return complete(request, node, listener)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(openai_service.llm_provider, "complete", fail_assign_tasks)
+        with pytest.raises(RuntimeError):
+            run_cli(monkeypatch, capsys, "--file", str(transcript), "--no-cache")
+    saved = checkpoints._conn.execute("SELECT node FROM checkpoints").fetchall()
+    assert "extract_title" in {node for node, in saved}
+
+    output = run_cli(monkeypatch, capsys, "--file", str(transcript), "--no-cache")
+    resumed = re.search(r"Resumed from checkpoints: (.+)", output)
+    assert resumed, output
+    resumed_nodes = resumed.group(1).split(", ")
+    assert "extract_title" in resumed_nodes and "assign_tasks" not in resumed_nodes
+    assert llm_calls(output)[0] == 1
+    # A completed run drops its checkpoints
+    assert checkpoints._conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 0
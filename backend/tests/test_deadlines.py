@@ -0,0 +1,53 @@
+"""Pipeline runs that outlive their deadline."""
+
+import asyncio
+import gc
+
+import pytest
+
+from backend.src.agents.graph import graph_registry
+from backend.src.models.schemas import MeetingState
+from backend.src.services import openai_service
+from backend.src.services.llm_cache import bypass_cache
+from backend.src.utils.paths import SAMPLES_DIR
+
+TRANSCRIPT = (SAMPLES_DIR / "inputs" / "meeting_transcript.txt").read_text(encoding="utf-8")
+
+def run_past_deadline(source: str):
+    """Run the pipeline into its deadline; returns the final state, the tasks
+    still pending afterwards and the errors the event loop reported."""
+    async def run():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        with bypass_cache():
+            final_state = await graph_registry.ainvoke(MeetingState(transcript=TRANSCRIPT, source=source),
+                                                       deadline_s=0.3)
+        await asyncio.sleep(0.05)
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        gc.collect()
+        return final_state, pending, errors
+
+    return asyncio.run(run())
+
+@pytest.fixture
+def slow_llm(monkeypatch):
+    monkeypatch.setattr(openai_service.llm_provider, "latency_ms", 2000)
+
+def test_cancelled_nodes_give_back_their_scheduler_slots(slow_llm):
+    for _ in range(2):
+        final_state, pending, errors = run_past_deadline("deadline.txt")
+        assert final_state["degraded_fields"]
+        assert "not available: timed out" in final_state["minutes_md"]
+        assert openai_service.llm_scheduler.stats()["in_flight"] == 0
+        assert not pending and not errors
+
+def test_deadline_cancels_checkpointed_nodes(slow_llm, checkpoints):
+    final_state, pending, errors = run_past_deadline("deadline-checkpointed.txt")
+    assert final_state["degraded_fields"]
+    # The checkpoint shield must not keep timed-out nodes running in the background
+    assert openai_service.llm_scheduler.stats()["in_flight"] == 0
+    assert not pending, pending
+    assert not errors, [context.get("message") for context in errors]
+    # A degraded node saved no checkpoint, so a retry runs it again
+    saved = {node for node, in checkpoints._conn.execute("SELECT node FROM checkpoints")}
+    assert not saved & set(final_state["degraded_fields"])
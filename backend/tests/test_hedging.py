@@ -0,0 +1,65 @@
+"""Hedged calls: token accounting of the duplicate request."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.src.services import hedging
+from backend.src.services.hedging import HedgeBudget, HedgeOutcome, ahedged_call
+from backend.src.services.metrics_service import estimate_cost, record_llm_call
+from backend.src.services.rate_limiter import LLMScheduler
+
+def completion(total_tokens: int):
+    return SimpleNamespace(usage=SimpleNamespace(total_tokens=total_tokens))
+
+def tokens_used(result) -> int:
+    return result.usage.total_tokens
+
+@pytest.fixture(autouse=True)
+def budget(monkeypatch):
+    monkeypatch.setattr(hedging, "hedge_budget", HedgeBudget(1.0))
+
+def test_hedged_call_counts_the_tokens_of_both_requests():
+    call = record_llm_call("gpt-4o-mini", 1.0, prompt_tokens=1000, completion_tokens=200, cached_tokens=100,
+                           hedged=True)
+    assert (call["prompt_tokens"], call["completion_tokens"], call["cached_tokens"]) == (2000, 400, 200)
+    assert call["cost_usd"] == pytest.approx(estimate_cost("gpt-4o-mini", 2000, 400, 200))
+
+    single = record_llm_call("gpt-4o-mini", 1.0, prompt_tokens=1000, completion_tokens=200, cached_tokens=100)
+    assert call["cost_usd"] == pytest.approx(2 * single["cost_usd"])
+
+def hedge(scheduler: LLMScheduler, primary_s: float, duplicate_s: float):
+    """Run a hedged call whose primary and duplicate use 300 and 400 tokens; returns the
+    result, the outcome and the TPM bucket level once the loser has been released."""
+    outcome = HedgeOutcome()
+
+    async def answer(seconds, tokens):
+        await asyncio.sleep(seconds)
+        return completion(tokens)
+
+    async def main():
+        result = await ahedged_call(lambda: answer(primary_s, 300), lambda: answer(duplicate_s, 400), 0.02,
+                                    lambda: scheduler.try_admit(1000, tokens_used), outcome)
+        await asyncio.sleep(0.01)
+        return result
+
+    result = asyncio.run(main())
+    return result, outcome, scheduler.tokens.level
+
+def test_cancelled_duplicate_is_charged_the_answers_tokens():
+    scheduler = LLMScheduler(rpm=0, tpm=6000, max_concurrency=4)
+    result, outcome, level = hedge(scheduler, primary_s=0.05, duplicate_s=1.0)
+    assert outcome.hedged and not outcome.won
+    assert tokens_used(result) == 300
+    # Reserved 1000, settled to the answer's 300 rather than refunded (the bucket refills 100/s)
+    assert level == pytest.approx(6000 - 300, abs=30)
+    assert scheduler.concurrency.in_flight == 0
+
+def test_winning_duplicate_is_charged_its_own_tokens():
+    scheduler = LLMScheduler(rpm=0, tpm=6000, max_concurrency=4)
+    result, outcome, level = hedge(scheduler, primary_s=1.0, duplicate_s=0.05)
+    assert outcome.won
+    assert tokens_used(result) == 400
+    assert level == pytest.approx(6000 - 400, abs=30)
+    assert scheduler.concurrency.in_flight == 0
@@ -0,0 +1,97 @@
+"""The pipeline job queue: SQLite claims, restarts, and the 202 + /api/jobs flow."""
+
+import asyncio
+import threading
+import time
+
+from backend.src.services.job_service import JobQueue, SQLiteJobs
+from backend.src.utils.paths import SAMPLES_DIR
+
+TRANSCRIPT = (SAMPLES_DIR / "inputs" / "meeting_transcript.txt").read_text(encoding="utf-8")
+
+def test_racing_workers_never_claim_the_same_job(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    # Two workers with their own connection, like two API containers on one queue file
+    workers = [SQLiteJobs(path), SQLiteJobs(path)]
+    for i in range(200):
+        workers[0].enqueue(f"job-{i:03d}", "{}", created_at=i)
+    claimed = [[], []]
+
+    def drain(i: int):
+        while (job := workers[i].claim(time.time())) is not None:
+            claimed[i].append(job["id"])
+
+    threads = [threading.Thread(target=drain, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    everything = claimed[0] + claimed[1]
+    assert sorted(everything) == [f"job-{i:03d}" for i in range(200)]
+    assert len(set(everything)) == 200
+    assert workers[1].counts()["running"] == 200
+
+def test_jobs_left_running_by_a_crash_are_queued_again(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    crashed = SQLiteJobs(path)
+    crashed.enqueue("retry", "{}", created_at=1)
+    crashed.enqueue("exhausted", "{}", created_at=2)
+    assert crashed.claim(time.time())["id"] == "retry"
+    # "exhausted" is on its last attempt
+    assert crashed.claim(time.time())["id"] == "exhausted"
+    crashed._conn.execute("UPDATE jobs SET attempts = 3 WHERE id = 'exhausted'")
+    crashed._conn.commit()
+
+    restarted = JobQueue(SQLiteJobs(path), max_attempts=3, poll_seconds=0.05)
+    handled = []
+
+    async def handler(payload):
+        handled.append(payload)
+        return {"ok": True}
+
+    async def main():
+        restarted.start(handler, workers=1)
+        while restarted.backend.get("retry")["status"] != "done":
+            await asyncio.sleep(0.01)
+        await restarted.stop()
+
+    asyncio.run(asyncio.wait_for(main(), timeout=5))
+    retried = restarted.get("retry")
+    assert retried["attempts"] == 2 and retried["result"] == {"ok": True}
+    exhausted = restarted.get("exhausted")
+    assert exhausted["status"] == "failed" and exhausted["error"] == "Interrupted too many times"
+    assert handled == [{}]
+
+def wait_for_job(client, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/jobs/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish: {job}")
+
+def test_generate_is_queued_and_done(client, storage):
+    storage.add_transcript("standup.txt", TRANSCRIPT)
+    response = client.post("/api/meeting-data/generate", json={"transcriptId": "standup.txt"})
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued" and body["statusUrl"] == f"/api/jobs/{body['jobId']}"
+
+    job = wait_for_job(client, body["jobId"])
+    assert job["status"] == "done" and job["attempts"] == 1 and job["error"] is None
+    meeting_id = job["result"]["meetingDataId"]
+    assert f"meeting_data/{meeting_id}.json" in storage.files
+
+def test_failed_job_reports_its_error(client, storage):
+    response = client.post("/api/meeting-data/generate", json={"transcriptId": "missing.txt"})
+    assert response.status_code == 202
+    job = wait_for_job(client, response.json()["jobId"])
+    assert job["status"] == "failed"
+    assert job["error"] == "Transcript not found: missing.txt"
+    assert job["result"] is None
+
+def test_unknown_job_and_invalid_mode(client):
+    assert client.get("/api/jobs/nope").status_code == 404
+    response = client.post("/api/meeting-data/generate", json={"transcriptId": "a.txt", "mode": "sideways"})
+    assert response.status_code == 400
@@ -0,0 +1,31 @@
+"""JSON extraction from LLM responses."""
+
+import json
+
+from backend.src.utils.json_utils import extract_json_object, extract_json_objects, robust_json_parse
+
+PAYLOAD = {"title": "Relaunch", "agenda": ["Review {draft}", "Plan the \"launch\""],
+           "tasks": [{"owner": "Priya", "task": "Update the copy"}]}
+
+def test_object_in_a_fence_and_prose():
+    assert robust_json_parse(f"Here you go:\n```json\n{json.dumps(PAYLOAD, indent=2)}\n```\nDone.") == PAYLOAD
+
+def test_first_of_two_blocks_and_all_of_them():
+    text = f"{json.dumps(PAYLOAD)}\nI also considered {{\"title\": \"Alt\"}} but not {{this}}."
+    assert extract_json_object(text) == PAYLOAD
+    assert extract_json_objects(text) == [PAYLOAD, {"title": "Alt"}]
+
+def test_braces_in_prose_and_trailing_commas():
+    text = 'Fields use {field} syntax: {"a": [1, 2,], "b": "}",}\nDone }'
+    assert robust_json_parse(text) == {"a": [1, 2], "b": "}"}
+
+def test_truncated_output_yields_no_nested_object():
+    pretty = json.dumps({**PAYLOAD, "summary": "The team reviewed the plan. " * 20}, indent=2)
+    for cut in (len(pretty) // 2, len(pretty) - 40, len(pretty) - 1):
+        assert extract_json_object(pretty[:cut]) is None
+        assert extract_json_objects(pretty[:cut]) == []
+        assert robust_json_parse(pretty[:cut]) == {}
+
+def test_complete_block_before_a_truncated_one():
+    text = f"{json.dumps(PAYLOAD)}\n{json.dumps(PAYLOAD)[:30]}"
+    assert extract_json_objects(text) == [PAYLOAD]
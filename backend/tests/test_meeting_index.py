@@ -0,0 +1,124 @@
+"""MeetingIndex reads and conditional writes, and the S3 calls behind them."""
+
+import io
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from backend.src.services.meeting_index import MeetingIndex
+from backend.src.services.s3_service import S3Service
+
+from conftest import FakeStorage
+
+KEY = "index/meeting_sources.json"
+
+def meeting(i: int, source: str = None) -> dict:
+    return {"id": f"meeting-{i}", "source": source or f"transcripts/{i}.txt", "title": f"Meeting {i}",
+            "processedAt": f"2024-05-0{i}T09:00:00"}
+
+@pytest.fixture
+def storage():
+    """Storage holding two meetings and their index, written by another container."""
+    fake = FakeStorage()
+    for i in (1, 2):
+        fake.save_file_to_s3(f"meeting_data/meeting-{i}.json", json.dumps(meeting(i)))
+    MeetingIndex(fake, KEY).rebuild()
+    return fake
+
+def stored_sources(storage) -> set:
+    return set(json.loads(storage.files[KEY])["sources"])
+
+def failing_reads(storage, monkeypatch):
+    def get_file_with_etag(key):
+        raise ClientError({"Error": {"Code": "SlowDown", "Message": "Please reduce your request rate"}}, "GetObject")
+    monkeypatch.setattr(storage, "get_file_with_etag", get_file_with_etag)
+
+def test_failed_read_never_overwrites_the_index(storage, monkeypatch):
+    index = MeetingIndex(storage, KEY)
+    writes = storage.writes
+    with monkeypatch.context() as patch:
+        failing_reads(storage, patch)
+        index.record(meeting(3))
+        with pytest.raises(ClientError):
+            index.lookup("transcripts/1.txt")
+    assert storage.writes == writes
+    assert stored_sources(storage) == {"transcripts/1.txt", "transcripts/2.txt"}
+
+    index.record(meeting(3))
+    assert stored_sources(storage) == {"transcripts/1.txt", "transcripts/2.txt", "transcripts/3.txt"}
+    assert index.rebuilds == 0
+
+def test_failed_refresh_keeps_the_cached_index(storage, monkeypatch):
+    index = MeetingIndex(storage, KEY, refresh_seconds=0)
+    assert index.lookup("transcripts/1.txt")["id"] == "meeting-1"
+    failing_reads(storage, monkeypatch)
+    assert index.lookup("transcripts/2.txt")["id"] == "meeting-2"
+    # Decisions that must see the other containers' writes do not fall back to the cache
+    with pytest.raises(ClientError):
+        index.lookup("transcripts/2.txt", fresh=True)
+
+def test_records_from_two_containers_keep_both_entries(storage, monkeypatch):
+    first, second = MeetingIndex(storage, KEY), MeetingIndex(storage, KEY)
+    save = storage.save_file_if_match
+    raced = []
+
+    def save_after_the_other_container(key, content, etag=None):
+        # The second container writes between the first one's read and write
+        if not raced:
+            raced.append(True)
+            second.record(meeting(4))
+        return save(key, content, etag)
+
+    monkeypatch.setattr(storage, "save_file_if_match", save_after_the_other_container)
+    first.record(meeting(3))
+    assert stored_sources(storage) == {f"transcripts/{i}.txt" for i in (1, 2, 3, 4)}
+    assert set(first.entries()) == stored_sources(storage)
+
+def test_missing_index_is_built_from_the_meeting_data():
+    storage = FakeStorage()
+    storage.save_file_to_s3("meeting_data/meeting-1.json", json.dumps(meeting(1)))
+    index = MeetingIndex(storage, KEY)
+    assert index.lookup("transcripts/1.txt")["id"] == "meeting-1"
+    assert index.rebuilds == 1
+    # A second container finds the index the first one wrote
+    other = MeetingIndex(storage, KEY)
+    assert other.lookup("transcripts/1.txt")["id"] == "meeting-1"
+    assert other.rebuilds == 0
+
+def test_unreadable_index_is_rebuilt(storage):
+    storage.save_file_to_s3(KEY, "{not json")
+    index = MeetingIndex(storage, KEY)
+    assert set(index.entries()) == {"transcripts/1.txt", "transcripts/2.txt"}
+    assert index.rebuilds == 1
+
+@pytest.fixture
+def s3():
+    service = S3Service()
+    with Stubber(service.s3_client) as stubber:
+        yield service, stubber
+
+def test_s3_read_tells_a_missing_file_from_a_failed_read(s3):
+    service, stubber = s3
+    params = {"Bucket": service.bucket_processed, "Key": KEY}
+    stubber.add_response("get_object", {"Body": io.BytesIO(b"{}"), "ETag": '"abc"'}, params)
+    stubber.add_client_error("get_object", "NoSuchKey", http_status_code=404, expected_params=params)
+    stubber.add_client_error("get_object", "AccessDenied", http_status_code=403, expected_params=params)
+    assert service.get_processed_file_with_etag(KEY) == ("{}", '"abc"')
+    assert service.get_processed_file_with_etag(KEY) is None
+    with pytest.raises(ClientError):
+        service.get_processed_file_with_etag(KEY)
+
+def test_s3_write_is_conditional_on_the_etag(s3):
+    service, stubber = s3
+    params = {"Bucket": service.bucket_processed, "Key": KEY, "Body": b"{}"}
+    stubber.add_response("put_object", {}, {**params, "IfMatch": '"abc"'})
+    stubber.add_client_error("put_object", "PreconditionFailed", http_status_code=412,
+                             expected_params={**params, "IfNoneMatch": "*"})
+    stubber.add_client_error("put_object", "InternalError", http_status_code=500,
+                             expected_params={**params, "IfMatch": '"abc"'})
+    assert service.save_processed_file_if_match(KEY, b"{}", '"abc"') is True
+    assert service.save_processed_file_if_match(KEY, b"{}") is False
+    with pytest.raises(ClientError):
+        service.save_processed_file_if_match(KEY, b"{}", '"abc"')
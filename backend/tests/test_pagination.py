@@ -0,0 +1,122 @@
+"""Keyset cursors: round-trips, ties on the sort value, bad cursors, both orders."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.src import api
+from backend.src.utils.pagination import decode_cursor, encode_cursor, paginate
+
+def pages(items, sort, order, limit, sort_value, item_id=lambda item: item["id"]):
+    """Every page, following the cursors to the end."""
+    result, cursor = [], None
+    while True:
+        page, cursor = paginate(items, sort, order, limit, cursor, sort_value, item_id)
+        result.append(page)
+        if cursor is None:
+            return result
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("date", "desc", "2024-01-02T10:00:00", "meeting 7/é")
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_cursor(cursor, "date", "desc") == {"value": "2024-01-02T10:00:00", "id": "meeting 7/é"}
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", encode_cursor("name", "asc", "a", "a")[:-3], "!!!!",
+                                    encode_cursor("name", "asc", 5, "x"), encode_cursor("name", "asc", "a", None),
+                                    encode_cursor("name", "asc", ["a"], "x")])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "name", "asc")
+
+def test_cursor_continues_only_its_own_sort():
+    cursor = encode_cursor("name", "asc", "b.txt", "b.txt")
+    with pytest.raises(ValueError, match="sort=name&order=asc"):
+        decode_cursor(cursor, "name", "desc")
+    with pytest.raises(ValueError, match="sort=name&order=asc"):
+        paginate([{"id": "a"}], "date", "asc", 1, cursor, lambda i: i["id"], lambda i: i["id"])
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_ties_on_the_sort_value_are_broken_by_id(order):
+    # Three items per date: a page boundary falls inside every run of ties
+    items = [{"id": f"m{i:02d}", "date": f"2024-01-0{i // 3 + 1}"} for i in range(12)]
+    result = pages(items, "date", order, 2, lambda item: item["date"])
+
+    ids = [item["id"] for page in result for item in page]
+    assert sorted(ids) == [item["id"] for item in items]
+    assert len(set(ids)) == len(items)
+    assert ids == sorted(ids, reverse=order == "desc")
+    assert [len(page) for page in result] == [2] * 6
+
+def test_reversed_order_is_the_same_items_backwards():
+    items = [{"id": f"m{i}", "title": title} for i, title in enumerate("cabbac")]
+    ascending = [item["id"] for page in pages(items, "name", "asc", 4, lambda i: i["title"]) for item in page]
+    descending = [item["id"] for page in pages(items, "name", "desc", 4, lambda i: i["title"]) for item in page]
+    assert ascending == ["m1", "m4", "m2", "m3", "m0", "m5"]
+    assert descending == ascending[::-1]
+
+def test_pages_do_not_shift_when_items_are_added_or_removed():
+    items = [{"id": f"m{i}", "n": f"{i:02d}"} for i in range(6)]
+    first, cursor = paginate(items, "name", "asc", 3, None, lambda i: i["n"], lambda i: i["id"])
+    # One item of the first page is deleted and one sorting before the cursor is added
+    changed = [item for item in items if item["id"] != "m1"] + [{"id": "m-new", "n": "-1"}]
+    second, cursor = paginate(changed, "name", "asc", 3, cursor, lambda i: i["n"], lambda i: i["id"])
+    assert [i["id"] for i in first] == ["m0", "m1", "m2"]
+    assert [i["id"] for i in second] == ["m3", "m4", "m5"]
+    assert cursor is None
+
+def test_empty_list():
+    assert paginate([], "name", "asc", 5, None, lambda i: i, lambda i: i) == ([], None)
+
+def list_all(client, path, key, **params):
+    """Every item of a list endpoint, following nextCursor."""
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        items += body[key]
+        cursor = body["nextCursor"]
+        if cursor is None:
+            return items
+
+@pytest.mark.parametrize("sort,order", [("name", "asc"), ("name", "desc"), ("date", "asc"), ("date", "desc")])
+def test_transcript_list_pages(client, storage, sort, order):
+    tied = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    for name in ["e", "a", "d", "c", "b"]:
+        storage.add_transcript(f"transcripts/{name}.txt", "text", modified=tied)
+
+    names = [t["name"] for t in list_all(client, "/api/transcripts/list", "transcripts", limit=2, sort=sort,
+                                         order=order)]
+    # The same modified time everywhere, so date sorts fall back to the key
+    assert names == sorted(names, reverse=order == "desc")
+    assert len(names) == 5
+
+@pytest.mark.parametrize("sort,order", [("name", "asc"), ("date", "desc")])
+def test_list_endpoints_reject_non_string_positions(client, storage, sort, order):
+    storage.add_transcript("transcripts/a.txt", "text")
+    api.meeting_index.record({"id": "meeting-1", "source": "transcripts/a.txt", "processedAt": "2024-05-01"})
+    cursor = encode_cursor(sort, order, 5, "x")
+    for path in ("/api/transcripts/list", "/api/meeting-data/list"):
+        response = client.get(path, params={"cursor": cursor, "sort": sort, "order": order})
+        assert response.status_code == 400, (path, response.text)
+        assert response.json()["detail"] == "Invalid cursor"
+
+def test_transcript_list_rejects_bad_cursors(client, storage):
+    storage.add_transcript("transcripts/a.txt", "text")
+    response = client.get("/api/transcripts/list", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    cursor = encode_cursor("date", "desc", "2024-01-01", "transcripts/a.txt")
+    response = client.get("/api/transcripts/list", params={"cursor": cursor, "sort": "name", "order": "asc"})
+    assert response.status_code == 400
+    assert "sort=date&order=desc" in response.json()["detail"]
+
+def test_meeting_list_pages_through_tied_dates(client, storage):
+    for i in range(7):
+        api.meeting_index.record({"id": f"meeting-{i}", "source": f"transcripts/{i}.txt", "title": f"T{i % 2}",
+                                  "processedAt": "2024-05-01T09:00:00" if i < 5 else f"2024-05-0{i}T09:00:00"})
+
+    meetings = list_all(client, "/api/meeting-data/list", "meetingData", limit=3)
+    assert [m["id"] for m in meetings] == ["meeting-6", "meeting-5", "meeting-4", "meeting-3", "meeting-2",
+                                           "meeting-1", "meeting-0"]
+    response = client.get("/api/meeting-data/list", params={"cursor": "garbage"})
+    assert response.status_code == 400
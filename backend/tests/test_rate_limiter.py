@@ -0,0 +1,88 @@
+"""LLMScheduler admission, cancellation and deadlines."""
+
+import asyncio
+
+import pytest
+
+from backend.src.services import deadline_service
+from backend.src.services.rate_limiter import CallStats, LLMScheduler
+
+def scheduler(max_concurrency: int = 2, tpm: float = 0) -> LLMScheduler:
+    return LLMScheduler(rpm=0, tpm=tpm, max_concurrency=max_concurrency)
+
+async def answer(value="ok", seconds: float = 0.0):
+    await asyncio.sleep(seconds)
+    return value
+
+def test_cancelled_calls_release_their_slots():
+    limiter = scheduler(max_concurrency=2)
+
+    async def main():
+        calls = [asyncio.create_task(limiter.acall(lambda: answer(seconds=10), 100, CallStats())) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert limiter.concurrency.in_flight == 2
+        for call in calls:
+            call.cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        assert limiter.concurrency.in_flight == 0
+        return await asyncio.wait_for(limiter.acall(answer, 100, CallStats()), timeout=1)
+
+    assert asyncio.run(main()) == "ok"
+
+def test_cancelled_while_queued_for_a_slot():
+    limiter = scheduler(max_concurrency=1)
+
+    async def main():
+        running = asyncio.create_task(limiter.acall(lambda: answer(seconds=0.2), 100, CallStats()))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(limiter.acall(answer, 100, CallStats()))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert await running == "ok"
+        assert limiter.concurrency.in_flight == 0
+
+    asyncio.run(main())
+
+def test_cancellation_refunds_the_token_reservation():
+    limiter = scheduler(tpm=6000)
+    before = limiter.tokens.level
+
+    async def main():
+        call = asyncio.create_task(limiter.acall(lambda: answer(seconds=10), 1000, CallStats()))
+        await asyncio.sleep(0.05)
+        assert limiter.tokens.level < before - 900
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+
+    asyncio.run(main())
+    assert limiter.tokens.level == pytest.approx(before, abs=5)
+
+def test_slot_wait_is_bounded_by_the_deadline():
+    limiter = scheduler(max_concurrency=1)
+
+    async def main():
+        running = asyncio.create_task(limiter.acall(lambda: answer(seconds=0.5), 100, CallStats()))
+        await asyncio.sleep(0.05)
+        with deadline_service.run_deadline(0.1):
+            with pytest.raises(deadline_service.DeadlineExceeded):
+                await limiter.acall(answer, 100, CallStats())
+        await running
+        assert limiter.concurrency.in_flight == 0
+
+    asyncio.run(main())
+
+def test_failed_call_is_retried_after_releasing_its_slot():
+    limiter = LLMScheduler(rpm=0, tpm=0, max_concurrency=1, backoff_base_s=0.01, retryable=(ConnectionError,))
+    attempts = []
+
+    async def flaky():
+        attempts.append(limiter.concurrency.in_flight)
+        if len(attempts) == 1:
+            raise ConnectionError("reset")
+        return "ok"
+
+    stats = CallStats()
+    assert asyncio.run(limiter.acall(flaky, 100, stats)) == "ok"
+    assert attempts == [1, 1] and stats.retries == 1
+    assert limiter.concurrency.in_flight == 0
@@ -0,0 +1,126 @@
+"""SingleFlight coalescing and SQLite lease expiry, takeover and waits."""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.src.services.single_flight import LeaseTimeout, SingleFlight, SQLiteLeases
+
+@pytest.fixture
+def lease_path(tmp_path):
+    return str(tmp_path / "leases.sqlite3")
+
+def test_lease_is_exclusive_until_it_expires(lease_path):
+    leases = SQLiteLeases(lease_path)
+    assert leases.acquire("t.txt", "a", 10, now=100)
+    assert not leases.acquire("t.txt", "b", 10, now=105)
+    # The same owner may take it again, e.g. a retried acquire
+    assert leases.acquire("t.txt", "a", 10, now=105)
+    # Expired (a crashed worker stops renewing): another owner takes it over
+    assert leases.acquire("t.txt", "b", 10, now=116)
+    assert not leases.acquire("t.txt", "a", 10, now=117)
+    assert leases.acquire("other.txt", "a", 10, now=117)
+
+def test_only_the_owner_renews_or_releases(lease_path):
+    leases, other_worker = SQLiteLeases(lease_path), SQLiteLeases(lease_path)
+    assert leases.acquire("t.txt", "a", 10, now=100)
+    assert not other_worker.renew("t.txt", "b", 10, now=105)
+    assert leases.renew("t.txt", "a", 10, now=108)
+    # Renewed until 118, so not taken over at 115
+    assert not other_worker.acquire("t.txt", "b", 10, now=115)
+    other_worker.release("t.txt", "b")
+    assert not other_worker.acquire("t.txt", "b", 10, now=115)
+    leases.release("t.txt", "a")
+    assert other_worker.acquire("t.txt", "b", 10, now=115)
+
+def test_concurrent_runs_share_the_leaders_result():
+    flight = SingleFlight(None)
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "minutes"
+
+    async def main():
+        return await asyncio.gather(*(flight.run("t.txt", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results[0] == ("minutes", False)
+    assert results[1:] == [("minutes", True)] * 4
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+def test_followers_get_the_leaders_error():
+    flight = SingleFlight(None)
+
+    async def work():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("pipeline failed")
+
+    async def main():
+        return await asyncio.gather(*(flight.run("t.txt", work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) and str(r) == "pipeline failed" for r in results)
+    # The failed flight is gone, so the next request runs the work again
+    assert asyncio.run(flight.run("t.txt", lambda: asyncio.sleep(0, result="ok"))) == ("ok", False)
+
+def test_cancelled_follower_does_not_cancel_the_leader():
+    flight = SingleFlight(None)
+
+    async def main():
+        leader = asyncio.create_task(flight.run("t.txt", lambda: asyncio.sleep(0.1, result="ok")))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.run("t.txt", lambda: asyncio.sleep(0, result="again")))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        await asyncio.gather(follower, return_exceptions=True)
+        return await leader
+
+    assert asyncio.run(main()) == ("ok", False)
+
+def test_worker_waits_for_another_workers_lease(lease_path):
+    # Two workers of one host: separate processes in production, separate guards on one lease file here
+    first = SingleFlight(SQLiteLeases(lease_path), ttl_seconds=10, poll_seconds=0.02)
+    second = SingleFlight(SQLiteLeases(lease_path), ttl_seconds=10, poll_seconds=0.02)
+    order = []
+
+    async def work(name):
+        order.append(f"{name} start")
+        await asyncio.sleep(0.1)
+        order.append(f"{name} end")
+        return name
+
+    async def main():
+        running = asyncio.create_task(first.run("t.txt", lambda: work("first")))
+        await asyncio.sleep(0.02)
+        waiting = asyncio.create_task(second.run("t.txt", lambda: work("second")))
+        return await asyncio.gather(running, waiting)
+
+    assert asyncio.run(main()) == [("first", False), ("second", False)]
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert second.stats()["lease_waits"] == 1
+
+def test_lease_wait_times_out(lease_path):
+    SQLiteLeases(lease_path).acquire("t.txt", "crashed-worker", 60, now=time.time())
+    flight = SingleFlight(SQLiteLeases(lease_path), ttl_seconds=10, wait_seconds=0.1, poll_seconds=0.02)
+    calls = []
+
+    async def work():
+        calls.append(1)
+
+    with pytest.raises(LeaseTimeout):
+        asyncio.run(flight.run("t.txt", work))
+    assert not calls
+    assert flight.stats()["lease_timeouts"] == 1
+
+def test_expired_lease_of_a_crashed_worker_is_taken_over(lease_path):
+    SQLiteLeases(lease_path).acquire("t.txt", "crashed-worker", 0.1, now=time.time())
+    flight = SingleFlight(SQLiteLeases(lease_path), ttl_seconds=10, wait_seconds=5, poll_seconds=0.05)
+
+    result = asyncio.run(flight.run("t.txt", lambda: asyncio.sleep(0, result="done")))
+    assert result == ("done", False)
+    assert flight.stats()["lease_timeouts"] == 0
@@ -3,7 +3,8 @@
 import Link from 'next/link';
 import { ArrowLeft, FileText, Upload, Play, Check, RefreshCw, AlertCircle } from 'lucide-react';
 import { useState, useEffect } from 'react';
-import { uploadTranscript, getTranscripts, generateInsights } from '../../lib/api';
+import { uploadTranscript, getTranscripts, generateInsightsStream, PipelineEvent } from '../../lib/api';
+import type { ListOptions } from '@/types';
 import { useRouter } from 'next/navigation';
 
 // Define TypeScript interfaces for our data
@@ -15,6 +16,64 @@ interface Transcript {
   meetingDataId?: string;
 }
 
+// Live view of a streamed pipeline run
+interface PipelineProgress {
+  runningNodes: string[];
+  finishedNodes: string[];
+  title?: string;
+  agenda: string[];
+  tasks: string[];
+}
+
+const EMPTY_PROGRESS: PipelineProgress = { runningNodes: [], finishedNodes: [], agenda: [], tasks: [] };
+
+// Newest transcripts first, one page at a time
+const TRANSCRIPT_LIST: ListOptions = { sort: 'date', order: 'desc', limit: 50 };
+
+function taskLabel(task: unknown): string {
+  const t = (task ?? {}) as { owner?: string; task?: string };
+  return t.owner ? `${t.owner}: ${t.task ?? ''}` : (t.task ?? '');
+}
+
+// Merge the items of one field into the list shown so far, without duplicates
+function mergeItems(current: string[], items: unknown): string[] {
+  const merged = [...current];
+  for (const item of Array.isArray(items) ? items : []) {
+    const label = typeof item === 'string' ? item : taskLabel(item);
+    if (label && !merged.includes(label)) merged.push(label);
+  }
+  return merged;
+}
+
+function applyEvent(progress: PipelineProgress, event: PipelineEvent): PipelineProgress {
+  switch (event.type) {
+    case 'node_start':
+      return { ...progress, runningNodes: [...progress.runningNodes, event.node] };
+    case 'node_end':
+    case 'node_error': {
+      const next = {
+        ...progress,
+        runningNodes: progress.runningNodes.filter(n => n !== event.node),
+        finishedNodes: [...progress.finishedNodes, event.node],
+      };
+      if (event.type === 'node_end') {
+        const fields = event.fields as { title?: string; agenda?: unknown; tasks?: unknown };
+        if (fields.title) next.title = fields.title;
+        next.agenda = mergeItems(next.agenda, fields.agenda);
+        next.tasks = mergeItems(next.tasks, fields.tasks);
+      }
+      return next;
+    }
+    case 'partial':
+      if (event.field === 'title' && typeof event.value === 'string') return { ...progress, title: event.value };
+      if (event.field === 'agenda') return { ...progress, agenda: mergeItems(progress.agenda, event.value) };
+      if (event.field === 'tasks') return { ...progress, tasks: mergeItems(progress.tasks, event.value) };
+      return progress;
+    default:
+      return progress;
+  }
+}
+
 export default function TranscriptsPage() {
   const router = useRouter();
   const [selectedFile, setSelectedFile] = useState<File | null>(null);
@@ -26,6 +85,9 @@ export default function TranscriptsPage() {
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [progress, setProgress] = useState<PipelineProgress>(EMPTY_PROGRESS);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   // Fetch transcripts on component mount
   useEffect(() => {
@@ -35,8 +97,9 @@ export default function TranscriptsPage() {
         // Try to get real transcripts from the API
         try {
           console.log("Attempting to fetch transcripts from API");
-          const apiTranscripts = await getTranscripts();
+          const { items: apiTranscripts, nextCursor } = await getTranscripts(TRANSCRIPT_LIST);
           console.log("API returned:", apiTranscripts);
+          setNextCursor(nextCursor);
           if (apiTranscripts && apiTranscripts.length > 0) {
             setTranscripts(apiTranscripts);
           } else {
@@ -80,8 +143,9 @@ export default function TranscriptsPage() {
       if (result.success) {
         console.log("Upload successful");
         // Refresh transcript list
-        const updatedTranscripts = await getTranscripts();
+        const { items: updatedTranscripts, nextCursor } = await getTranscripts(TRANSCRIPT_LIST);
         setTranscripts(updatedTranscripts);
+        setNextCursor(nextCursor);
         
         // Reset selected file
         setSelectedFile(null);
@@ -114,10 +178,13 @@ export default function TranscriptsPage() {
     setIsProcessing(true);
     setProcessingComplete(false);
     setError(null);
+    setProgress(EMPTY_PROGRESS);
     
     try {
       console.log("Generating insights for transcript ID:", selectedTranscript);
-      const result = await generateInsights(selectedTranscript);
+      const result = await generateInsightsStream(selectedTranscript, event =>
+        setProgress(current => applyEvent(current, event))
+      );
       
       if (result.success && result.meetingDataId) {
         if (result.alreadyProcessed) {
@@ -153,6 +220,19 @@ export default function TranscriptsPage() {
     }
   };
 
+  // Append the next page of transcripts
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await getTranscripts({ ...TRANSCRIPT_LIST, cursor: nextCursor });
+      setTranscripts(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   // Filter transcripts based on search query
   const filteredTranscripts = transcripts.filter(transcript => 
     transcript.name.toLowerCase().includes(searchQuery.toLowerCase())
@@ -308,6 +388,17 @@ export default function TranscriptsPage() {
                   ))
                 )}
               </div>
+              {!isLoading && nextCursor && (
+                <div className="p-3 border-t text-center">
+                  <button
+                    onClick={handleLoadMore}
+                    disabled={isLoadingMore}
+                    className="text-sm text-neutral-600 hover:text-neutral-900 disabled:opacity-50"
+                  >
+                    {isLoadingMore ? 'Loading...' : 'Load more'}
+                  </button>
+                </div>
+              )}
             </div>
           </div>
         </div>
@@ -354,6 +445,35 @@ export default function TranscriptsPage() {
             </>
           )}
         </div>
+
+        {/* Live results while the pipeline is running */}
+        {isProcessing && (progress.runningNodes.length > 0 || progress.finishedNodes.length > 0) && (
+          <div className="mx-auto mt-6 max-w-2xl rounded-lg border p-4 text-sm">
+            <p className="text-neutral-500">
+              {progress.runningNodes.length > 0
+                ? `Running: ${progress.runningNodes.join(', ')}`
+                : 'Finishing up...'}
+              {` (${progress.finishedNodes.length} step(s) done)`}
+            </p>
+            {progress.title && <h3 className="mt-3 text-lg font-semibold">{progress.title}</h3>}
+            {progress.agenda.length > 0 && (
+              <>
+                <h4 className="mt-3 font-medium">Agenda</h4>
+                <ul className="list-disc pl-5">
+                  {progress.agenda.map(item => <li key={item}>{item}</li>)}
+                </ul>
+              </>
+            )}
+            {progress.tasks.length > 0 && (
+              <>
+                <h4 className="mt-3 font-medium">Action Items</h4>
+                <ul className="list-disc pl-5">
+                  {progress.tasks.map(item => <li key={item}>{item}</li>)}
+                </ul>
+              </>
+            )}
+          </div>
+        )}
       </div>
 
       {/* Footer */}
@@ -1,6 +1,6 @@
 // src/lib/api.ts
 // API utility functions for connecting to the backend
-import { UploadResponse, Transcript, Insight, ActionItem } from "@/types";
+import { UploadResponse, Transcript, Insight, ActionItem, ListOptions, MeetingSummary, Page } from "@/types";
 
 // Prefer NEXT_PUBLIC_API_URL, fall back to NEXT_PUBLIC_BACKEND_URL, then localhost
 const API_URL: string =
@@ -15,8 +15,42 @@ export type GenerateInsightsResult = {
   message: string;
   meetingDataId?: string;
   alreadyProcessed?: boolean;
+  jobId?: string;
 };
 
+// A queued /api/meeting-data/generate job, from /api/jobs/{jobId}
+export type JobStatus = {
+  jobId: string;
+  status: "queued" | "running" | "done" | "failed";
+  transcriptId?: string;
+  position: number | null;
+  attempts: number;
+  createdAt: string | null;
+  startedAt: string | null;
+  finishedAt: string | null;
+  result: { message?: string; meetingDataId?: string; alreadyProcessed?: boolean } | null;
+  error: string | null;
+};
+
+// Interval between polls of a queued job
+const JOB_POLL_MS = 1500;
+
+// Server-Sent Events of /api/meeting-data/generate/stream
+export type PipelineEvent =
+  | { type: "node_start"; node: string; elapsedS: number }
+  | { type: "node_end"; node: string; fields: Record<string, unknown>; wallTimeS?: number; elapsedS: number }
+  | { type: "node_error"; node: string; message: string; elapsedS: number }
+  | { type: "partial"; node: string | null; call: number; field: string; value: unknown; elapsedS: number }
+  | {
+      type: "complete";
+      message?: string;
+      meetingDataId?: string;
+      alreadyProcessed?: boolean;
+      timeToFirstPartialS?: number | null;
+      elapsedS: number;
+    }
+  | { type: "error"; message: string; elapsedS: number };
+
 export type GetInsightResult =
   | { success: true; insight: Insight }
   | { success: false; message: string };
@@ -36,6 +70,16 @@ function errorMessage(err: unknown, fallback: string): string {
   return err instanceof Error ? err.message : fallback;
 }
 
+function listQuery(options: ListOptions): string {
+  const params = new URLSearchParams();
+  if (options.limit) params.set("limit", String(options.limit));
+  if (options.cursor) params.set("cursor", options.cursor);
+  if (options.sort) params.set("sort", options.sort);
+  if (options.order) params.set("order", options.order);
+  const query = params.toString();
+  return query ? `?${query}` : "";
+}
+
 // ----- API Calls -----
 
 /**
@@ -71,11 +115,11 @@ export async function uploadTranscript(file: File): Promise<UploadResponse> {
 }
 
 /**
- * Fetch the list of available transcripts
+ * Fetch a page of the available transcripts; pass nextCursor back for the next page
  */
-export async function getTranscripts(): Promise<Transcript[]> {
+export async function getTranscripts(options: ListOptions = {}): Promise<Page<Transcript>> {
   try {
-    const response = await fetch(`${API_URL}/api/transcripts/list`, {
+    const response = await fetch(`${API_URL}/api/transcripts/list${listQuery(options)}`, {
       method: "GET",
       headers: { Accept: "application/json" },
       cache: "no-store",
@@ -86,17 +130,36 @@ export async function getTranscripts(): Promise<Transcript[]> {
       throw new Error(`Failed to fetch transcripts: ${response.status} ${text}`);
     }
 
-    const data = (await parseJson<{ transcripts?: Transcript[] }>(response)) || {};
-    return data.transcripts ?? [];
+    const data =
+      (await parseJson<{ transcripts?: Transcript[]; nextCursor?: string | null }>(response)) || {};
+    return { items: data.transcripts ?? [], nextCursor: data.nextCursor ?? null };
   } catch {
-    return [];
+    return { items: [], nextCursor: null };
   }
 }
 
 /**
- * Generate meeting data from a transcript
+ * Fetch the status of a queued generation job
  */
-export async function generateInsights(transcriptId: string): Promise<GenerateInsightsResult> {
+export async function getJob(jobId: string): Promise<JobStatus> {
+  const response = await fetch(`${API_URL}/api/jobs/${jobId}`, {
+    headers: { Accept: "application/json" },
+    cache: "no-store",
+  });
+  if (!response.ok) {
+    throw new Error(`Failed to fetch job ${jobId}: ${response.status}`);
+  }
+  return parseJson<JobStatus>(response);
+}
+
+/**
+ * Generate meeting data from a transcript: queue the job, then poll it until it
+ * is done or failed, reporting each status through onStatus
+ */
+export async function generateInsights(
+  transcriptId: string,
+  onStatus?: (job: JobStatus) => void,
+): Promise<GenerateInsightsResult> {
   try {
     const response = await fetch(`${API_URL}/api/meeting-data/generate`, {
       method: "POST",
@@ -104,23 +167,93 @@ export async function generateInsights(transcriptId: string): Promise<GenerateIn
       body: JSON.stringify({ transcriptId }),
     });
 
-    const data =
-      (await parseJson<{
-        message?: string;
-        meetingDataId?: string;
-        alreadyProcessed?: boolean;
-      }>(response)) || {};
+    const data = (await parseJson<{ jobId?: string; detail?: string }>(response)) || {};
 
-    if (!response.ok) {
-      throw new Error(data.message ?? "Failed to generate meeting data");
+    if (!response.ok || !data.jobId) {
+      throw new Error(data.detail ?? "Failed to generate meeting data");
+    }
+
+    let job = await getJob(data.jobId);
+    onStatus?.(job);
+    while (job.status === "queued" || job.status === "running") {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_MS));
+      job = await getJob(data.jobId);
+      onStatus?.(job);
+    }
+    if (job.status === "failed" || !job.result) {
+      throw new Error(job.error ?? "Failed to generate meeting data");
     }
 
     return {
       success: true,
-      message: data.message ?? "Meeting data generated successfully",
-      meetingDataId: data.meetingDataId,
-      alreadyProcessed: Boolean(data.alreadyProcessed),
+      message: job.result.message ?? "Meeting data generated successfully",
+      meetingDataId: job.result.meetingDataId,
+      alreadyProcessed: Boolean(job.result.alreadyProcessed),
+      jobId: job.jobId,
+    };
+  } catch (err) {
+    return {
+      success: false,
+      message: errorMessage(err, "Failed to generate meeting data"),
     };
+  }
+}
+
+/**
+ * Generate meeting data from a transcript, reporting node progress and partial
+ * fields through onEvent while the pipeline runs
+ */
+export async function generateInsightsStream(
+  transcriptId: string,
+  onEvent: (event: PipelineEvent) => void,
+): Promise<GenerateInsightsResult> {
+  try {
+    const response = await fetch(`${API_URL}/api/meeting-data/generate/stream`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+      body: JSON.stringify({ transcriptId }),
+    });
+
+    if (!response.ok || !response.body) {
+      const data = (await parseJson<{ detail?: string }>(response).catch(() => null)) || {};
+      throw new Error(data.detail ?? "Failed to generate meeting data");
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      // Events are separated by a blank line; keep the incomplete tail for the next read
+      const messages = buffer.split("\n\n");
+      buffer = messages.pop() ?? "";
+      for (const message of messages) {
+        const data = message
+          .split("\n")
+          .filter((line) => line.startsWith("data: "))
+          .map((line) => line.slice(6))
+          .join("\n");
+        if (!data) continue; // keepalive comment
+
+        const event = JSON.parse(data) as PipelineEvent;
+        onEvent(event);
+        if (event.type === "complete") {
+          return {
+            success: true,
+            message: event.message ?? "Meeting data generated successfully",
+            meetingDataId: event.meetingDataId,
+            alreadyProcessed: Boolean(event.alreadyProcessed),
+          };
+        }
+        if (event.type === "error") {
+          throw new Error(event.message);
+        }
+      }
+    }
+    throw new Error("Stream ended before the meeting data was generated");
   } catch (err) {
     return {
       success: false,
@@ -151,11 +284,11 @@ export async function getInsight(insightId: string): Promise<GetInsightResult> {
 }
 
 /**
- * Fetch all meeting data
+ * Fetch a page of the generated meetings; pass nextCursor back for the next page
  */
-export async function getMeetings(): Promise<Insight[]> {
+export async function getMeetings(options: ListOptions = {}): Promise<Page<MeetingSummary>> {
   try {
-    const response = await fetch(`${API_URL}/api/meeting-data/list`, {
+    const response = await fetch(`${API_URL}/api/meeting-data/list${listQuery(options)}`, {
       headers: { Accept: "application/json" },
       cache: "no-store",
     });
@@ -164,10 +297,11 @@ export async function getMeetings(): Promise<Insight[]> {
       throw new Error("Failed to fetch meetings");
     }
 
-    const data = (await parseJson<{ meetingData?: Insight[] }>(response)) || {};
-    return data.meetingData ?? [];
+    const data =
+      (await parseJson<{ meetingData?: MeetingSummary[]; nextCursor?: string | null }>(response)) || {};
+    return { items: data.meetingData ?? [], nextCursor: data.nextCursor ?? null };
   } catch {
-    return [];
+    return { items: [], nextCursor: null };
   }
 }
 
@@ -35,6 +35,31 @@ export interface Insight {
   // Add more fields as needed for your application
 }
 
+// Entry of the meeting list (/api/meeting-data/list)
+export interface MeetingSummary {
+  id: string;
+  title: string;
+  date: string;
+  processedAt: string;
+  source: string;
+  status: "processed" | "partial";
+  partialFields: string[];
+}
+
+// Sort and cursor of a paginated list request
+export interface ListOptions {
+  limit?: number;
+  cursor?: string | null;
+  sort?: "name" | "date";
+  order?: "asc" | "desc";
+}
+
+// One page of a list; nextCursor is null on the last page
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
 // API response types
 export interface ApiResponse<T> {
   success: boolean;